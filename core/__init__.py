@@ -19,6 +19,7 @@ from .rules import (
     is_terminal,
 )
 from .hash import position_key_from_state
+from .bitboard import BitState
 
 __all__ = [
     # state
@@ -31,6 +32,8 @@ __all__ = [
     "MILLS",
     "NEIGHBORS",
     "GRID_7x7",
+    # bitboard
+    "BitState",
     # rules
     "Action",
     "DrawReason",
@@ -6,7 +6,7 @@ from typing import Dict, Set, List, Tuple, TYPE_CHECKING
 
 from .graph import MILLS, NEIGHBORS, RING_WEIGHT_BY_INDEX
 from .state import GameState, Stone, opponent, Phase
-from .rules import phase_for, Action, legal_actions, apply_action, removable_positions
+from .rules import phase_for, Action, legal_actions, apply_action, apply_action_trusted, removable_positions
 
 if TYPE_CHECKING:
     from engine.types import Ply
@@ -233,7 +233,7 @@ def scored_actions_for_to_move(
     actions = legal_actions(state)
     scored: List[Tuple[Action, float]] = []
     for a in actions:
-        nxt = apply_action(state, a)
+        nxt = apply_action_trusted(state, a)
         score = evaluate_light(nxt, to_move)
         scored.append((a, score))
 
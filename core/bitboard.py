@@ -0,0 +1,252 @@
+# core/bitboard.py
+from __future__ import annotations
+
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from .graph import MILLS, NEIGHBORS
+from .state import DrawTracker, GameState, Phase, Stone, opponent
+
+
+__all__ = [
+    "FULL_MASK",
+    "SQUARE_BITS",
+    "NEIGHBOR_MASKS",
+    "MILL_MASKS",
+    "MILL_MASKS_BY_SQUARE",
+    "BitState",
+    "popcount",
+    "iter_squares",
+    "forms_mill_mask",
+    "mill_stones_mask",
+    "removable_mask",
+]
+
+
+FULL_MASK = (1 << 24) - 1
+
+SQUARE_BITS: Tuple[int, ...] = tuple(1 << i for i in range(24))
+
+# Nachbarn je Feld als Bitmaske (aus NEIGHBORS abgeleitet)
+NEIGHBOR_MASKS: Tuple[int, ...] = tuple(
+    sum(1 << nb for nb in NEIGHBORS[i]) for i in range(24)
+)
+
+# Alle 16 Muehlen als Bitmaske (Reihenfolge wie MILLS)
+MILL_MASKS: Tuple[int, ...] = tuple((1 << a) | (1 << b) | (1 << c) for a, b, c in MILLS)
+
+# Muehlen-Masken, die ein Feld enthalten (je Feld genau 2)
+MILL_MASKS_BY_SQUARE: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(m for m in MILL_MASKS if m >> i & 1) for i in range(24)
+)
+
+
+def popcount(mask: int) -> int:
+    return mask.bit_count()
+
+
+def iter_squares(mask: int) -> Iterator[int]:
+    """Liefert die gesetzten Felder einer Maske aufsteigend."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def forms_mill_mask(own: int, sq: int) -> bool:
+    """True, wenn `own` (inkl. Stein auf `sq`) eine Muehle durch `sq` enthaelt."""
+    for m in MILL_MASKS_BY_SQUARE[sq]:
+        if own & m == m:
+            return True
+    return False
+
+
+def mill_stones_mask(own: int) -> int:
+    """Alle Steine von `own`, die Teil einer geschlossenen Muehle sind."""
+    result = 0
+    for m in MILL_MASKS:
+        if own & m == m:
+            result |= m
+    return result
+
+
+def removable_mask(victim: int) -> int:
+    """
+    Entfernbare Steine (Standardregel): nur Steine ausserhalb von Muehlen,
+    ausser alle Steine stehen in Muehlen.
+    """
+    free = victim & ~mill_stones_mask(victim)
+    return free if free else victim
+
+
+class BitState(NamedTuple):
+    """
+    Kompakte Stellung: Belegung von WHITE/BLACK als je eine 24-Bit-Maske.
+
+    Verlustfrei in beide Richtungen konvertierbar (`from_state`/`to_state`).
+    Uebergaenge (`apply_place`/`apply_move`/`apply_remove`) sind reine
+    Integer-Operationen und folgen exakt `core.rules.apply_action` – ohne
+    Legalitaetspruefung. "Unmake" ist schlicht der vorherige BitState.
+    """
+
+    white: int
+    black: int
+    to_move: Stone
+    in_hand_white: int
+    in_hand_black: int
+    pending_remove: bool
+    turn_no: int = 1
+    draw: DrawTracker = DrawTracker()
+
+    @staticmethod
+    def from_state(state: GameState) -> "BitState":
+        white = 0
+        black = 0
+        for idx, val in enumerate(state.board):
+            if val == Stone.WHITE:
+                white |= 1 << idx
+            elif val == Stone.BLACK:
+                black |= 1 << idx
+        return BitState(
+            white=white,
+            black=black,
+            to_move=Stone(state.to_move),
+            in_hand_white=state.in_hand_white,
+            in_hand_black=state.in_hand_black,
+            pending_remove=bool(state.pending_remove),
+            turn_no=state.turn_no,
+            draw=state.draw,
+        )
+
+    def to_state(self) -> GameState:
+        return GameState(
+            board=self.board,
+            to_move=self.to_move,
+            in_hand_white=self.in_hand_white,
+            in_hand_black=self.in_hand_black,
+            pending_remove=self.pending_remove,
+            turn_no=self.turn_no,
+            draw=self.draw,
+        )
+
+    # --- GameState-kompatible Sicht (fuer Duck-Typing in Analyse/Eval) ---
+
+    @property
+    def board(self) -> Tuple[Stone, ...]:
+        white = self.white
+        black = self.black
+        return tuple(
+            Stone.WHITE if white >> i & 1 else Stone.BLACK if black >> i & 1 else Stone.EMPTY
+            for i in range(24)
+        )
+
+    @property
+    def occupied(self) -> int:
+        return self.white | self.black
+
+    @property
+    def empty(self) -> int:
+        return FULL_MASK & ~(self.white | self.black)
+
+    def own(self, p: Stone) -> int:
+        return self.white if p == Stone.WHITE else self.black
+
+    def in_hand(self, p: Stone) -> int:
+        return self.in_hand_white if p == Stone.WHITE else self.in_hand_black
+
+    def stones_on_board(self, p: Stone) -> int:
+        return self.own(p).bit_count()
+
+    def phase(self, p: Stone) -> Phase:
+        # gleiche Semantik wie GameState.phase
+        if self.in_hand(p) > 0:
+            return "placing"
+        if self.own(p).bit_count() <= 3:
+            return "flying"
+        return "moving"
+
+    def is_empty(self, pos: int) -> bool:
+        return not (self.white | self.black) >> pos & 1
+
+    # --- Uebergaenge (ohne Legalitaetspruefung) ---
+
+    def apply_place(self, dst: int) -> "BitState":
+        bit = 1 << dst
+        if self.to_move == Stone.WHITE:
+            white = self.white | bit
+            black = self.black
+            hand_w = self.in_hand_white - 1
+            hand_b = self.in_hand_black
+            own = white
+        else:
+            white = self.white
+            black = self.black | bit
+            hand_w = self.in_hand_white
+            hand_b = self.in_hand_black - 1
+            own = black
+        return self._after_stone_placed(white, black, hand_w, hand_b, own, dst)
+
+    def apply_move(self, src: int, dst: int) -> "BitState":
+        delta = (1 << src) | (1 << dst)
+        if self.to_move == Stone.WHITE:
+            white = self.white ^ delta
+            black = self.black
+            own = white
+        else:
+            white = self.white
+            black = self.black ^ delta
+            own = black
+        return self._after_stone_placed(white, black, self.in_hand_white, self.in_hand_black, own, dst)
+
+    def apply_remove(self, dst: int) -> "BitState":
+        clear = ~(1 << dst)
+        victim = opponent(self.to_move)
+        return BitState(
+            white=self.white & clear,
+            black=self.black & clear,
+            to_move=victim,
+            in_hand_white=self.in_hand_white,
+            in_hand_black=self.in_hand_black,
+            pending_remove=False,
+            turn_no=self.turn_no + 1,
+        )
+
+    def _after_stone_placed(
+        self,
+        white: int,
+        black: int,
+        hand_w: int,
+        hand_b: int,
+        own: int,
+        dst: int,
+    ) -> "BitState":
+        if forms_mill_mask(own, dst):
+            return BitState(white, black, self.to_move, hand_w, hand_b, True, self.turn_no)
+        return BitState(white, black, opponent(self.to_move), hand_w, hand_b, False, self.turn_no + 1)
+
+    # --- Endbedingungen (Semantik wie core.rules.winner, ohne Draw-Regeln) ---
+
+    def has_legal_move(self) -> bool:
+        p = self.to_move
+        if self.pending_remove:
+            return self.own(opponent(p)) != 0
+        empty = self.empty
+        phase = self.phase(p)
+        if phase == "placing":
+            return empty != 0
+        own = self.own(p)
+        if phase == "flying":
+            return own != 0 and empty != 0
+        for sq in iter_squares(own):
+            if NEIGHBOR_MASKS[sq] & empty:
+                return True
+        return False
+
+    def winner(self) -> Optional[Stone]:
+        for player in (Stone.WHITE, Stone.BLACK):
+            if self.in_hand(player) == 0 and self.own(player).bit_count() < 3:
+                return opponent(player)
+        if not self.pending_remove:
+            tm = self.to_move
+            if self.in_hand(tm) == 0 and not self.has_legal_move():
+                return opponent(tm)
+        return None
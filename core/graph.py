@@ -11,6 +11,7 @@ __all__ = [
     "RING_BY_INDEX",
     "RING_WEIGHT_BY_INDEX",
     "SYMMETRY_MAPS",
+    "SYMMETRY_INVERSE_MAPS",
 ]
 
 
@@ -150,3 +151,14 @@ def _build_symmetry_maps() -> List[Tuple[int, ...]]:
 
 
 SYMMETRY_MAPS: List[Tuple[int, ...]] = _build_symmetry_maps()
+
+
+def _invert(mapping: Tuple[int, ...]) -> Tuple[int, ...]:
+    inverse = [0] * len(mapping)
+    for idx, mapped in enumerate(mapping):
+        inverse[mapped] = idx
+    return tuple(inverse)
+
+
+# SYMMETRY_INVERSE_MAPS[s][SYMMETRY_MAPS[s][i]] == i
+SYMMETRY_INVERSE_MAPS: List[Tuple[int, ...]] = [_invert(m) for m in SYMMETRY_MAPS]
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import hashlib
-from typing import List, Sequence, cast
+import random
+from typing import Dict, List, Sequence, Tuple, cast
 
 from .graph import SYMMETRY_MAPS
 from .state import GameState, Phase, Stone, resolve_phase
@@ -10,6 +11,18 @@ from .state import GameState, Phase, Stone, resolve_phase
 __all__ = [
     "position_key_from_state",
     "position_key_with_symmetry",
+    "position_key_and_symmetry",
+    "ZOBRIST_STONES",
+    "zobrist_stone",
+    "zobrist_status",
+    "zobrist_status_from_state",
+    "zobrist_key_from_state",
+    "zobrist_key_with_symmetry",
+    "zobrist_sym_keys_from_state",
+    "zobrist_sym_toggle",
+    "zobrist_sym_xor",
+    "canonical_zobrist_key",
+    "SymKeys",
 ]
 
 BoardVal = int | Stone
@@ -32,18 +45,29 @@ def position_key_with_symmetry(state: GameState) -> int:
     """
     Deterministischer Key, kanonisiert ueber alle 8 Symmetrien.
     """
+    return position_key_and_symmetry(state)[0]
+
+
+def position_key_and_symmetry(state: GameState) -> Tuple[int, int]:
+    """
+    Wie :func:`position_key_with_symmetry`, liefert zusaetzlich den Index der
+    Symmetrie (``SYMMETRY_MAPS``), die die Stellung auf ihren kanonischen
+    Repraesentanten abbildet (bei Gleichstand die erste).
+    """
     board_seq = _board_seq_from_state(state)
     to_move = cast(Stone, getattr(state, "to_move"))
     pending_remove = bool(getattr(state, "pending_remove", False))
     phase = resolve_phase(state, to_move)
 
     best_key = _position_key_from_board(board_seq, to_move, phase, pending_remove)
-    for mapping in SYMMETRY_MAPS:
+    best_sym = 0
+    for sym, mapping in enumerate(SYMMETRY_MAPS):
         sym_board = _apply_symmetry(board_seq, mapping)
         sym_key = _position_key_from_board(sym_board, to_move, phase, pending_remove)
         if sym_key < best_key:
             best_key = sym_key
-    return best_key
+            best_sym = sym
+    return best_key, best_sym
 
 
 def _position_key_from_board(
@@ -73,3 +97,146 @@ def _apply_symmetry(board_seq: Sequence[BoardVal], mapping: Sequence[int]) -> Li
 
 def _board_seq_from_state(state: GameState) -> List[BoardVal]:
     return list(cast(Sequence[BoardVal], getattr(state, "board")))
+
+
+# ---------------------------------------------------------------------------
+# Zobrist-Keys (inkrementell, fuer Suche/TT)
+#
+# Koexistieren mit den blake2b-Keys oben: diese bleiben fuer Draw-History und
+# gespeicherte Keys (z. B. data/tuning_positions.jsonl) unveraendert.
+# Key = XOR(Steine) ^ Status(to_move, phase(to_move), pending_remove, Hand).
+# ---------------------------------------------------------------------------
+
+_ZOBRIST_SEED = 0x4D554548_4C45  # "MUEHLE"
+_zobrist_rng = random.Random(_ZOBRIST_SEED)
+
+
+def _rand64() -> int:
+    return _zobrist_rng.getrandbits(64)
+
+
+# ZOBRIST_STONES[0] = WHITE, ZOBRIST_STONES[1] = BLACK; Index = Feld
+ZOBRIST_STONES: Tuple[Tuple[int, ...], Tuple[int, ...]] = (
+    tuple(_rand64() for _ in range(24)),
+    tuple(_rand64() for _ in range(24)),
+)
+_ZOBRIST_BLACK_TO_MOVE = _rand64()
+_ZOBRIST_PENDING = _rand64()
+_ZOBRIST_PHASE: Dict[str, int] = {phase: _rand64() for phase in ("placing", "moving", "flying")}
+_ZOBRIST_HAND: Tuple[Tuple[int, ...], Tuple[int, ...]] = (
+    tuple(_rand64() for _ in range(10)),
+    tuple(_rand64() for _ in range(10)),
+)
+
+
+def zobrist_stone(player: Stone, pos: int) -> int:
+    """XOR-Anteil eines Steins von `player` auf `pos` (place/move/remove toggeln ihn)."""
+    return ZOBRIST_STONES[0 if player == Stone.WHITE else 1][pos]
+
+
+def zobrist_status(
+    to_move: Stone,
+    phase: Phase,
+    pending_remove: bool,
+    in_hand_white: int,
+    in_hand_black: int,
+) -> int:
+    """Status-Anteil des Keys (alles ausser der Steinbelegung)."""
+    key = _ZOBRIST_PHASE[phase] ^ _ZOBRIST_HAND[0][in_hand_white] ^ _ZOBRIST_HAND[1][in_hand_black]
+    if to_move == Stone.BLACK:
+        key ^= _ZOBRIST_BLACK_TO_MOVE
+    if pending_remove:
+        key ^= _ZOBRIST_PENDING
+    return key
+
+
+def zobrist_status_from_state(state: GameState) -> int:
+    to_move = cast(Stone, getattr(state, "to_move"))
+    return zobrist_status(
+        to_move,
+        resolve_phase(state, to_move),
+        bool(getattr(state, "pending_remove", False)),
+        state.in_hand_white,
+        state.in_hand_black,
+    )
+
+
+def zobrist_key_from_state(state: GameState) -> int:
+    """
+    Vollstaendige Zobrist-Berechnung. In der Suche wird der Key danach nur noch
+    inkrementell fortgeschrieben: key ^ Status(vorher) ^ Status(nachher) ^ Stein-Toggles.
+    """
+    return _zobrist_board_key(_board_seq_from_state(state)) ^ zobrist_status_from_state(state)
+
+
+def zobrist_key_with_symmetry(state: GameState) -> int:
+    """Zobrist-Key, kanonisiert (Minimum) ueber alle 8 Symmetrien."""
+    return canonical_zobrist_key(zobrist_sym_keys_from_state(state))[0]
+
+
+# ---------------------------------------------------------------------------
+# Symmetrie-Keys: fuer jede der 8 Abbildungen eine eigene Zobrist-Tabelle,
+# _ZOBRIST_SYM_BY_SQUARE[farbe][feld][s] = ZOBRIST_STONES[farbe][SYMMETRY_MAPS[s][feld]].
+# Damit ist keys[s] der Key des mit s transformierten Boards; alle 8 Keys werden
+# per Stein-Toggle gemeinsam fortgeschrieben (keys[0] == Identitaet).
+# ---------------------------------------------------------------------------
+
+SymKeys = Tuple[int, int, int, int, int, int, int, int]
+
+_ZOBRIST_SYM_BY_SQUARE: Tuple[Tuple[SymKeys, ...], ...] = tuple(
+    tuple(
+        cast(SymKeys, tuple(color_keys[mapping[pos]] for mapping in SYMMETRY_MAPS))
+        for pos in range(24)
+    )
+    for color_keys in ZOBRIST_STONES
+)
+
+
+def zobrist_sym_keys_from_state(state: GameState) -> SymKeys:
+    keys = [zobrist_status_from_state(state)] * len(SYMMETRY_MAPS)
+    for idx, val in enumerate(_board_seq_from_state(state)):
+        v = int(val)
+        if v == Stone.EMPTY:
+            continue
+        table = _ZOBRIST_SYM_BY_SQUARE[0 if v == Stone.WHITE else 1][idx]
+        for s in range(len(keys)):
+            keys[s] ^= table[s]
+    return cast(SymKeys, tuple(keys))
+
+
+def zobrist_sym_toggle(keys: SymKeys, player: Stone, pos: int) -> SymKeys:
+    """Stein von `player` auf `pos` in allen 8 Symmetrie-Keys toggeln."""
+    t = _ZOBRIST_SYM_BY_SQUARE[0 if player == Stone.WHITE else 1][pos]
+    return (
+        keys[0] ^ t[0], keys[1] ^ t[1], keys[2] ^ t[2], keys[3] ^ t[3],
+        keys[4] ^ t[4], keys[5] ^ t[5], keys[6] ^ t[6], keys[7] ^ t[7],
+    )
+
+
+def zobrist_sym_xor(keys: SymKeys, value: int) -> SymKeys:
+    """Symmetrie-invarianten Anteil (z. B. Status-Delta) in alle 8 Keys einrechnen."""
+    return (
+        keys[0] ^ value, keys[1] ^ value, keys[2] ^ value, keys[3] ^ value,
+        keys[4] ^ value, keys[5] ^ value, keys[6] ^ value, keys[7] ^ value,
+    )
+
+
+def canonical_zobrist_key(keys: SymKeys) -> Tuple[int, int]:
+    """
+    (kanonischer Key, Index der gewinnenden Symmetrie).
+    Ein Feld `i` der Stellung liegt im kanonischen Bild auf SYMMETRY_MAPS[s][i].
+    """
+    best = min(keys)
+    return best, keys.index(best)
+
+
+def _zobrist_board_key(board_seq: Sequence[BoardVal]) -> int:
+    white_keys, black_keys = ZOBRIST_STONES
+    key = 0
+    for idx, val in enumerate(board_seq):
+        v = int(val)
+        if v == Stone.WHITE:
+            key ^= white_keys[idx]
+        elif v == Stone.BLACK:
+            key ^= black_keys[idx]
+    return key
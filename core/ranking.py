@@ -0,0 +1,207 @@
+# core/ranking.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from .bitboard import FULL_MASK, BitState, iter_squares
+from .graph import SYMMETRY_MAPS
+from .state import GameState, Stone
+
+
+__all__ = [
+    "MaterialClass",
+    "PositionRanker",
+    "binomial",
+    "canonical_masks",
+    "map_mask",
+    "rank_subset",
+    "unrank_subset",
+]
+
+
+# --- Kombinatorischer Rang (Colex) von k-Teilmengen der 24 Felder ---
+
+def _build_binomials(limit: int) -> Tuple[Tuple[int, ...], ...]:
+    rows = [[1] + [0] * limit]
+    for n in range(1, limit + 1):
+        prev = rows[-1]
+        rows.append([1] + [prev[k - 1] + prev[k] for k in range(1, limit + 1)])
+    return tuple(tuple(row) for row in rows)
+
+
+_BINOM = _build_binomials(24)
+
+
+def binomial(n: int, k: int) -> int:
+    return _BINOM[n][k] if 0 <= k <= n <= 24 else 0
+
+
+def rank_subset(mask: int, within: int = FULL_MASK) -> int:
+    """Colex-Rang von `mask` als Teilmenge der Felder in `within` (aufsteigend nummeriert)."""
+    rank = 0
+    k = 0
+    for sq in iter_squares(mask):
+        k += 1
+        rank += _BINOM[(within & ((1 << sq) - 1)).bit_count()][k]
+    return rank
+
+
+def unrank_subset(rank: int, k: int, within: int = FULL_MASK) -> int:
+    """Umkehrung von :func:`rank_subset`: k-Teilmenge von `within` mit diesem Rang."""
+    squares = list(iter_squares(within))
+    mask = 0
+    n = len(squares)
+    while k:
+        n -= 1
+        while _BINOM[n][k] > rank:
+            n -= 1
+        rank -= _BINOM[n][k]
+        mask |= 1 << squares[n]
+        k -= 1
+    return mask
+
+
+# --- Symmetrie auf Masken: je Symmetrie drei Byte-Lookup-Tabellen ---
+
+def _byte_tables(mapping: Tuple[int, ...]) -> Tuple[Tuple[int, ...], ...]:
+    return tuple(
+        tuple(
+            sum(1 << mapping[shift + bit] for bit in range(8) if byte >> bit & 1)
+            for byte in range(256)
+        )
+        for shift in (0, 8, 16)
+    )
+
+
+_SYMMETRY_BYTES = tuple(_byte_tables(m) for m in SYMMETRY_MAPS)
+
+
+def map_mask(mask: int, sym: int) -> int:
+    """Maske durch ``SYMMETRY_MAPS[sym]`` abbilden (Feld i -> mapping[i])."""
+    t0, t1, t2 = _SYMMETRY_BYTES[sym]
+    return t0[mask & 255] | t1[mask >> 8 & 255] | t2[mask >> 16]
+
+
+def canonical_masks(white: int, black: int) -> Tuple[int, int]:
+    """Symmetrie-Repraesentant: lexikographisch kleinstes (white, black) ueber alle 8 Abbildungen."""
+    best_w = white
+    best_b = black
+    for t0, t1, t2 in _SYMMETRY_BYTES:
+        mw = t0[white & 255] | t1[white >> 8 & 255] | t2[white >> 16]
+        if mw > best_w:
+            continue
+        mb = t0[black & 255] | t1[black >> 8 & 255] | t2[black >> 16]
+        if mw < best_w or mb < best_b:
+            best_w = mw
+            best_b = mb
+    return best_w, best_b
+
+
+def _canonical_mask(mask: int) -> int:
+    return min(t0[mask & 255] | t1[mask >> 8 & 255] | t2[mask >> 16] for t0, t1, t2 in _SYMMETRY_BYTES)
+
+
+@dataclass(frozen=True)
+class MaterialClass:
+    """Steine auf dem Brett und in der Hand je Seite (Partition der Stellungen)."""
+
+    white: int
+    black: int
+    in_hand_white: int = 0
+    in_hand_black: int = 0
+
+    @staticmethod
+    def of(state: GameState | BitState) -> "MaterialClass":
+        bs = state if isinstance(state, BitState) else BitState.from_state(state)
+        return MaterialClass(
+            white=bs.white.bit_count(),
+            black=bs.black.bit_count(),
+            in_hand_white=bs.in_hand_white,
+            in_hand_black=bs.in_hand_black,
+        )
+
+
+class PositionRanker:
+    """
+    Perfekter Rang fuer die Stellungen einer :class:`MaterialClass` auf
+    ``0 .. size - 1`` (dicht, fuer Arrays mit einem Eintrag je Stellung):
+
+        pending * quiet_size + ((Rang(WHITE) * C(24 - w, b) + Rang(BLACK unter den freien Feldern)) * 2 + Seite
+
+    Seite 0 = WHITE am Zug. Stellungen ohne offenes Schlagen belegen damit den
+    Praefix ``0 .. quiet_size - 1``.
+
+    Mit ``canonical=True`` wird jede Stellung zuerst auf ihren Repraesentant
+    unter ``SYMMETRY_MAPS`` abgebildet; Rang(WHITE) nummeriert dann nur die
+    kanonischen WHITE-Masken (knapp Faktor 8 kleiner). Raenge
+    nicht-kanonischer Paare bleiben ungenutzt (:meth:`is_canonical`).
+    """
+
+    __slots__ = ("material", "canonical", "white_masks", "white_rank", "black_count", "quiet_size", "size")
+
+    def __init__(self, material: MaterialClass, *, canonical: bool = False) -> None:
+        self.material = material
+        self.canonical = canonical
+        self.white_masks: Tuple[int, ...] = ()
+        self.white_rank: Dict[int, int] = {}
+        if canonical:
+            self.white_masks = tuple(
+                sorted(
+                    {
+                        _canonical_mask(unrank_subset(r, material.white))
+                        for r in range(_BINOM[24][material.white])
+                    }
+                )
+            )
+            self.white_rank = {mask: i for i, mask in enumerate(self.white_masks)}
+            white_count = len(self.white_masks)
+        else:
+            white_count = _BINOM[24][material.white]
+        self.black_count = _BINOM[24 - material.white][material.black]
+        self.quiet_size = white_count * self.black_count * 2
+        self.size = self.quiet_size * 2
+
+    def rank(self, white: int, black: int, side: int, pending: bool = False) -> int:
+        if self.canonical:
+            white, black = canonical_masks(white, black)
+            white_idx = self.white_rank[white]
+        else:
+            white_idx = rank_subset(white)
+        idx = (white_idx * self.black_count + rank_subset(black, FULL_MASK ^ white)) << 1 | side
+        return idx + self.quiet_size if pending else idx
+
+    def unrank(self, idx: int) -> Tuple[int, int, int, bool]:
+        """Rang -> (WHITE-Maske, BLACK-Maske, Seite am Zug, pending_remove)."""
+        pending = idx >= self.quiet_size
+        if pending:
+            idx -= self.quiet_size
+        white_idx, black_idx = divmod(idx >> 1, self.black_count)
+        if self.canonical:
+            white = self.white_masks[white_idx]
+        else:
+            white = unrank_subset(white_idx, self.material.white)
+        return white, unrank_subset(black_idx, self.material.black, FULL_MASK ^ white), idx & 1, pending
+
+    def is_canonical(self, idx: int) -> bool:
+        white, black, _, _ = self.unrank(idx)
+        return not self.canonical or canonical_masks(white, black) == (white, black)
+
+    def rank_state(self, state: GameState | BitState) -> int:
+        bs = state if isinstance(state, BitState) else BitState.from_state(state)
+        if MaterialClass.of(bs) != self.material:
+            raise ValueError("state does not belong to this material class")
+        side = 0 if bs.to_move == Stone.WHITE else 1
+        return self.rank(bs.white, bs.black, side, bs.pending_remove)
+
+    def unrank_state(self, idx: int) -> BitState:
+        white, black, side, pending = self.unrank(idx)
+        return BitState(
+            white=white,
+            black=black,
+            to_move=Stone.WHITE if side == 0 else Stone.BLACK,
+            in_hand_white=self.material.in_hand_white,
+            in_hand_black=self.material.in_hand_black,
+            pending_remove=pending,
+        )
+
@@ -1,10 +1,12 @@
 # core/rules.py
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from typing import Iterable, List, Optional, Sequence, Tuple, Literal
 
-from .graph import MILLS, NEIGHBORS
+from .bitboard import FULL_MASK, NEIGHBOR_MASKS, BitState, iter_squares
+from .graph import MILLS
 from .hash import position_key_from_state
 from .state import GameState, Stone, opponent, DrawTracker, Phase, resolve_phase
 
@@ -25,6 +27,8 @@ __all__ = [
     "removable_positions",
     "legal_actions",
     "apply_action",
+    "apply_action_trusted",
+    "TRUSTED_APPLY_CHECKS",
     "winner",
     "is_terminal",
 ]
@@ -55,6 +59,10 @@ DRAW_THREEFOLD_REPETITIONS = 3
 
 DrawReason = Literal["no_mill_20", "threefold"]
 
+# Debug-Modus: auch apply_action_trusted validiert gegen legal_actions.
+# Aktivierbar per Umgebungsvariable MILL_DEBUG_CHECKS=1 oder zur Laufzeit.
+TRUSTED_APPLY_CHECKS = os.environ.get("MILL_DEBUG_CHECKS", "") not in ("", "0")
+
 
 def phase_for(state: GameState, player: Stone) -> Phase:
     """
@@ -171,36 +179,43 @@ def legal_actions(state: GameState) -> List[Action]:
         return [Action(kind="remove", dst=i) for i in removable_positions(state, victim)]
 
     phase = phase_for(state, p)
+    bs = BitState.from_state(state)
+    empty = FULL_MASK & ~bs.occupied
 
     if phase == "placing":
         # place on any empty
-        return [Action(kind="place", dst=i) for i, x in enumerate(state.board) if x == Stone.EMPTY]
-
-    # moving or flying
-    own_positions = [i for i, x in enumerate(state.board) if x == p]
-    empties = [i for i, x in enumerate(state.board) if x == Stone.EMPTY]
+        return [Action(kind="place", dst=i) for i in iter_squares(empty)]
 
+    # moving or flying: Ziele aus vorberechneten Nachbar-Masken
     actions: List[Action] = []
-    if phase == "moving":
-        for src in own_positions:
-            for dst in NEIGHBORS[src]:
-                if state.board[dst] == Stone.EMPTY:
-                    actions.append(Action(kind="move", src=src, dst=dst))
-    else:  # flying
-        for src in own_positions:
-            for dst in empties:
-                actions.append(Action(kind="move", src=src, dst=dst))
+    for src in iter_squares(bs.own(p)):
+        targets = empty if phase == "flying" else NEIGHBOR_MASKS[src] & empty
+        for dst in iter_squares(targets):
+            actions.append(Action(kind="move", src=src, dst=dst))
 
     return actions
 
 
 def apply_action(state: GameState, action: Action) -> GameState:
-    p = state.to_move
-
     # quick legality check (defensive)
     if action not in legal_actions(state):
         raise ValueError(f"Illegal action: {action}")
+    return _apply_action_unchecked(state, action)
+
 
+def apply_action_trusted(state: GameState, action: Action) -> GameState:
+    """
+    Wie :func:`apply_action`, aber ohne erneute Zuggenerierung.
+    Nur fuer Aktionen, die bereits aus dem Generator stammen (Engine/Analyse).
+    Mit ``TRUSTED_APPLY_CHECKS`` wird trotzdem validiert.
+    """
+    if TRUSTED_APPLY_CHECKS:
+        return apply_action(state, action)
+    return _apply_action_unchecked(state, action)
+
+
+def _apply_action_unchecked(state: GameState, action: Action) -> GameState:
+    p = state.to_move
     board = list(state.board)
 
     if action.kind == "place":
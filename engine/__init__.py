@@ -1,7 +1,9 @@
-from .types import Ply, Limits, AnalysisResult, EvalBreakdown, ScoredMove, EvalWeights, ThreatReport
+from .types import Ply, Limits, AnalysisResult, EvalBreakdown, ScoredMove, EvalWeights, SearchStats, ThreatReport
 from .analysis_helpers import classify_move_loss
 from .eval import evaluate
-from .search import analyze, best_move, score_ply
+from .search import EngineSession, analyze, best_move, score_ply
+from .tablebase import Tablebases
+from .book import BookMove, OpeningBook
 from .movegen import legal_plies, apply_ply
 from .report import (
     AnalysisOverlay,
@@ -37,6 +39,7 @@ __all__ = [
     "EvalBreakdown",
     "ThreatReport",
     "ScoredMove",
+    "SearchStats",
     "EvalWeights",
     "Stone",
     "advance_draw_tracker",
@@ -46,6 +49,10 @@ __all__ = [
     "evaluate_light",
     "classify_move_loss",
     "analyze",
+    "EngineSession",
+    "Tablebases",
+    "OpeningBook",
+    "BookMove",
     "best_move",
     "score_ply",
     "legal_plies",
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from core.graph import MILLS, NEIGHBORS, RING_WEIGHT_BY_INDEX
+from core.rules import Action, legal_actions
+from core.state import GameState, Stone
+
+from .types import EvalWeights
+
+__all__ = [
+    "BREAKDOWN_KEYS",
+    "FEATURE_NAMES",
+    "child_boards",
+    "combine_features",
+    "evaluate_batch",
+    "evaluate_light_batch",
+    "feature_matrix",
+    "scored_actions_batch",
+    "stack_states",
+]
+
+# Rohe Differenzterme aus Sicht von `player` (Spalten von feature_matrix)
+FEATURE_NAMES: Tuple[str, ...] = (
+    "material",
+    "mills",
+    "open_mills",
+    "mobility",
+    "threats_mill_in_1",
+    "blocked_opponent",
+    "double_threats",
+    "fork_threats",
+    "connectivity",
+)
+
+# Spalten der Breakdown-Matrix (Reihenfolge wie EvalBreakdown/evaluate)
+BREAKDOWN_KEYS: Tuple[str, ...] = FEATURE_NAMES + ("initiative_strategic", "initiative_tactical")
+
+_MILL_INDEX = np.array(MILLS, dtype=np.intp)  # 16 x 3
+
+_ADJACENCY = np.zeros((24, 24), dtype=np.int64)
+for _sq, _nbs in NEIGHBORS.items():
+    _ADJACENCY[_sq, list(_nbs)] = 1
+
+_DEGREES = _ADJACENCY.sum(axis=1)
+
+# Muehlen-Slot (m * 3 + k) -> Feld MILLS[m][k]
+_SLOT_TO_SQUARE = np.zeros((len(MILLS) * 3, 24), dtype=np.int64)
+for _slot, _sq in enumerate(_MILL_INDEX.ravel()):
+    _SLOT_TO_SQUARE[_slot, _sq] = 1
+
+_RING_WEIGHTS: Tuple[float, ...] = tuple(RING_WEIGHT_BY_INDEX.get(sq, 1.0) for sq in range(24))
+
+
+def stack_states(states: Sequence[GameState]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """GameStates -> (boards[N, 24] mit Stone-Werten, in_hand_white[N], in_hand_black[N])."""
+    boards = np.array([[int(v) for v in s.board] for s in states], dtype=np.int8).reshape(len(states), 24)
+    hand_w = np.array([s.in_hand_white for s in states], dtype=np.int64)
+    hand_b = np.array([s.in_hand_black for s in states], dtype=np.int64)
+    return boards, hand_w, hand_b
+
+
+def _side_features(
+    own: np.ndarray,
+    own_lines: np.ndarray,
+    opp_lines: np.ndarray,
+    hand: np.ndarray,
+    empty_slots: np.ndarray,
+    free: np.ndarray,
+    empties: np.ndarray,
+) -> Tuple[np.ndarray, ...]:
+    n = own.shape[0]
+    stones = own.sum(axis=1)
+    mills = (own_lines == 3).sum(axis=1)
+    open_lines = (own_lines == 2) & (opp_lines == 0)
+    open_mills = open_lines.sum(axis=1)
+
+    # Drohfelder: Luecken offener Muehlen, doppelt = Luecke mehrerer offener Muehlen
+    gap_slots = (empty_slots & open_lines[:, :, None]).reshape(n, _SLOT_TO_SQUARE.shape[0])
+    gap_count = gap_slots.astype(np.int64) @ _SLOT_TO_SQUARE
+    threats = gap_count > 0
+    doubles = gap_count > 1
+
+    own_int = own.astype(np.int64)
+    mobility = (free * own_int).sum(axis=1)
+    blocked = (own & (free == 0)).sum(axis=1)
+    conn = own_int @ _DEGREES
+
+    # Phasen-Semantik wie engine.eval._side_terms
+    placing = hand > 0
+    flying = ~placing & (stones == 3)
+    moving = ~placing & ~flying
+    mob = np.where(placing, 0, np.where(flying, 3 * empties, mobility))
+    blk = np.where(placing, 0, blocked)
+    reachable = (own_int @ _ADJACENCY) > 0
+    threats = np.where(moving[:, None], threats & reachable, threats)
+    thr = threats.sum(axis=1)
+    dbl = (threats & doubles).sum(axis=1)
+
+    # Feld fuer Feld aufsteigend summiert (bitgleich zur skalaren Summe)
+    fork = np.zeros(n, dtype=np.float64)
+    for sq in range(24):
+        fork = fork + np.where(threats[:, sq], _RING_WEIGHTS[sq], 0.0)
+    fork = np.where(thr >= 2, fork, 0.0)
+    return stones, mills, open_mills, mob, thr, blk, dbl, fork, conn
+
+
+def feature_matrix(
+    boards: np.ndarray,
+    player: Stone | int | np.ndarray,
+    in_hand_white: int | np.ndarray,
+    in_hand_black: int | np.ndarray,
+) -> np.ndarray:
+    """
+    Rohe Eval-Terme fuer N Stellungen (Spalten :data:`FEATURE_NAMES`) aus Sicht
+    von `player` (Skalar oder je Zeile). Mit :func:`combine_features` ergibt
+    sich exakt ``engine.eval.evaluate``.
+    """
+    boards = np.asarray(boards)
+    n = boards.shape[0]
+    white = boards == Stone.WHITE
+    black = boards == Stone.BLACK
+    empty = ~(white | black)
+    hand_w = np.broadcast_to(np.asarray(in_hand_white, dtype=np.int64), (n,))
+    hand_b = np.broadcast_to(np.asarray(in_hand_black, dtype=np.int64), (n,))
+
+    white_lines = white[:, _MILL_INDEX].sum(axis=2)
+    black_lines = black[:, _MILL_INDEX].sum(axis=2)
+    empty_slots = empty[:, _MILL_INDEX]
+    empties = empty.sum(axis=1)
+    free = empty.astype(np.int64) @ _ADJACENCY
+
+    w = _side_features(white, white_lines, black_lines, hand_w, empty_slots, free, empties)
+    b = _side_features(black, black_lines, white_lines, hand_b, empty_slots, free, empties)
+
+    is_white = np.broadcast_to(np.asarray(player) == Stone.WHITE, (n,))
+    p = [np.where(is_white, wt, bt) for wt, bt in zip(w, b)]
+    o = [np.where(is_white, bt, wt) for wt, bt in zip(w, b)]
+    stones, mills, open_mills, mob, thr, blk, dbl, fork, conn = range(9)
+    columns = (
+        p[stones] - o[stones],
+        p[mills] - o[mills],
+        p[open_mills] - o[open_mills],
+        p[mob] - o[mob],
+        o[thr] - p[thr],
+        o[blk] - p[blk],
+        p[dbl] - o[dbl],
+        p[fork] - o[fork],
+        p[conn] - o[conn],
+    )
+    return np.column_stack([c.astype(np.float64) for c in columns]).reshape(n, len(FEATURE_NAMES))
+
+
+def combine_features(features: np.ndarray, weights: EvalWeights | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Gewichtet eine Feature-Matrix wie ``engine.eval._combine``: (scores[N], breakdown[N, 11])."""
+    if weights is None:
+        weights = EvalWeights()
+    feature_weights = [getattr(weights, name) for name in FEATURE_NAMES]
+    use_initiative = weights.initiative_strategic != 0.0 or weights.initiative_tactical != 0.0
+    if use_initiative:
+        # nur Material und Muehlen bleiben direkt gewichtet
+        feature_weights = feature_weights[:2] + [0.0] * (len(FEATURE_NAMES) - 2)
+
+    f = {name: features[:, i] for i, name in enumerate(FEATURE_NAMES)}
+    init_strat = f["mobility"] + f["open_mills"] + f["blocked_opponent"] + f["connectivity"]
+    init_tact = f["threats_mill_in_1"] + f["double_threats"] + f["fork_threats"]
+    columns = [w * f[name] for w, name in zip(feature_weights, FEATURE_NAMES)]
+    columns.append(weights.initiative_strategic * init_strat)
+    columns.append(weights.initiative_tactical * init_tact)
+
+    # Spalte fuer Spalte summiert (gleiche Rundung wie die skalare Summe)
+    scores = columns[0]
+    for column in columns[1:]:
+        scores = scores + column
+    return scores, np.column_stack(columns).reshape(features.shape[0], len(BREAKDOWN_KEYS))
+
+
+def evaluate_batch(
+    boards: np.ndarray,
+    player: Stone | int | np.ndarray,
+    in_hand_white: int | np.ndarray,
+    in_hand_black: int | np.ndarray,
+    weights: EvalWeights | None = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vektorisierte Variante von ``engine.eval.evaluate`` fuer N Stellungen
+    (``boards[N, 24]`` mit Stone-Werten). Liefert (scores[N], breakdown[N, 11])
+    aus Sicht von `player`, Spalten wie :data:`BREAKDOWN_KEYS`; Werte sind
+    bitgleich zur skalaren Funktion.
+    """
+    return combine_features(feature_matrix(boards, player, in_hand_white, in_hand_black), weights)
+
+
+def evaluate_light_batch(
+    boards: np.ndarray,
+    player: Stone | int | np.ndarray,
+    in_hand_white: int | np.ndarray,
+    in_hand_black: int | np.ndarray,
+) -> np.ndarray:
+    """Vektorisierte Variante von ``core.analysis.evaluate_light`` (Material, Mobility, Drohfelder)."""
+    f = feature_matrix(boards, player, in_hand_white, in_hand_black)
+    # gleiche Gewichte und Summenreihenfolge wie evaluate_light
+    return 10.0 * f[:, 0] + 1.0 * f[:, 3] + 2.0 * f[:, 4]
+
+
+def child_boards(state: GameState, actions: Sequence[Action]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Folgestellungen aller `actions` (aus ``legal_actions(state)``) als ein Array:
+    (boards[N, 24], in_hand_white[N], in_hand_black[N]) wie nach
+    ``apply_action_trusted``, ohne einzelne GameStates zu bauen.
+    """
+    n = len(actions)
+    mover = int(state.to_move)
+    boards = np.repeat(np.array([int(v) for v in state.board], dtype=np.int8)[None, :], n, axis=0)
+    hand_w = np.full(n, state.in_hand_white, dtype=np.int64)
+    hand_b = np.full(n, state.in_hand_black, dtype=np.int64)
+    if n == 0:
+        return boards, hand_w, hand_b
+
+    rows = np.arange(n)
+    dst = np.array([a.dst for a in actions], dtype=np.intp)
+    src = np.array([-1 if a.src is None else a.src for a in actions], dtype=np.intp)
+    is_remove = np.array([a.kind == "remove" for a in actions])
+    is_place = np.array([a.kind == "place" for a in actions])
+
+    moved = src >= 0
+    boards[rows[moved], src[moved]] = Stone.EMPTY
+    boards[rows, dst] = np.where(is_remove, int(Stone.EMPTY), mover)
+    if mover == Stone.WHITE:
+        hand_w -= is_place
+    else:
+        hand_b -= is_place
+    return boards, hand_w, hand_b
+
+
+def scored_actions_batch(
+    state: GameState,
+    max_candidates: int = 5,
+    *,
+    weights: EvalWeights | None = None,
+) -> List[Tuple[Action, float]]:
+    """
+    Gebuendelte Variante von ``core.analysis.scored_actions_for_to_move``:
+    alle Folgestellungen werden in einem Array bewertet. Ohne `weights` mit
+    ``evaluate_light`` (identische Scores und Reihenfolge), sonst mit
+    ``engine.eval.evaluate`` unter diesen Gewichten.
+    """
+    to_move = state.to_move
+    actions = legal_actions(state)
+    boards, hand_w, hand_b = child_boards(state, actions)
+    if weights is None:
+        scores = evaluate_light_batch(boards, to_move, hand_w, hand_b)
+    else:
+        scores, _ = evaluate_batch(boards, to_move, hand_w, hand_b, weights)
+
+    scored = [(a, float(score)) for a, score in zip(actions, scores.tolist())]
+    scored.sort(key=lambda t: t[1], reverse=True)
+    return scored[:max_candidates]
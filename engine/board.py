@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from core.bitboard import (
+    FULL_MASK,
+    MILL_MASKS_BY_SQUARE,
+    NEIGHBOR_MASKS,
+    BitState,
+    forms_mill_mask,
+    iter_squares,
+    removable_mask,
+)
+from core.graph import NEIGHBORS
+from core.hash import (
+    SymKeys,
+    canonical_zobrist_key,
+    zobrist_status,
+    zobrist_sym_keys_from_state,
+    zobrist_sym_toggle,
+    zobrist_sym_xor,
+)
+from core.state import GameState, Phase, Stone, opponent
+
+from .movegen import NO_PLY, gen_ply_codes
+
+__all__ = ["SearchBoard", "Undo"]
+
+_KIND_PLACE = 0
+_KIND_MOVE = 1
+_KIND_FLY = 2
+_KIND_REMOVE = 3
+
+_NEIGHBOR_LISTS: Tuple[Tuple[int, ...], ...] = tuple(tuple(NEIGHBORS[i]) for i in range(24))
+_DEGREES: Tuple[int, ...] = tuple(len(nbs) for nbs in _NEIGHBOR_LISTS)
+
+# (code, white, black, to_move, in_hand_white, in_hand_black, pending_remove, turn_no, keys)
+Undo = Tuple[int, int, int, Stone, int, int, bool, int, SymKeys]
+
+
+class SearchBoard:
+    """
+    Veraenderliches Such-Board mit ``make(code)``/``unmake(undo)``.
+
+    Haelt Belegung (Bitmasken), Handsteine, Zugrecht, ``pending_remove`` und
+    die 8 Symmetrie-Zobrist-Keys. Zusaetzlich werden die Eval-Terme inkrementell
+    mitgefuehrt (Index 0 = WHITE, 1 = BLACK), damit ``engine.eval.evaluate_board``
+    ohne Brett-Scan auskommt:
+
+    - ``mills``/``open_mills``: geschlossene bzw. offene Muehlen (2 eigene + 1 leer)
+    - ``threat_counts[i][sq]``: Anzahl offener Muehlen von i mit Luecke ``sq``;
+      ``threat_mask``/``double_mask`` = Felder mit Zaehler >= 1 bzw. >= 2
+    - ``free_neighbors[sq]``: leere Nachbarn je Feld; ``mobility`` = Summe ueber
+      die eigenen Steine, ``blocked`` = eigene Steine ohne leeren Nachbarn
+    - ``connectivity``: Summe der Knotengrade der eigenen Steine
+
+    Jeder Stein-Wechsel aktualisiert nur die 2 Muehlen und die Nachbarn des
+    Feldes. ``make`` wendet einen gepackten Ply-Code
+    (siehe ``engine.movegen.pack_ply``) in-place an – mit exakt der Semantik
+    von ``apply_ply`` – und liefert den Undo-Record fuer ``unmake``.
+    Nur fuer Codes aus :meth:`legal_codes` gedacht (keine Validierung).
+    """
+
+    __slots__ = (
+        "white",
+        "black",
+        "to_move",
+        "in_hand_white",
+        "in_hand_black",
+        "pending_remove",
+        "turn_no",
+        "keys",
+        "mills",
+        "open_mills",
+        "threat_counts",
+        "threat_mask",
+        "double_mask",
+        "free_neighbors",
+        "mobility",
+        "blocked",
+        "connectivity",
+    )
+
+    def __init__(self, bs: BitState, keys: SymKeys) -> None:
+        # Zaehler fuer das leere Brett, danach Steine einzeln aufsetzen
+        self.white = 0
+        self.black = 0
+        self.mills = [0, 0]
+        self.open_mills = [0, 0]
+        self.threat_counts = [[0] * 24, [0] * 24]
+        self.threat_mask = [0, 0]
+        self.double_mask = [0, 0]
+        self.free_neighbors = list(_DEGREES)
+        self.mobility = [0, 0]
+        self.blocked = [0, 0]
+        self.connectivity = [0, 0]
+        for sq in iter_squares(bs.white):
+            self._flip(Stone.WHITE, sq)
+        for sq in iter_squares(bs.black):
+            self._flip(Stone.BLACK, sq)
+        self.to_move = Stone(bs.to_move)
+        self.in_hand_white = bs.in_hand_white
+        self.in_hand_black = bs.in_hand_black
+        self.pending_remove = bs.pending_remove
+        self.turn_no = bs.turn_no
+        self.keys = keys
+
+    @staticmethod
+    def from_state(state: GameState) -> "SearchBoard":
+        return SearchBoard(BitState.from_state(state), zobrist_sym_keys_from_state(state))
+
+    def bitstate(self) -> BitState:
+        return BitState(
+            white=self.white,
+            black=self.black,
+            to_move=self.to_move,
+            in_hand_white=self.in_hand_white,
+            in_hand_black=self.in_hand_black,
+            pending_remove=self.pending_remove,
+            turn_no=self.turn_no,
+        )
+
+    def to_state(self) -> GameState:
+        return self.bitstate().to_state()
+
+    def canonical_key(self) -> Tuple[int, int]:
+        return canonical_zobrist_key(self.keys)
+
+    def phase(self, p: Stone) -> Phase:
+        if p == Stone.WHITE:
+            in_hand, own = self.in_hand_white, self.white
+        else:
+            in_hand, own = self.in_hand_black, self.black
+        if in_hand > 0:
+            return "placing"
+        return "flying" if own.bit_count() <= 3 else "moving"
+
+    def legal_codes(self) -> List[int]:
+        if self.to_move == Stone.WHITE:
+            return gen_ply_codes(self.white, self.black, self.in_hand_white, self.pending_remove)
+        return gen_ply_codes(self.black, self.white, self.in_hand_black, self.pending_remove)
+
+    def is_legal_code(self, code: int) -> bool:
+        """Prueft einen fremden Code (z. B. TT-Move) ohne volle Zuggenerierung."""
+        if code == NO_PLY:
+            return False
+        if self.to_move == Stone.WHITE:
+            own, opp, in_hand = self.white, self.black, self.in_hand_white
+        else:
+            own, opp, in_hand = self.black, self.white, self.in_hand_black
+        kind = code & 0x3
+        src = (code >> 2 & 0x1F) - 1
+        dst = (code >> 7 & 0x1F) - 1
+        rem = (code >> 12 & 0x1F) - 1
+        if code >> 17 or max(src, dst, rem) >= 24:
+            return False
+        if self.pending_remove:
+            return kind == _KIND_REMOVE and src < 0 and dst < 0 and rem >= 0 and bool(removable_mask(opp) >> rem & 1)
+        if kind == _KIND_REMOVE or dst < 0 or (own | opp) >> dst & 1:
+            return False
+        if in_hand > 0:
+            if kind != _KIND_PLACE or src >= 0:
+                return False
+            after = own | 1 << dst
+        else:
+            flying = own.bit_count() <= 3
+            if kind != (_KIND_FLY if flying else _KIND_MOVE) or src < 0 or not own >> src & 1:
+                return False
+            if not flying and not NEIGHBOR_MASKS[src] >> dst & 1:
+                return False
+            after = (own ^ (1 << src)) | 1 << dst
+        removables = removable_mask(opp) if forms_mill_mask(after, dst) else 0
+        if rem < 0:
+            return not removables
+        return bool(removables >> rem & 1)
+
+    def winner(self) -> Optional[Stone]:
+        """Wie ``core.rules.winner`` (ohne Draw-Regeln)."""
+        if self.in_hand_white == 0 and self.white.bit_count() < 3:
+            return Stone.BLACK
+        if self.in_hand_black == 0 and self.black.bit_count() < 3:
+            return Stone.WHITE
+        if self.pending_remove:
+            return None
+        if self.to_move == Stone.WHITE:
+            own, opp, in_hand = self.white, self.black, self.in_hand_white
+        else:
+            own, opp, in_hand = self.black, self.white, self.in_hand_black
+        if in_hand > 0:
+            return None
+        empty = FULL_MASK & ~(own | opp)
+        if own.bit_count() <= 3:
+            if own and empty:
+                return None
+            return opponent(self.to_move)
+        for sq in iter_squares(own):
+            if NEIGHBOR_MASKS[sq] & empty:
+                return None
+        return opponent(self.to_move)
+
+    def _status(self) -> int:
+        return zobrist_status(
+            self.to_move,
+            self.phase(self.to_move),
+            self.pending_remove,
+            self.in_hand_white,
+            self.in_hand_black,
+        )
+
+    def _toggle(self, p: Stone, sq: int) -> None:
+        self._flip(p, sq)
+        self.keys = zobrist_sym_toggle(self.keys, p, sq)
+
+    def _flip(self, p: Stone, sq: int) -> None:
+        """Setzt/entfernt einen Stein und aktualisiert die Eval-Zaehler (ohne Keys)."""
+        lines = MILL_MASKS_BY_SQUARE[sq]
+        for m in lines:
+            self._line(m, -1)
+        bit = 1 << sq
+        if p == Stone.WHITE:
+            self.white ^= bit
+            idx = 0
+            placed = self.white & bit
+        else:
+            self.black ^= bit
+            idx = 1
+            placed = self.black & bit
+        for m in lines:
+            self._line(m, 1)
+
+        free = self.free_neighbors
+        mobility = self.mobility
+        blocked = self.blocked
+        white = self.white
+        black = self.black
+        if placed:
+            for nb in _NEIGHBOR_LISTS[sq]:
+                free[nb] -= 1
+                if white >> nb & 1:
+                    mobility[0] -= 1
+                    if not free[nb]:
+                        blocked[0] += 1
+                elif black >> nb & 1:
+                    mobility[1] -= 1
+                    if not free[nb]:
+                        blocked[1] += 1
+            mobility[idx] += free[sq]
+            if not free[sq]:
+                blocked[idx] += 1
+            self.connectivity[idx] += _DEGREES[sq]
+        else:
+            mobility[idx] -= free[sq]
+            if not free[sq]:
+                blocked[idx] -= 1
+            self.connectivity[idx] -= _DEGREES[sq]
+            for nb in _NEIGHBOR_LISTS[sq]:
+                if white >> nb & 1:
+                    if not free[nb]:
+                        blocked[0] -= 1
+                    mobility[0] += 1
+                elif black >> nb & 1:
+                    if not free[nb]:
+                        blocked[1] -= 1
+                    mobility[1] += 1
+                free[nb] += 1
+
+    def _line(self, m: int, sign: int) -> None:
+        """Beitrag einer Muehlen-Linie zu den Zaehlern addieren (+1) bzw. abziehen (-1)."""
+        w = (self.white & m).bit_count()
+        b = (self.black & m).bit_count()
+        if w == 3:
+            self.mills[0] += sign
+        elif b == 3:
+            self.mills[1] += sign
+        elif w == 2 and not b:
+            self._threat(0, m & ~self.white, sign)
+        elif b == 2 and not w:
+            self._threat(1, m & ~self.black, sign)
+
+    def _threat(self, idx: int, gap: int, sign: int) -> None:
+        self.open_mills[idx] += sign
+        sq = gap.bit_length() - 1
+        counts = self.threat_counts[idx]
+        n = counts[sq] + sign
+        counts[sq] = n
+        if n == 0:
+            self.threat_mask[idx] &= ~gap
+        elif n == 1:
+            self.threat_mask[idx] |= gap
+            self.double_mask[idx] &= ~gap
+        else:
+            self.double_mask[idx] |= gap
+
+    def make(self, code: int) -> Undo:
+        undo: Undo = (
+            code,
+            self.white,
+            self.black,
+            self.to_move,
+            self.in_hand_white,
+            self.in_hand_black,
+            self.pending_remove,
+            self.turn_no,
+            self.keys,
+        )
+        status_before = self._status()
+        p = self.to_move
+        opp = opponent(p)
+        kind = code & 0x3
+        rem = (code >> 12 & 0x1F) - 1
+
+        if kind == _KIND_REMOVE:
+            self._toggle(opp, rem)
+            self.to_move = opp
+            self.pending_remove = False
+            self.turn_no += 1
+        else:
+            dst = (code >> 7 & 0x1F) - 1
+            if kind == _KIND_PLACE:
+                if p == Stone.WHITE:
+                    self.in_hand_white -= 1
+                else:
+                    self.in_hand_black -= 1
+            else:
+                self._toggle(p, (code >> 2 & 0x1F) - 1)
+            self._toggle(p, dst)
+
+            if rem >= 0:
+                self._toggle(opp, rem)
+                self.to_move = opp
+                self.turn_no += 1
+            else:
+                own, other = (self.white, self.black) if p == Stone.WHITE else (self.black, self.white)
+                # Muehle ohne entfernbare Steine: gleicher Spieler bleibt am Zug (wie apply_ply)
+                if not (other == 0 and forms_mill_mask(own, dst)):
+                    self.to_move = opp
+                    self.turn_no += 1
+            self.pending_remove = False
+
+        self.keys = zobrist_sym_xor(self.keys, status_before ^ self._status())
+        return undo
+
+    def make_null(self) -> Undo:
+        """Null-Move: nur das Zugrecht wechselt (fuer Null-Move-Pruning)."""
+        undo: Undo = (
+            NO_PLY,
+            self.white,
+            self.black,
+            self.to_move,
+            self.in_hand_white,
+            self.in_hand_black,
+            self.pending_remove,
+            self.turn_no,
+            self.keys,
+        )
+        status_before = self._status()
+        self.to_move = opponent(self.to_move)
+        self.keys = zobrist_sym_xor(self.keys, status_before ^ self._status())
+        return undo
+
+    def unmake(self, undo: Undo) -> None:
+        code = undo[0]
+        if code == NO_PLY:
+            self.to_move = undo[3]
+            self.keys = undo[8]
+            return
+        p = undo[3]
+        opp = opponent(p)
+        kind = code & 0x3
+        rem = (code >> 12 & 0x1F) - 1
+        # Stein-Wechsel in umgekehrter Reihenfolge zuruecknehmen (haelt die Zaehler konsistent)
+        if kind == _KIND_REMOVE:
+            self._flip(opp, rem)
+        else:
+            if rem >= 0:
+                self._flip(opp, rem)
+            self._flip(p, (code >> 7 & 0x1F) - 1)
+            if kind != _KIND_PLACE:
+                self._flip(p, (code >> 2 & 0x1F) - 1)
+        (
+            _,
+            self.white,
+            self.black,
+            self.to_move,
+            self.in_hand_white,
+            self.in_hand_black,
+            self.pending_remove,
+            self.turn_no,
+            self.keys,
+        ) = undo
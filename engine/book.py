@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.graph import SYMMETRY_INVERSE_MAPS, SYMMETRY_MAPS
+from core.hash import position_key_and_symmetry
+from core.state import GameState
+
+from .movegen import map_ply_code, pack_ply, unpack_ply
+from .types import Ply
+
+__all__ = [
+    "BookMove",
+    "OpeningBook",
+]
+
+
+@dataclass(frozen=True)
+class BookMove:
+    ply: Ply
+    score: float  # aus Sicht der Seite am Zug
+
+
+# (position_key_with_symmetry, Handsteine WHITE, Handsteine BLACK)
+_BookKey = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class _BookEntry:
+    depth: int
+    # (gepackter Ply-Code im kanonischen Frame, Score), bester Zug zuerst
+    moves: Tuple[Tuple[int, float], ...]
+
+
+class OpeningBook:
+    """
+    Eroeffnungsbuch: je Stellungsklasse (``position_key_with_symmetry``) die
+    besten Zuege einer tiefen Offline-Suche mit Score und Suchtiefe.
+
+    Zuege liegen im kanonischen Frame der Symmetrie-Klasse und werden beim
+    Nachschlagen ueber die Symmetrie der angefragten Stellung zurueckgebildet;
+    alle 8 symmetrischen Varianten teilen sich damit einen Eintrag. Der
+    Positions-Key enthaelt keine Handsteine, Eintraege sind daher ueber
+    (Key, Handsteine WHITE, Handsteine BLACK) adressiert.
+
+    Dateiformat: JSONL, eine Zeile je Eintrag
+    (``{"key", "hands", "depth", "moves": [[code, score], ...]}``).
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[_BookKey, _BookEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, state: GameState) -> bool:
+        return self.lookup(state) is not None
+
+    def add(self, state: GameState, moves: Iterable[Tuple[Ply, float]], depth: int) -> None:
+        """Traegt die Zuege (bester zuerst, Scores aus Sicht der Seite am Zug) ein."""
+        key, sym = position_key_and_symmetry(state)
+        mapping = SYMMETRY_MAPS[sym]
+        codes = tuple((map_ply_code(pack_ply(ply), mapping), float(score)) for ply, score in moves)
+        if not codes:
+            return
+        book_key = (key, state.in_hand_white, state.in_hand_black)
+        existing = self._entries.get(book_key)
+        if existing is not None and existing.depth > depth:
+            return
+        self._entries[book_key] = _BookEntry(depth=depth, moves=codes)
+
+    def lookup(self, state: GameState) -> Optional[Tuple[int, List[BookMove]]]:
+        """(Suchtiefe, Buchzuege im Frame von `state`) oder ``None``."""
+        key, sym = position_key_and_symmetry(state)
+        entry = self._entries.get((key, state.in_hand_white, state.in_hand_black))
+        if entry is None:
+            return None
+        inverse = SYMMETRY_INVERSE_MAPS[sym]
+        moves = [BookMove(ply=unpack_ply(map_ply_code(code, inverse)), score=score) for code, score in entry.moves]
+        return entry.depth, moves
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fh:
+            for book_key in sorted(self._entries):
+                entry = self._entries[book_key]
+                row = {
+                    "key": book_key[0],
+                    "hands": list(book_key[1:]),
+                    "depth": entry.depth,
+                    "moves": [[code, score] for code, score in entry.moves],
+                }
+                fh.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "OpeningBook":
+        book = cls()
+        with Path(path).open("r", encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                book_key = (int(row["key"]), int(row["hands"][0]), int(row["hands"][1]))
+                book._entries[book_key] = _BookEntry(
+                    depth=int(row["depth"]),
+                    moves=tuple((int(code), float(score)) for code, score in row["moves"]),
+                )
+        return book
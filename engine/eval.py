@@ -1,27 +1,178 @@
 from __future__ import annotations
 
-from typing import Tuple
-
-from core.analysis import (
-    blocked_stones,
-    compute_threat_squares,
-    double_threat_squares,
-    fork_threat_score,
-    mobility_score,
-)
-from core.graph import MILLS, NEIGHBORS
-from core.state import GameState, Stone, opponent
+from typing import TYPE_CHECKING, Tuple
+
+from core.bitboard import FULL_MASK, MILL_MASKS, NEIGHBOR_MASKS, iter_squares
+from core.graph import NEIGHBORS, RING_WEIGHT_BY_INDEX
+from core.state import GameState, Stone
 
 from .types import EvalBreakdown, EvalWeights
 
+if TYPE_CHECKING:
+    from .board import SearchBoard
+
+
+_DEGREES: Tuple[int, ...] = tuple(len(NEIGHBORS[i]) for i in range(24))
+
 
 def evaluate(state: GameState, player: Stone, weights: EvalWeights | None = None) -> Tuple[float, EvalBreakdown]:
     """
     Light, explainable evaluation. Returns (score, breakdown) from player's POV.
+
+    Fused: ein Durchlauf ueber Felder und Muehlen liefert alle Terme fuer beide
+    Spieler (gleiche Semantik wie die Einzelfunktionen in core.analysis).
+    """
+    if weights is None:
+        weights = EvalWeights()
+    p = 0 if player == Stone.WHITE else 1
+    o = 1 - p
+    board = state.board
+    in_hand = (state.in_hand_white, state.in_hand_black)
+
+    # Ein Durchlauf ueber die Felder: Bitmasken, Konnektivitaet
+    masks = [0, 0]
+    conn = [0, 0]
+    for sq, v in enumerate(board):
+        if v == Stone.WHITE:
+            masks[0] |= 1 << sq
+            conn[0] += _DEGREES[sq]
+        elif v == Stone.BLACK:
+            masks[1] |= 1 << sq
+            conn[1] += _DEGREES[sq]
+    white, black = masks
+    empty = FULL_MASK & ~(white | black)
+
+    # Ein Durchlauf ueber die Muehlen: geschlossene/offene Muehlen, Drohfelder (einfach/doppelt)
+    mills = [0, 0]
+    open_mills = [0, 0]
+    threats = [0, 0]
+    doubles = [0, 0]
+    for m in MILL_MASKS:
+        w = (white & m).bit_count()
+        b = (black & m).bit_count()
+        if w == 3:
+            mills[0] += 1
+        elif b == 3:
+            mills[1] += 1
+        elif w == 2 and not b:
+            open_mills[0] += 1
+            gap = m & empty
+            doubles[0] |= threats[0] & gap
+            threats[0] |= gap
+        elif b == 2 and not w:
+            open_mills[1] += 1
+            gap = m & empty
+            doubles[1] |= threats[1] & gap
+            threats[1] |= gap
+
+    # Ein Durchlauf ueber die Steine: Mobility + blockierte Steine
+    mobility = [0, 0]
+    blocked = [0, 0]
+    for idx in (0, 1):
+        for sq in iter_squares(masks[idx]):
+            free = (NEIGHBOR_MASKS[sq] & empty).bit_count()
+            mobility[idx] += free
+            if not free:
+                blocked[idx] += 1
+
+    empties = empty.bit_count()
+    mob_p, blk_p, thr_p, dbl_p, fork_p = _side_terms(
+        masks[p], in_hand[p], empties, threats[p], doubles[p], mobility[p], blocked[p]
+    )
+    mob_o, blk_o, thr_o, dbl_o, fork_o = _side_terms(
+        masks[o], in_hand[o], empties, threats[o], doubles[o], mobility[o], blocked[o]
+    )
+    return _combine(
+        weights,
+        masks[p].bit_count() - masks[o].bit_count(),
+        mills[p] - mills[o],
+        open_mills[p] - open_mills[o],
+        mob_p - mob_o,
+        thr_o - thr_p,
+        blk_o - blk_p,
+        dbl_p - dbl_o,
+        fork_p - fork_o,
+        conn[p] - conn[o],
+    )
+
+
+def evaluate_board(board: "SearchBoard", player: Stone, weights: EvalWeights | None = None) -> Tuple[float, EvalBreakdown]:
+    """
+    Wie :func:`evaluate`, liest die Terme aber aus den inkrementell gefuehrten
+    Zaehlern des ``SearchBoard`` (kein Scan ueber MILLS/NEIGHBORS).
     """
     if weights is None:
         weights = EvalWeights()
-    opp = opponent(player)
+    p = 0 if player == Stone.WHITE else 1
+    o = 1 - p
+    empties = (FULL_MASK & ~(board.white | board.black)).bit_count()
+    masks = (board.white, board.black)
+    in_hand = (board.in_hand_white, board.in_hand_black)
+    mob_p, blk_p, thr_p, dbl_p, fork_p = _side_terms(
+        masks[p], in_hand[p], empties, board.threat_mask[p], board.double_mask[p], board.mobility[p], board.blocked[p]
+    )
+    mob_o, blk_o, thr_o, dbl_o, fork_o = _side_terms(
+        masks[o], in_hand[o], empties, board.threat_mask[o], board.double_mask[o], board.mobility[o], board.blocked[o]
+    )
+    return _combine(
+        weights,
+        masks[p].bit_count() - masks[o].bit_count(),
+        board.mills[p] - board.mills[o],
+        board.open_mills[p] - board.open_mills[o],
+        mob_p - mob_o,
+        thr_o - thr_p,
+        blk_o - blk_p,
+        dbl_p - dbl_o,
+        fork_p - fork_o,
+        board.connectivity[p] - board.connectivity[o],
+    )
+
+
+def _side_terms(
+    own: int,
+    in_hand: int,
+    empties: int,
+    threats: int,
+    doubles: int,
+    mobility: int,
+    blocked: int,
+) -> Tuple[int, int, int, int, float]:
+    # (mobility, blocked, threats, double threats, fork score) mit der Phasen-Semantik aus core.analysis
+    if in_hand > 0:
+        mob = 0
+        blk = 0
+    else:
+        blk = blocked
+        if own.bit_count() == 3:
+            mob = 3 * empties
+        else:
+            mob = mobility
+            # moving: Drohfeld nur, wenn ein eigener Stein angrenzt
+            reachable = 0
+            for sq in iter_squares(threats):
+                if NEIGHBOR_MASKS[sq] & own:
+                    reachable |= 1 << sq
+            threats = reachable
+    n = threats.bit_count()
+    dbl = (threats & doubles).bit_count()
+    fork = 0.0
+    if n >= 2:
+        fork = sum(RING_WEIGHT_BY_INDEX.get(sq, 1.0) for sq in iter_squares(threats))
+    return mob, blk, n, dbl, fork
+
+
+def _combine(
+    weights: EvalWeights,
+    mat: int,
+    mills: int,
+    open_mills: int,
+    mob: int,
+    thr: int,
+    blk: int,
+    double_thr: int,
+    fork_thr: float,
+    conn: int,
+) -> Tuple[float, EvalBreakdown]:
     w_mat = weights.material
     w_mill = weights.mills
     w_open = weights.open_mills
@@ -44,15 +195,6 @@ def evaluate(state: GameState, player: Stone, weights: EvalWeights | None = None
         w_fork = 0.0
         w_conn = 0.0
 
-    mat = state.stones_on_board(player) - state.stones_on_board(opp)
-    mills = _count_mills(state, player) - _count_mills(state, opp)
-    open_mills = _count_open_mills(state, player) - _count_open_mills(state, opp)
-    mob = mobility_score(state, player) - mobility_score(state, opp)
-    thr = len(compute_threat_squares(state, opp, use_fallback=False)) - len(compute_threat_squares(state, player, use_fallback=False))
-    blk = len(blocked_stones(state, opp)) - len(blocked_stones(state, player))
-    double_thr = len(double_threat_squares(state, player)) - len(double_threat_squares(state, opp))
-    fork_thr = fork_threat_score(state, player) - fork_threat_score(state, opp)
-    conn = _connectivity_score(state, player) - _connectivity_score(state, opp)
     init_strat = mob + open_mills + blk + conn
     init_tact = thr + double_thr + fork_thr
 
@@ -84,32 +226,3 @@ def evaluate(state: GameState, player: Stone, weights: EvalWeights | None = None
         + breakdown["initiative_tactical"]
     )
     return score, breakdown
-
-
-def _count_open_mills(state: GameState, player: Stone) -> int:
-    count = 0
-    board = state.board
-    for a, b, c in MILLS:
-        vals = (board[a], board[b], board[c])
-        own = sum(1 for v in vals if v == player)
-        empty = sum(1 for v in vals if v == Stone.EMPTY)
-        if own == 2 and empty == 1:
-            count += 1
-    return count
-
-
-def _count_mills(state: GameState, player: Stone) -> int:
-    count = 0
-    board = state.board
-    for a, b, c in MILLS:
-        if board[a] == board[b] == board[c] == player:
-            count += 1
-    return count
-
-
-def _connectivity_score(state: GameState, player: Stone) -> int:
-    total = 0
-    for idx, stone in enumerate(state.board):
-        if stone == player:
-            total += len(NEIGHBORS[idx])
-    return total
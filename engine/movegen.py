@@ -1,38 +1,194 @@
 from __future__ import annotations
 
 from dataclasses import replace
+from functools import lru_cache
 from typing import List
 
-from core.rules import Action, apply_action, forms_mill_after_placement, legal_actions, phase_for, removable_positions
+from core.bitboard import FULL_MASK, NEIGHBOR_MASKS, BitState, forms_mill_mask, iter_squares, removable_mask
+from core.rules import Action, apply_action, apply_action_trusted, phase_for, removable_positions
 from core.state import GameState, Stone, opponent
 
 from .types import MoveKind, Ply
 
 
-def legal_plies(state: GameState) -> List[Ply]:
-    """Liefert legale Halbzuege mit optionalem Remove als Composite."""
-    player = state.to_move
-
-    if state.pending_remove:
-        victim = opponent(player)
-        removables = removable_positions(state, victim)
-        return [Ply(kind="remove", remove=dst) for dst in removables]
+# Kompakte Ply-Kodierung (17 Bit): kind | src+1 << 2 | dst+1 << 7 | remove+1 << 12.
+# Feldwert 0 steht fuer None; der Code 0 ist nie ein gueltiges Ply ("kein Zug").
+_KIND_CODES: dict[str, int] = {"place": 0, "move": 1, "fly": 2, "remove": 3}
+_CODE_KINDS: tuple[MoveKind, ...] = ("place", "move", "fly", "remove")
+NO_PLY = 0
+
+
+def pack_ply(ply: Ply) -> int:
+    """Ply -> int (siehe Kodierung oben)."""
+    return (
+        _KIND_CODES[ply.kind]
+        | (0 if ply.src is None else ply.src + 1) << 2
+        | (0 if ply.dst is None else ply.dst + 1) << 7
+        | (0 if ply.remove is None else ply.remove + 1) << 12
+    )
+
+
+@lru_cache(maxsize=None)
+def unpack_ply(code: int) -> Ply:
+    """int -> Ply (Umkehrung von :func:`pack_ply`; Ply-Objekte werden geteilt)."""
+    src = code >> 2 & 0x1F
+    dst = code >> 7 & 0x1F
+    rem = code >> 12 & 0x1F
+    return Ply(
+        kind=_CODE_KINDS[code & 0x3],
+        src=src - 1 if src else None,
+        dst=dst - 1 if dst else None,
+        remove=rem - 1 if rem else None,
+    )
+
+
+# Vorberechnete Basis-Codes; ein Remove wird per OR von REMOVE_BITS[r] angehaengt.
+PLACE_CODES: tuple[int, ...] = tuple(pack_ply(Ply(kind="place", dst=d)) for d in range(24))
+MOVE_CODES: tuple[tuple[int, ...], ...] = tuple(
+    tuple(pack_ply(Ply(kind="move", src=s, dst=d)) for d in range(24)) for s in range(24)
+)
+FLY_CODES: tuple[tuple[int, ...], ...] = tuple(
+    tuple(pack_ply(Ply(kind="fly", src=s, dst=d)) for d in range(24)) for s in range(24)
+)
+REMOVE_CODES: tuple[int, ...] = tuple(pack_ply(Ply(kind="remove", remove=r)) for r in range(24))
+REMOVE_BITS: tuple[int, ...] = tuple((r + 1) << 12 for r in range(24))
+
+
+def legal_ply_codes(bs: BitState) -> List[int]:
+    """
+    Tabellengetriebene Zuggenerierung auf einem :class:`BitState`.
 
-    phase = phase_for(state, player)
-    base_actions = legal_actions(state)
-    plies: List[Ply] = []
+    Liefert gepackte Ply-Codes (siehe :func:`pack_ply`) in derselben Reihenfolge
+    wie :func:`legal_plies`: Quelle/Ziel aufsteigend, Removes aufsteigend.
+    Ziele kommen aus ``NEIGHBOR_MASKS``, Muehlen-Checks aus ``MILL_MASKS_BY_SQUARE``;
+    die Remove-Kandidaten haengen nur vom Gegner ab und werden einmal berechnet.
+    """
+    if bs.to_move == Stone.WHITE:
+        return gen_ply_codes(bs.white, bs.black, bs.in_hand_white, bs.pending_remove)
+    return gen_ply_codes(bs.black, bs.white, bs.in_hand_black, bs.pending_remove)
+
+
+def gen_ply_codes(own: int, opp: int, in_hand: int, pending_remove: bool) -> List[int]:
+    """Kern von :func:`legal_ply_codes` auf rohen Masken (Seite am Zug = ``own``)."""
+    if pending_remove:
+        return [REMOVE_CODES[r] for r in iter_squares(removable_mask(opp))]
+
+    empty = FULL_MASK & ~(own | opp)
+    removals: List[int] | None = None
+    codes: List[int] = []
+
+    if in_hand > 0:
+        for dst in iter_squares(empty):
+            base = PLACE_CODES[dst]
+            if forms_mill_mask(own | 1 << dst, dst):
+                if removals is None:
+                    removals = [REMOVE_BITS[r] for r in iter_squares(removable_mask(opp))]
+                if removals:
+                    codes.extend(base | rb for rb in removals)
+                    continue
+            codes.append(base)
+        return codes
+
+    flying = own.bit_count() <= 3
+    table = FLY_CODES if flying else MOVE_CODES
+    for src in iter_squares(own):
+        targets = empty if flying else NEIGHBOR_MASKS[src] & empty
+        if not targets:
+            continue
+        row = table[src]
+        rest = own ^ (1 << src)
+        for dst in iter_squares(targets):
+            base = row[dst]
+            if forms_mill_mask(rest | 1 << dst, dst):
+                if removals is None:
+                    removals = [REMOVE_BITS[r] for r in iter_squares(removable_mask(opp))]
+                if removals:
+                    codes.extend(base | rb for rb in removals)
+                    continue
+            codes.append(base)
+    return codes
+
+
+def gen_mill_codes(own: int, opp: int, in_hand: int, gaps: int) -> List[int]:
+    """
+    Nur Muehlen schliessende Codes (inkl. Remove-Varianten). ``gaps`` sind die
+    Luecken offener eigener Muehlen (2 eigene + 1 leer) – nur dort kann eine
+    Muehle entstehen. Teilmenge von :func:`gen_ply_codes`, disjunkt zu
+    :func:`gen_quiet_codes`.
+    """
+    if not gaps:
+        return []
+    removals = [REMOVE_BITS[r] for r in iter_squares(removable_mask(opp))]
+    codes: List[int] = []
+    if in_hand > 0:
+        for dst in iter_squares(gaps):
+            base = PLACE_CODES[dst]
+            if removals:
+                codes.extend(base | rb for rb in removals)
+            else:
+                codes.append(base)
+        return codes
+
+    flying = own.bit_count() <= 3
+    table = FLY_CODES if flying else MOVE_CODES
+    for dst in iter_squares(gaps):
+        sources = own if flying else NEIGHBOR_MASKS[dst] & own
+        for src in iter_squares(sources):
+            if not forms_mill_mask((own ^ (1 << src)) | 1 << dst, dst):
+                continue
+            base = table[src][dst]
+            if removals:
+                codes.extend(base | rb for rb in removals)
+            else:
+                codes.append(base)
+    return codes
+
+
+def gen_quiet_codes(own: int, opp: int, in_hand: int, gaps: int, targets: int = FULL_MASK) -> List[int]:
+    """
+    Zuege ohne Muehlenschluss mit Ziel in ``targets`` (``gaps`` wie bei
+    :func:`gen_mill_codes`). Zusammen mit :func:`gen_mill_codes` genau
+    :func:`gen_ply_codes` (ohne ``pending_remove``).
+    """
+    empty = FULL_MASK & ~(own | opp) & targets
+    if in_hand > 0:
+        return [PLACE_CODES[dst] for dst in iter_squares(empty & ~gaps)]
+
+    flying = own.bit_count() <= 3
+    table = FLY_CODES if flying else MOVE_CODES
+    codes: List[int] = []
+    for src in iter_squares(own):
+        dsts = empty if flying else NEIGHBOR_MASKS[src] & empty
+        if not dsts:
+            continue
+        row = table[src]
+        rest = own ^ (1 << src)
+        for dst in iter_squares(dsts):
+            if gaps >> dst & 1 and forms_mill_mask(rest | 1 << dst, dst):
+                continue
+            codes.append(row[dst])
+    return codes
+
+
+def map_ply_code(code: int, mapping: tuple[int, ...]) -> int:
+    """Alle Felder eines Ply-Codes durch eine Symmetrie-Abbildung schicken."""
+    src = code >> 2 & 0x1F
+    dst = code >> 7 & 0x1F
+    rem = code >> 12 & 0x1F
+    return (
+        (code & 0x3)
+        | (mapping[src - 1] + 1 if src else 0) << 2
+        | (mapping[dst - 1] + 1 if dst else 0) << 7
+        | (mapping[rem - 1] + 1 if rem else 0) << 12
+    )
 
-    for act in base_actions:
-        if act.kind == "place":
-            plies.extend(_plies_for_placement(state, player, act.dst))
-        elif act.kind == "move":
-            move_kind: MoveKind = "fly" if phase == "flying" else "move"
-            plies.extend(_plies_for_move(state, player, move_kind, act.src, act.dst))
 
-    return plies
+def legal_plies(state: GameState) -> List[Ply]:
+    """Liefert legale Halbzuege mit optionalem Remove als Composite."""
+    return [unpack_ply(code) for code in legal_ply_codes(BitState.from_state(state))]
 
 
-def apply_ply(state: GameState, ply: Ply) -> GameState:
+def apply_ply(state: GameState, ply: Ply, *, trusted: bool = False) -> GameState:
     """
     Wendet ein einzelnes Ply („Zug inkl. optionalem Remove") auf einen GameState an.
 
@@ -53,9 +209,13 @@ def apply_ply(state: GameState, ply: Ply) -> GameState:
     :param state: aktueller Spielzustand, auf den das Ply angewendet werden soll.
     :param ply:   zu simulierendes Ply (typischerweise aus dem Engine-/Frontend-
                   Kontext), das bereits grob legal sein sollte.
+    :param trusted: ``True`` fuer Plys direkt aus :func:`legal_plies`: dann
+                  entfaellt die erneute Zuggenerierung in ``apply_action``
+                  (siehe :func:`core.rules.apply_action_trusted`).
     :return: neuer :class:`GameState` nach Anwendung des Plys.
     """
     player = state.to_move
+    apply_fn = apply_action_trusted if trusted else apply_action
 
     if ply.kind == "fly":
         phase = phase_for(state, player)
@@ -65,7 +225,7 @@ def apply_ply(state: GameState, ply: Ply) -> GameState:
     if state.pending_remove:
         if ply.kind != "remove" or ply.remove is None:
             raise ValueError("State verlangt Remove; ply.kind muss 'remove' sein")
-        return apply_action(state, Action(kind="remove", dst=ply.remove))
+        return apply_fn(state, Action(kind="remove", dst=ply.remove))
 
     if ply.kind == "remove":
         raise ValueError("Remove-Ply ist nur erlaubt, wenn pending_remove True ist")
@@ -73,11 +233,11 @@ def apply_ply(state: GameState, ply: Ply) -> GameState:
     if ply.kind == "place":
         if ply.dst is None:
             raise ValueError("Place-Ply benötigt dst")
-        mid = apply_action(state, Action(kind="place", dst=ply.dst))
+        mid = apply_fn(state, Action(kind="place", dst=ply.dst))
     else:
         if ply.src is None or ply.dst is None:
             raise ValueError("Move/Fly-Ply benötigt src und dst")
-        mid = apply_action(state, Action(kind="move", src=ply.src, dst=ply.dst))
+        mid = apply_fn(state, Action(kind="move", src=ply.src, dst=ply.dst))
 
     if mid.pending_remove:
         if ply.remove is None:
@@ -85,47 +245,10 @@ def apply_ply(state: GameState, ply: Ply) -> GameState:
             if removables:
                 raise ValueError("Ply muss Remove enthalten, da eine Mühle geschlossen wurde")
             return replace(mid, pending_remove=False)
-        nxt = apply_action(mid, Action(kind="remove", dst=ply.remove))
+        nxt = apply_fn(mid, Action(kind="remove", dst=ply.remove))
     else:
         if ply.remove is not None:
             raise ValueError("Remove nur erlaubt, wenn eine Mühle geschlossen wurde")
         nxt = mid
 
     return nxt
-
-
-def _plies_for_placement(state: GameState, player: Stone, dst: int | None) -> List[Ply]:
-    if dst is None:
-        return []
-
-    board = list(state.board)
-    board[dst] = player
-    formed_mill = forms_mill_after_placement(board, player, dst)
-
-    if not formed_mill:
-        return [Ply(kind="place", dst=dst)]
-
-    victim_state = replace(state, board=tuple(board))
-    removables = removable_positions(victim_state, opponent(player))
-    if not removables:
-        return [Ply(kind="place", dst=dst)]
-    return [Ply(kind="place", dst=dst, remove=r) for r in removables]
-
-
-def _plies_for_move(state: GameState, player: Stone, move_kind: MoveKind, src: int | None, dst: int | None) -> List[Ply]:
-    if src is None or dst is None:
-        return []
-
-    board = list(state.board)
-    board[src] = Stone.EMPTY
-    board[dst] = player
-    formed_mill = forms_mill_after_placement(board, player, dst)
-
-    if not formed_mill:
-        return [Ply(kind=move_kind, src=src, dst=dst)]
-
-    victim_state = replace(state, board=tuple(board))
-    removables = removable_positions(victim_state, opponent(player))
-    if not removables:
-        return [Ply(kind=move_kind, src=src, dst=dst)]
-    return [Ply(kind=move_kind, src=src, dst=dst, remove=r) for r in removables]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from array import array
+from typing import List
+
+from .movegen import NO_PLY
+
+__all__ = [
+    "MAX_PLY",
+    "MoveOrdering",
+]
+
+MAX_PLY = 64
+
+# Butterfly-Index: (src+1, dst+1) aus den Bits 2..11 des gepackten Ply-Codes
+_BUTTERFLY_SIZE = 1 << 10
+_HISTORY_LIMIT = 1 << 24
+
+
+def butterfly_index(code: int) -> int:
+    return code >> 2 & 0x3FF
+
+
+class MoveOrdering:
+    """
+    Zugsortierungs-Tabellen fuer ruhige Zuege (ohne Schlagen):
+
+    - Killer: je Suchtiefe (Ply-Abstand zur Root) die zwei letzten Cutoff-Zuege
+    - History: Butterfly-Tabelle je Seite, indiziert ueber (src, dst)
+    - Countermove: je Seite die letzte Cutoff-Antwort auf den Vorgaengerzug
+
+    Lebt in der :class:`~engine.search.EngineSession`; :meth:`new_search`
+    verwirft die Killer und halbiert die History (Alterung).
+    """
+
+    __slots__ = ("killers", "history", "countermoves")
+
+    def __init__(self) -> None:
+        self.killers: List[List[int]] = [[NO_PLY, NO_PLY] for _ in range(MAX_PLY)]
+        self.history = [array("l", [0]) * _BUTTERFLY_SIZE for _ in range(2)]
+        self.countermoves = [array("l", [0]) * _BUTTERFLY_SIZE for _ in range(2)]
+
+    def new_search(self) -> None:
+        for slot in self.killers:
+            slot[0] = slot[1] = NO_PLY
+        for table in self.history:
+            for i, value in enumerate(table):
+                if value:
+                    table[i] = value >> 1
+
+    def clear(self) -> None:
+        for slot in self.killers:
+            slot[0] = slot[1] = NO_PLY
+        for table in (*self.history, *self.countermoves):
+            for i in range(len(table)):
+                table[i] = 0
+
+    def countermove(self, side: int, prev: int) -> int:
+        if prev == NO_PLY:
+            return NO_PLY
+        return self.countermoves[side][butterfly_index(prev)]
+
+    def record_cutoff(self, side: int, ply: int, code: int, prev: int, depth: int) -> None:
+        """Ruhiger Zug `code` hat bei `depth` einen Beta-Cutoff erzeugt."""
+        if ply < MAX_PLY:
+            slot = self.killers[ply]
+            if slot[0] != code:
+                slot[1] = slot[0]
+                slot[0] = code
+        table = self.history[side]
+        idx = butterfly_index(code)
+        value = table[idx] + depth * depth
+        if value >= _HISTORY_LIMIT:
+            for i, v in enumerate(table):
+                table[i] = v >> 1
+            value >>= 1
+        table[idx] = value
+        if prev != NO_PLY:
+            self.countermoves[side][butterfly_index(prev)] = code
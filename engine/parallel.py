@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.state import GameState, Stone
+
+from .board import SearchBoard
+from .movegen import NO_PLY, pack_ply
+from .search import (
+    EngineSession,
+    SharedBounds,
+    _diff_breakdowns,
+    _INF,
+    _negamax_root,
+    _order_codes,
+)
+from .tablebase import Tablebases
+from .types import Limits, ScoredMove
+
+__all__ = ["MAX_SPLIT_DEPTH", "RootSplitPool", "RootSplitResult"]
+
+MAX_SPLIT_DEPTH = 64
+
+# Worker-Zustand (pro Prozess): geteilte k-te Scores je Tiefe + eigene Session (TT, Eval-Cache)
+_WORKER_BOUNDS: SharedBounds | None = None
+_WORKER_SESSION: EngineSession | None = None
+
+
+@dataclass(frozen=True)
+class RootSplitResult:
+    depth: int
+    lines: List[ScoredMove]
+    nodes: int
+    tt_hits: int
+    tt_misses: int
+    beta_cutoffs: int
+    first_move_cutoffs: int
+    tb_probes: int
+    tb_hits: int
+
+
+@dataclass(frozen=True)
+class _WorkerReport:
+    # je abgeschlossener Tiefe: (Score, Root-Code, ScoredMove) der exakt bewerteten Linien
+    lines_by_depth: Dict[int, List[Tuple[float, int, ScoredMove]]]
+    nodes: int
+    tt_hits: int
+    tt_misses: int
+    beta_cutoffs: int
+    first_move_cutoffs: int
+    tb_probes: int
+    tb_hits: int
+
+
+class RootSplitPool:
+    """
+    Root-Split ueber einen Prozess-Pool (die Suche ist GIL-gebunden).
+
+    Die Root-Zuege werden in fester Reihenfolge reihum auf die Worker verteilt;
+    jeder Worker fuehrt Iterative Deepening mit Multi-PV ueber seine Teilmenge.
+    Der k-beste Root-Score je Tiefe liegt in einem geteilten Array, sodass ein
+    Worker Zuege per Null-Window verwerfen kann, die ein anderer Worker bereits
+    aus den Top-k gedraengt hat. Das Zusammenfuehren sortiert nach
+    (Score absteigend, Root-Reihenfolge) und ist damit unabhaengig davon, welcher
+    Worker zuerst fertig wird.
+
+    Der Pool lebt in der :class:`~engine.search.EngineSession` und wird mit
+    :meth:`close` (bzw. ``EngineSession.close``) beendet. Endspiel-Tabellen
+    (`tablebase_paths`) mappt jeder Worker selbst; die Seiten teilen sich die
+    Prozesse ueber den Page-Cache.
+    """
+
+    def __init__(self, workers: int, tablebase_paths: Sequence[Path] = ()) -> None:
+        if workers < 2:
+            raise ValueError("workers must be >= 2")
+        self.workers = workers
+        # spawn statt fork: sicher auch aus Threads (Streamlit) heraus
+        mp_context = multiprocessing.get_context("spawn")
+        self._bounds = mp_context.Array("d", MAX_SPLIT_DEPTH + 1)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self._bounds, list(tablebase_paths)),
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def search(
+        self,
+        state: GameState,
+        limits: Limits,
+        for_player: Stone,
+        multi_pv: int,
+    ) -> Optional[RootSplitResult]:
+        """Verteilte Suche; ``None``, wenn keine Tiefe vollstaendig abgeschlossen wurde."""
+        board = SearchBoard.from_state(state)
+        codes = _order_codes(board, board.legal_codes(), NO_PLY)
+        if not codes:
+            return None
+        rank = {code: i for i, code in enumerate(codes)}
+        chunks = [codes[i :: self.workers] for i in range(self.workers)]
+        chunks = [chunk for chunk in chunks if chunk]
+
+        with self._bounds.get_lock():
+            for i in range(len(self._bounds)):
+                self._bounds[i] = -_INF
+        worker_limits = replace(
+            limits,
+            max_depth=min(limits.max_depth or 1, MAX_SPLIT_DEPTH),
+            max_nodes=None if limits.max_nodes is None else max(1, limits.max_nodes // len(chunks)),
+            workers=None,
+        )
+        futures = [
+            self._executor.submit(_worker_search, state, worker_limits, for_player, chunk, multi_pv)
+            for chunk in chunks
+        ]
+        reports: List[_WorkerReport] = [f.result() for f in futures]
+
+        depth = min((max(r.lines_by_depth, default=0) for r in reports), default=0)
+        if depth == 0:
+            return None
+        merged = [entry for r in reports for entry in r.lines_by_depth[depth]]
+        merged.sort(key=lambda entry: (-entry[0], rank[entry[1]]))
+        top = [entry[2] for entry in merged[:multi_pv]]
+        if top:
+            best = top[0].breakdown
+            top = [replace(m, breakdown_diff=_diff_breakdowns(best, m.breakdown)) for m in top]
+        return RootSplitResult(
+            depth=depth,
+            lines=top,
+            nodes=sum(r.nodes for r in reports),
+            tt_hits=sum(r.tt_hits for r in reports),
+            tt_misses=sum(r.tt_misses for r in reports),
+            beta_cutoffs=sum(r.beta_cutoffs for r in reports),
+            first_move_cutoffs=sum(r.first_move_cutoffs for r in reports),
+            tb_probes=sum(r.tb_probes for r in reports),
+            tb_hits=sum(r.tb_hits for r in reports),
+        )
+
+
+def _init_worker(bounds: SharedBounds, tablebase_paths: List[Path]) -> None:
+    global _WORKER_BOUNDS, _WORKER_SESSION
+    _WORKER_BOUNDS = bounds
+    tablebases = Tablebases.from_paths(tablebase_paths) if tablebase_paths else None
+    _WORKER_SESSION = EngineSession(tablebases=tablebases)
+
+
+def _worker_search(
+    state: GameState,
+    limits: Limits,
+    for_player: Stone,
+    codes: List[int],
+    multi_pv: int,
+) -> _WorkerReport:
+    assert _WORKER_SESSION is not None
+    # Deadline wird im Worker relativ zu dessen Start gesetzt (kein Uhrvergleich ueber Prozesse)
+    ctx = _WORKER_SESSION._context(limits, for_player)
+    board = SearchBoard.from_state(state)
+    lines_by_depth: Dict[int, List[Tuple[float, int, ScoredMove]]] = {}
+    prev_best = None
+    for depth in range(1, (limits.max_depth or 1) + 1):
+        _, pv, scored, stopped = _negamax_root(
+            board, depth, ctx, prev_best, multi_pv, -_INF, _INF, codes, _WORKER_BOUNDS
+        )
+        if stopped:
+            break
+        lines_by_depth[depth] = [(m.score, pack_ply(m.ply), m) for m in scored]
+        prev_best = pv[0] if pv else None
+    return _WorkerReport(
+        lines_by_depth=lines_by_depth,
+        nodes=ctx.nodes,
+        tt_hits=ctx.tt_hits,
+        tt_misses=ctx.tt_misses,
+        beta_cutoffs=ctx.beta_cutoffs,
+        first_move_cutoffs=ctx.first_move_cutoffs,
+        tb_probes=ctx.tb_probes,
+        tb_hits=ctx.tb_hits,
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import TYPE_CHECKING, List
 
 from core.analysis import (
     blocked_stones,
@@ -10,14 +10,17 @@ from core.analysis import (
     evaluate_light as _evaluate_light,
     mobility_profile,
     mobility_score,
-    scored_actions_for_to_move,
     tactic_hints_for_ply as _tactic_hints_for_ply,
 )
 from core.rules import Action
 from core.state import GameState, Stone, opponent
 from .types import Limits, Ply
+from .batch import scored_actions_batch
 from .analysis_helpers import classify_move_loss
 
+if TYPE_CHECKING:
+    from .search import EngineSession
+
 
 @dataclass(frozen=True)
 class PlayerOverlay:
@@ -85,7 +88,7 @@ def build_analysis_overlay(state: GameState, *, max_candidates: int = 5) -> Anal
 
     candidates: List[CandidateMove] = []
     base_eval = base_eval_white if state.to_move == Stone.WHITE else base_eval_black
-    for act, score in scored_actions_for_to_move(state, max_candidates=max_candidates):
+    for act, score in scored_actions_batch(state, max_candidates=max_candidates):
         candidates.append(
             CandidateMove(action=act, score=score, delta=score - base_eval)
         )
@@ -105,10 +108,14 @@ def summarize_last_move(
     *,
     limits: Limits,
     thresholds: dict[str, float],
+    session: "EngineSession | None" = None,
 ) -> LastMoveSummary:
-    from .search import analyze, score_ply
+    from .search import EngineSession
 
-    result = analyze(prev_state, limits=limits, for_player=prev_state.to_move)
+    # eine Session fuer analyze + score_ply: der Nachtest profitiert von der TT
+    if session is None:
+        session = EngineSession()
+    result = session.analyze(prev_state, limits=limits, for_player=prev_state.to_move)
     last_score = None
     last_pv: List[Ply] = []
     in_top_n = False
@@ -120,7 +127,7 @@ def summarize_last_move(
             break
 
     if last_score is None:
-        last_score, last_pv = score_ply(
+        last_score, last_pv = session.score_ply(
             prev_state,
             last_ply,
             limits=limits,
@@ -1,119 +1,468 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+import math
 import time
-from typing import Dict, List, Optional, Tuple, Literal
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple
 
-from core.graph import MILLS
-from core.rules import draw_reason, forms_mill_after_placement, winner
-from core.hash import position_key_from_state, position_key_with_symmetry
+from core.bitboard import FULL_MASK, MILL_MASKS, forms_mill_mask
+from core.graph import SYMMETRY_INVERSE_MAPS, SYMMETRY_MAPS
 from core.analysis import compute_threat_squares
 from core.state import GameState, Stone
 
-from .eval import evaluate
-from .movegen import apply_ply, legal_plies
-from .types import AnalysisResult, Limits, Ply, ScoredMove, EvalBreakdown, EvalWeights, ThreatReport
+from .board import SearchBoard
+from .book import OpeningBook
+from .eval import evaluate, evaluate_board
+from .movegen import NO_PLY, apply_ply, gen_mill_codes, gen_quiet_codes, map_ply_code, pack_ply, unpack_ply
+from .ordering import MAX_PLY, MoveOrdering
+from .tablebase import Tablebases
+from .tt import DEFAULT_TT_MB, TT_EXACT, TT_LOWER, TT_UPPER, TranspositionTable
+from .types import AnalysisResult, Limits, Ply, ScoredMove, EvalBreakdown, EvalWeights, SearchStats, ThreatReport
 
 MATE_SCORE = 1_000_000.0
 DEFAULT_TOP_N_MOVES = 5
 
 
+DEFAULT_EVAL_CACHE_SIZE = 200_000
+
+# Halbe Breite des Aspiration-Windows um den Score der Vor-Iteration
+# (ein halber Stein bei Default-Gewichten); verdoppelt sich bei Fail-Low/-High.
+ASPIRATION_WINDOW = 5.0
+
+_INF = float("inf")
+
+# Ruhesuche: maximale Zusatztiefe und Delta-Margin (in Einheiten der Gewichte
+# material + mills, d.h. ein geschlagener Stein plus Puffer)
+QUIESCENCE_MAX_DEPTH = 6
+QUIESCENCE_DELTA_FACTOR = 2.0
+
+# Null-Move-Pruning (nur Zugphase beider Seiten, nicht bei wenig Mobilitaet)
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_MOBILITY = 4
+
+# Late Move Reductions fuer ruhige Zuege ab dem LMR_MIN_MOVE_INDEX-ten Zug
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVE_INDEX = 3
+
+
+class SharedBounds(Protocol):
+    """``multiprocessing.Array('d')`` je Tiefe (k-bester Root-Score aller Worker)."""
+
+    def __getitem__(self, index: int) -> float: ...
+
+    def __setitem__(self, index: int, value: float) -> None: ...
+
+    def get_lock(self) -> Any: ...
+
+
 @dataclass
 class _SearchContext:
     for_player: Stone
     deadline: float | None
     max_nodes: int | None
-    tt: Dict[int, "_TTEntry"] | None = field(default_factory=dict)
+    tt: TranspositionTable | None = None
     eval_weights: EvalWeights = field(default_factory=EvalWeights)
+    eval_cache: Dict[int, float] | None = None
+    eval_cache_size: int = DEFAULT_EVAL_CACHE_SIZE
+    ordering: MoveOrdering | None = None
+    quiescence: bool = True
+    null_move: bool = True
+    lmr: bool = True
+    tablebases: Tablebases | None = None
     nodes: int = 0
     tt_hits: int = 0
     tt_misses: int = 0
+    beta_cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    tb_probes: int = 0
+    tb_hits: int = 0
     stopped: bool = False
 
 
-@dataclass
-class _TTEntry:
-    depth: int
-    score: float
-    flag: Literal["exact", "lower", "upper"]
-    best_ply: Ply | None
-    score_only: bool = False
-
-
-def analyze(state: GameState, limits: Limits | None = None, for_player: Stone | None = None) -> AnalysisResult:
+class EngineSession:
     """
-    Alpha-Beta + Iterative Deepening. Score ist aus Sicht von for_player.
+    Langlebige Such-Session: haelt TT, Eval-Cache und Zugsortierungs-Tabellen
+    (Killer/History/Countermove) ueber mehrere
+    ``analyze``/``score_ply``/``best_move``-Aufrufe hinweg.
+
+    Gedacht fuer Aufrufer, die aufeinanderfolgende Stellungen analysieren
+    (UI-Review, Selfplay, ``summarize_last_move``). TT-Scores sind aus Sicht
+    der Seite am Zug gespeichert und damit unabhaengig von ``for_player``;
+    bei geaenderten Eval-Gewichten werden TT und Eval-Cache verworfen.
+    Optionale Endspiel-Tabellen (``tablebases``, z. B. aus ``engine.solver``)
+    ersetzen die Suche in Stellungen, deren Material-Signatur vorliegt (an der
+    Root ohne Suche, im Baum als Blatt); ein Eroeffnungsbuch
+    (``book``) beantwortet ``analyze`` bis ``Limits.book_max_ply`` direkt.
     """
-    if not _is_valid_state(state):
+
+    def __init__(
+        self,
+        *,
+        tt_mb: float | None = None,
+        eval_cache_size: int = DEFAULT_EVAL_CACHE_SIZE,
+        tablebases: Tablebases | None = None,
+        book: OpeningBook | None = None,
+    ) -> None:
+        self.tt_mb = tt_mb or DEFAULT_TT_MB
+        self.tablebases = tablebases
+        self.book = book
+        self.eval_cache_size = eval_cache_size
+        self.tt: TranspositionTable | None = None
+        self.eval_cache: Dict[int, float] = {}
+        self.ordering = MoveOrdering()
+        self._eval_weights: EvalWeights | None = None
+        self._split_pool: Any = None  # engine.parallel.RootSplitPool, lazy
+
+    def close(self) -> None:
+        """Beendet einen ggf. gestarteten Prozess-Pool (``Limits.workers``)."""
+        if self._split_pool is not None:
+            self._split_pool.close()
+            self._split_pool = None
+
+    def clear(self) -> None:
+        if self.tt is not None:
+            self.tt.clear()
+        self.eval_cache.clear()
+        self.ordering.clear()
+
+    def analyze(
+        self,
+        state: GameState,
+        limits: Limits | None = None,
+        for_player: Stone | None = None,
+    ) -> AnalysisResult:
+        """
+        Alpha-Beta + Iterative Deepening. Score ist aus Sicht von for_player.
+        """
+        if not _is_valid_state(state):
+            return AnalysisResult(
+                best_move=None,
+                score=0.0,
+                depth=0,
+                nodes=0,
+                tt_hits=0,
+                tt_misses=0,
+                pv=[],
+                top_moves=[],
+                breakdown={},
+                threat_report=ThreatReport(for_player=set(), opponent=set()),
+            )
+
+        if limits is None:
+            limits = Limits()
+
+        max_depth = limits.max_depth or 1
+        for_player = for_player or state.to_move
+        top_n = DEFAULT_TOP_N_MOVES if limits.top_n is None else limits.top_n
+        multi_pv = max(1, top_n if limits.multi_pv is None else limits.multi_pv)
+        if self.book is not None and (limits.book_max_ply is None or state.turn_no <= limits.book_max_ply):
+            booked = self._book_result(state, for_player, top_n, limits.eval_weights or EvalWeights())
+            if booked is not None:
+                return booked
+        if self.tablebases is not None:
+            solved = self._tablebase_result(state, for_player, top_n, limits.eval_weights or EvalWeights())
+            if solved is not None:
+                return solved
+        ctx = self._context(limits, for_player)
+
+        best_move: Optional[Ply] = None
+        best_score = 0.0
+        best_pv: List[Ply] = []
+        reached_depth = 0
+        top_moves: List[ScoredMove] = []
+
+        workers = limits.workers or 1
+        split_failed = False
+        if workers > 1:
+            split = self._root_split(workers).search(state, limits, for_player, multi_pv)
+            if split is not None and split.lines:
+                reached_depth = split.depth
+                top_moves = split.lines[:top_n]
+                best_score = split.lines[0].score
+                best_pv = split.lines[0].pv
+                best_move = split.lines[0].ply
+                ctx.nodes = split.nodes
+                ctx.tt_hits = split.tt_hits
+                ctx.tt_misses = split.tt_misses
+                ctx.beta_cutoffs = split.beta_cutoffs
+                ctx.first_move_cutoffs = split.first_move_cutoffs
+                ctx.tb_probes = split.tb_probes
+                ctx.tb_hits = split.tb_hits
+                max_depth = 0
+            else:
+                # kein Worker hat Tiefe 1 abgeschlossen: Suche im Prozess (gleiche Limits)
+                split_failed = True
+
+        board = SearchBoard.from_state(state)
+        # Scores je Tiefe: das Aspiration-Window orientiert sich an der letzten
+        # Iteration gleicher Paritaet (Muehle-Scores pendeln zwischen geraden/ungeraden Tiefen)
+        scores_by_depth: Dict[int, float] = {}
+        for depth in range(1, max_depth + 1):
+            score, pv, depth_top_moves, stopped = _search_root(
+                board, depth, ctx, best_move, multi_pv, scores_by_depth.get(depth - 2)
+            )
+            if stopped:
+                break
+            scores_by_depth[depth] = score
+            reached_depth = depth
+            best_score = score
+            best_pv = pv
+            top_moves = depth_top_moves[:top_n]
+            best_move = pv[0] if pv else None
+
+        if split_failed and best_move is None:
+            # Auch im Prozess keine Tiefe fertig: erster Zug der Zugsortierung
+            # mit statischer Bewertung, ohne weitere Suche
+            codes = _order_codes(board, board.legal_codes(), NO_PLY)
+            if codes:
+                undo = board.make(codes[0])
+                best_score, child_breakdown = evaluate_board(board, for_player, ctx.eval_weights)
+                board.unmake(undo)
+                best_move = unpack_ply(codes[0])
+                best_pv = [best_move]
+                top_moves = [ScoredMove(ply=best_move, score=best_score, pv=best_pv, breakdown=child_breakdown)]
+
+        breakdown, threat_report = _position_report(state, for_player, ctx.eval_weights)
         return AnalysisResult(
-            best_move=None,
-            score=0.0,
-            depth=0,
+            best_move=best_move,
+            score=best_score,
+            depth=reached_depth,
+            nodes=ctx.nodes,
+            tt_hits=ctx.tt_hits,
+            tt_misses=ctx.tt_misses,
+            pv=best_pv,
+            top_moves=top_moves,
+            breakdown=breakdown,
+            threat_report=threat_report,
+            stats=SearchStats(
+                beta_cutoffs=ctx.beta_cutoffs,
+                first_move_cutoffs=ctx.first_move_cutoffs,
+                tb_probes=ctx.tb_probes,
+                tb_hits=ctx.tb_hits,
+            ),
+        )
+
+    def _book_result(
+        self,
+        state: GameState,
+        for_player: Stone,
+        top_n: int,
+        eval_weights: EvalWeights,
+    ) -> AnalysisResult | None:
+        """Buchantwort ohne Suche; ``None``, wenn die Stellung (mit legalen Zuegen) fehlt."""
+        assert self.book is not None
+        hit = self.book.lookup(state)
+        if hit is None:
+            return None
+        depth, moves = hit
+        legal = set(SearchBoard.from_state(state).legal_codes())
+        moves = [m for m in moves if pack_ply(m.ply) in legal]
+        if not moves:
+            return None
+        sign = 1.0 if state.to_move == for_player else -1.0
+        top_moves: List[ScoredMove] = []
+        for move in moves[:top_n]:
+            _, child_breakdown = evaluate(apply_ply(state, move.ply, trusted=True), for_player, eval_weights)
+            top_moves.append(ScoredMove(ply=move.ply, score=sign * move.score, pv=[move.ply], breakdown=child_breakdown))
+        if top_moves:
+            best = top_moves[0].breakdown
+            top_moves = [
+                ScoredMove(m.ply, m.score, m.pv, m.breakdown, _diff_breakdowns(best, m.breakdown)) for m in top_moves
+            ]
+        breakdown, threat_report = _position_report(state, for_player, eval_weights)
+        return AnalysisResult(
+            best_move=moves[0].ply,
+            score=sign * moves[0].score,
+            depth=depth,
             nodes=0,
             tt_hits=0,
             tt_misses=0,
-            pv=[],
-            top_moves=[],
-            breakdown={},
-            threat_report=ThreatReport(for_player=set(), opponent=set()),
+            pv=[moves[0].ply],
+            top_moves=top_moves,
+            breakdown=breakdown,
+            threat_report=threat_report,
         )
 
-    if limits is None:
-        limits = Limits()
+    def _tablebase_result(
+        self,
+        state: GameState,
+        for_player: Stone,
+        top_n: int,
+        eval_weights: EvalWeights,
+    ) -> AnalysisResult | None:
+        """
+        Exakte Antwort fuer Stellungen in einer geladenen Tabelle: jeder
+        Root-Zug wird per Tabelle (bzw. Partieende) bewertet, ohne Suche.
+        """
+        assert self.tablebases is not None
+        if self.tablebases.probe(state) is None:
+            return None
+        board = SearchBoard.from_state(state)
+        codes = board.legal_codes()
+        if not codes:
+            return None
+        probes = hits = 1
+        lines: List[Tuple[float, int, int]] = []
+        for i, code in enumerate(codes):
+            undo = board.make(code)
+            w = board.winner()
+            if w is not None:
+                score = MATE_SCORE if w == state.to_move else -MATE_SCORE
+            else:
+                probes += 1
+                hit = self.tablebases.probe_masks(board.white, board.black, board.to_move)
+                if hit is None:
+                    board.unmake(undo)
+                    return None
+                hits += 1
+                wdl, dtm = hit
+                score = -wdl * (MATE_SCORE - dtm)
+            board.unmake(undo)
+            lines.append((score, i, code))
+        lines.sort(key=lambda line: (-line[0], line[1]))
 
-    max_depth = limits.max_depth or 1
-    for_player = for_player or state.to_move
-    deadline = (
-        time.perf_counter() + (limits.time_ms / 1000.0)
-        if limits.time_ms
-        else None
-    )
+        sign = 1.0 if state.to_move == for_player else -1.0
+        top_moves: List[ScoredMove] = []
+        for score, _, code in lines[:top_n]:
+            ply = unpack_ply(code)
+            _, child_breakdown = evaluate(apply_ply(state, ply, trusted=True), for_player, eval_weights)
+            top_moves.append(ScoredMove(ply=ply, score=sign * score, pv=[ply], breakdown=child_breakdown))
+        if top_moves:
+            best = top_moves[0].breakdown
+            top_moves = [
+                ScoredMove(m.ply, m.score, m.pv, m.breakdown, _diff_breakdowns(best, m.breakdown)) for m in top_moves
+            ]
+        best_ply = unpack_ply(lines[0][2])
+        breakdown, threat_report = _position_report(state, for_player, eval_weights)
+        return AnalysisResult(
+            best_move=best_ply,
+            score=sign * lines[0][0],
+            depth=1,
+            nodes=len(codes),
+            tt_hits=0,
+            tt_misses=0,
+            pv=[best_ply],
+            top_moves=top_moves,
+            breakdown=breakdown,
+            threat_report=threat_report,
+            stats=SearchStats(tb_probes=probes, tb_hits=hits),
+        )
 
-    use_tt = True if limits.use_tt is None else limits.use_tt
-    top_n = DEFAULT_TOP_N_MOVES if limits.top_n is None else limits.top_n
-    eval_weights = limits.eval_weights or EvalWeights()
-    ctx = _SearchContext(
-        for_player=for_player,
-        deadline=deadline,
-        max_nodes=limits.max_nodes,
-        tt={} if use_tt else None,
-        eval_weights=eval_weights,
-    )
+    def best_move(
+        self,
+        state: GameState,
+        limits: Limits | None = None,
+        for_player: Stone | None = None,
+    ) -> Optional[Ply]:
+        if not _is_valid_state(state):
+            return None
+        return self.analyze(state, limits=limits, for_player=for_player).best_move
 
-    best_move: Optional[Ply] = None
-    best_score = 0.0
-    best_pv: List[Ply] = []
-    reached_depth = 0
-    top_moves: List[ScoredMove] = []
+    def score_ply(
+        self,
+        state: GameState,
+        ply: Ply,
+        limits: Limits | None = None,
+        for_player: Stone | None = None,
+    ) -> Tuple[float, List[Ply]]:
+        """
+        Bewertet einen vorgegebenen Halbzug: Ply anwenden, dann Suche mit depth-1.
+        Score ist aus Sicht von for_player.
+        """
+        if not _is_valid_state(state):
+            return 0.0, []
+
+        if limits is None:
+            limits = Limits()
 
-    for depth in range(1, max_depth + 1):
-        score, pv, depth_top_moves, stopped = _negamax_root(state, depth, ctx, best_move, top_n)
+        max_depth = limits.max_depth or 1
+        depth = max(0, max_depth - 1)
+        for_player = for_player or state.to_move
+        ctx = self._context(limits, for_player)
+
+        nxt = apply_ply(state, ply)
+        color = 1.0 if state.to_move == for_player else -1.0
+        score, child_pv, stopped = _negamax(
+            SearchBoard.from_state(nxt),
+            depth,
+            -_INF,
+            _INF,
+            -color,
+            ctx,
+        )
         if stopped:
-            break
-        reached_depth = depth
-        best_score = score
-        best_pv = pv
-        top_moves = depth_top_moves
-        best_move = pv[0] if pv else None
+            return 0.0, []
+        score = -score
+        return score, [ply] + child_pv
+
+    def _root_split(self, workers: int) -> Any:
+        from .parallel import RootSplitPool
+
+        if self._split_pool is None or self._split_pool.workers != workers:
+            self.close()
+            tb_paths = self.tablebases.paths if self.tablebases is not None else []
+            self._split_pool = RootSplitPool(workers, tb_paths)
+        return self._split_pool
+
+    def _context(self, limits: Limits, for_player: Stone) -> _SearchContext:
+        eval_weights = limits.eval_weights or EvalWeights()
+        if eval_weights != self._eval_weights:
+            self._eval_weights = eval_weights
+            self.clear()
+
+        use_tt = True if limits.use_tt is None else limits.use_tt
+        tt = None
+        if use_tt:
+            tt_mb = limits.tt_mb or self.tt_mb
+            if self.tt is None or self.tt.size_mb != tt_mb:
+                self.tt_mb = tt_mb
+                self.tt = TranspositionTable(tt_mb)
+            tt = self.tt
+            tt.new_search()
+        self.ordering.new_search()
+
+        deadline = (
+            time.perf_counter() + (limits.time_ms / 1000.0)
+            if limits.time_ms
+            else None
+        )
+        return _SearchContext(
+            for_player=for_player,
+            deadline=deadline,
+            max_nodes=limits.max_nodes,
+            tt=tt,
+            eval_weights=eval_weights,
+            eval_cache=self.eval_cache,
+            eval_cache_size=self.eval_cache_size,
+            ordering=self.ordering,
+            quiescence=True if limits.quiescence is None else limits.quiescence,
+            null_move=True if limits.null_move is None else limits.null_move,
+            lmr=True if limits.lmr is None else limits.lmr,
+            tablebases=self.tablebases,
+        )
 
-    _, breakdown = evaluate(state, for_player, ctx.eval_weights)
+
+def _position_report(
+    state: GameState,
+    for_player: Stone,
+    eval_weights: EvalWeights,
+) -> Tuple[EvalBreakdown, ThreatReport]:
+    _, breakdown = evaluate(state, for_player, eval_weights)
     opp = Stone.BLACK if for_player == Stone.WHITE else Stone.WHITE
     threat_report = ThreatReport(
         for_player=compute_threat_squares(state, for_player, use_fallback=False),
         opponent=compute_threat_squares(state, opp, use_fallback=False),
     )
-    return AnalysisResult(
-        best_move=best_move,
-        score=best_score,
-        depth=reached_depth,
-        nodes=ctx.nodes,
-        tt_hits=ctx.tt_hits,
-        tt_misses=ctx.tt_misses,
-        pv=best_pv,
-        top_moves=top_moves,
-        breakdown=breakdown,
-        threat_report=threat_report,
-    )
+    return breakdown, threat_report
+
+
+def analyze(state: GameState, limits: Limits | None = None, for_player: Stone | None = None) -> AnalysisResult:
+    """
+    Alpha-Beta + Iterative Deepening. Score ist aus Sicht von for_player.
+    Einmal-Aufruf mit frischer Session; fuer Folgeanalysen :class:`EngineSession` nutzen.
+    """
+    return EngineSession().analyze(state, limits=limits, for_player=for_player)
 
 
 def best_move(state: GameState, limits: Limits | None = None, for_player: Stone | None = None) -> Optional[Ply]:
@@ -133,102 +482,158 @@ def score_ply(
     Bewertet einen vorgegebenen Halbzug: Ply anwenden, dann Suche mit depth-1.
     Score ist aus Sicht von for_player.
     """
-    if not _is_valid_state(state):
-        return 0.0, []
-
-    if limits is None:
-        limits = Limits()
-
-    max_depth = limits.max_depth or 1
-    depth = max(0, max_depth - 1)
-    for_player = for_player or state.to_move
-    deadline = (
-        time.perf_counter() + (limits.time_ms / 1000.0)
-        if limits.time_ms
-        else None
-    )
-    use_tt = True if limits.use_tt is None else limits.use_tt
-    eval_weights = limits.eval_weights or EvalWeights()
-
-    ctx = _SearchContext(
-        for_player=for_player,
-        deadline=deadline,
-        max_nodes=limits.max_nodes,
-        tt={} if use_tt else None,
-        eval_weights=eval_weights,
-    )
+    return EngineSession().score_ply(state, ply, limits=limits, for_player=for_player)
 
-    nxt = apply_ply(state, ply)
-    color = 1.0 if state.to_move == for_player else -1.0
-    score, child_pv, stopped = _negamax(
-        nxt,
-        depth,
-        float("-inf"),
-        float("inf"),
-        -color,
-        ctx,
-    )
-    if stopped:
-        return 0.0, []
-    score = -score
-    return score, [ply] + child_pv
+
+def _search_root(
+    board: SearchBoard,
+    depth: int,
+    ctx: _SearchContext,
+    prev_best: Ply | None,
+    multi_pv: int,
+    prev_score: float | None,
+) -> Tuple[float, List[Ply], List[ScoredMove], bool]:
+    """
+    Eine Iterative-Deepening-Iteration. Bei einer einzelnen Linie mit
+    Aspiration-Window um den Score der Vor-Iteration; bei Fail-Low/-High wird
+    das Fenster verbreitert und neu gesucht. Multi-PV laeuft mit vollem Fenster.
+    """
+    if multi_pv > 1 or prev_score is None or abs(prev_score) >= MATE_SCORE / 2:
+        return _negamax_root(board, depth, ctx, prev_best, multi_pv, -_INF, _INF)
+    delta = ASPIRATION_WINDOW
+    alpha = prev_score - delta
+    beta = prev_score + delta
+    while True:
+        result = _negamax_root(board, depth, ctx, prev_best, multi_pv, alpha, beta)
+        score, _, _, stopped = result
+        if stopped:
+            return result
+        if score <= alpha:
+            delta *= 2
+            alpha = -_INF if delta > MATE_SCORE else score - delta
+        elif score >= beta:
+            delta *= 2
+            beta = _INF if delta > MATE_SCORE else score + delta
+        else:
+            return result
 
 
 def _negamax_root(
-    state: GameState,
+    board: SearchBoard,
     depth: int,
     ctx: _SearchContext,
     prev_best: Ply | None,
-    top_n: int,
+    multi_pv: int,
+    alpha: float,
+    beta: float,
+    root_codes: List[int] | None = None,
+    shared_bounds: SharedBounds | None = None,
 ) -> Tuple[float, List[Ply], List[ScoredMove], bool]:
-    alpha = float("-inf")
-    beta = float("inf")
-    color = 1.0 if state.to_move == ctx.for_player else -1.0
-    plies = _order_plies(state, legal_plies(state), prev_best)
-    best_score = float("-inf")
-    best_pv: List[Ply] = []
-    scored_raw: List[Tuple[Ply, float, List[Ply], EvalBreakdown]] = []
-    for ply in plies:
-        nxt = apply_ply(state, ply)
-        score, child_pv, stopped = _negamax(nxt, depth - 1, -beta, -alpha, -color, ctx)
+    """
+    Multi-PV-Root: die ersten ``multi_pv`` Zuege werden exakt gesucht, jeder
+    weitere nur per Null-Window gegen den aktuell k-besten Score. Nur wenn er
+    diesen schlaegt, folgt die exakte Nachsuche und er verdraengt Linie k.
+
+    ``root_codes`` beschraenkt die Root auf eine Teilmenge (Root-Split ueber
+    Prozesse); ``shared_bounds[depth]`` ist dann der beste bekannte k-te Score
+    aller Worker. Zuege, die per Null-Window strikt darunter bleiben, koennen
+    nicht in die globalen Top-k und werden verworfen.
+    """
+    color = 1.0 if board.to_move == ctx.for_player else -1.0
+    hint = pack_ply(prev_best) if prev_best is not None else NO_PLY
+    codes = _order_codes(board, board.legal_codes() if root_codes is None else root_codes, hint, ctx.ordering)
+    # (score, Einfuegereihenfolge, ply, pv, breakdown) der aktuell k besten Linien
+    lines: List[Tuple[float, int, Ply, List[Ply], EvalBreakdown]] = []
+    for i, code in enumerate(codes):
+        undo = board.make(code)
+        full = len(lines) < multi_pv
+        bound = alpha if full else max(alpha, lines[-1][0])
+        if shared_bounds is not None:
+            shared = math.nextafter(shared_bounds[depth], -_INF)
+            if shared > bound:
+                score, _, stopped = _negamax(
+                    board, depth - 1, -math.nextafter(shared, _INF), -shared, -color, ctx, 1, code
+                )
+                if not stopped and -score <= shared:
+                    board.unmake(undo)
+                    continue
+        score, child_pv, stopped = _pvs_child(board, depth - 1, bound, beta, -color, ctx, full, 1, code)
         if stopped:
-            return best_score, best_pv, [], True
+            board.unmake(undo)
+            best = lines[0] if lines else None
+            return (best[0], best[3], [], True) if best else (-_INF, [], [], True)
         score = -score
-
-        _, breakdown = evaluate(nxt, ctx.for_player, ctx.eval_weights)
-        scored_raw.append((ply, score, [ply] + child_pv, breakdown))
-
-        if score > best_score:
-            best_score = score
-            best_pv = [ply] + child_pv
-        if score > alpha:
+        if full or score > bound:
+            _, breakdown = evaluate_board(board, ctx.for_player, ctx.eval_weights)
+            ply = unpack_ply(code)
+            lines.append((score, i, ply, [ply] + child_pv, breakdown))
+            lines.sort(key=lambda line: (-line[0], line[1]))
+            del lines[multi_pv:]
+            if shared_bounds is not None and len(lines) == multi_pv:
+                with shared_bounds.get_lock():
+                    if lines[-1][0] > shared_bounds[depth]:
+                        shared_bounds[depth] = lines[-1][0]
+        board.unmake(undo)
+        if multi_pv == 1 and score > alpha:
             alpha = score
-    best_breakdown = _best_breakdown(scored_raw)
-    scored: List[ScoredMove] = []
-    for ply, score, pv, breakdown in scored_raw:
-        scored.append(
-            ScoredMove(
-                ply=ply,
-                score=score,
-                pv=pv,
-                breakdown=breakdown,
-                breakdown_diff=_diff_breakdowns(best_breakdown, breakdown),
-            )
+        if score >= beta:
+            break
+
+    if not lines:
+        return -_INF, [], [], False
+    best_breakdown = lines[0][4]
+    scored = [
+        ScoredMove(
+            ply=ply,
+            score=score,
+            pv=pv,
+            breakdown=breakdown,
+            breakdown_diff=_diff_breakdowns(best_breakdown, breakdown),
         )
-    scored.sort(key=lambda s: s.score, reverse=True)
-    
-    return best_score, best_pv, scored[:top_n], False
+        for score, _, ply, pv, breakdown in lines
+    ]
+    return lines[0][0], lines[0][3], scored, False
+
+
+def _pvs_child(
+    board: SearchBoard,
+    depth: int,
+    alpha: float,
+    beta: float,
+    color: float,
+    ctx: _SearchContext,
+    first: bool,
+    ply: int,
+    prev: int,
+) -> Tuple[float, List[Ply], bool]:
+    """
+    PVS fuer ein Kind (Score aus Sicht des Kindes): der erste Zug bekommt das
+    volle Fenster, alle weiteren ein Null-Window bei alpha und nur bei
+    Fail-High innerhalb (alpha, beta) eine Nachsuche.
+    """
+    if first:
+        return _negamax(board, depth, -beta, -alpha, color, ctx, ply, prev)
+    scout = math.nextafter(alpha, _INF)
+    score, pv, stopped = _negamax(board, depth, -scout, -alpha, color, ctx, ply, prev)
+    if stopped:
+        return score, pv, True
+    if alpha < -score < beta:
+        return _negamax(board, depth, -beta, -alpha, color, ctx, ply, prev)
+    return score, pv, False
 
 
 def _negamax(
-    state: GameState,
+    board: SearchBoard,
     depth: int,
     alpha: float,
     beta: float,
     color: float,
     ctx: _SearchContext,
-    root_hint: Ply | None = None,
+    ply: int = 0,
+    prev: int = NO_PLY,
 ) -> Tuple[float, List[Ply], bool]:
+    if depth <= 0 and ctx.quiescence:
+        return _quiesce(board, alpha, beta, color, ctx, 0)
     if _should_stop(ctx):
         return 0.0, [], True
 
@@ -236,150 +641,391 @@ def _negamax(
     if _should_stop(ctx):
         return 0.0, [], True
 
-    term_score = _terminal_score(state, ctx.for_player)
-    if term_score is not None:
-        return color * term_score, [], False
+    w = board.winner()
+    if w is not None:
+        return color * (MATE_SCORE if w == ctx.for_player else -MATE_SCORE), [], False
+    if ctx.tablebases is not None:
+        tb_score = _probe_tablebase(board, ctx)
+        if tb_score is not None:
+            return tb_score, [], False
 
-    if depth == 0:
-        eval_score, _ = evaluate(state, ctx.for_player, ctx.eval_weights)
-        return color * eval_score, [], False
+    key, sym = board.canonical_key()
 
-    key = position_key_from_state(state)
-    sym_key = position_key_with_symmetry(state)
+    if depth == 0:
+        return color * _evaluate_cached(board, key, ctx), [], False
     tt_entry = None
-    tt_hit_was_symmetric = False
     if ctx.tt is not None:
-        tt_entry = ctx.tt.get(key)
-        if tt_entry is None and sym_key != key:
-            tt_entry = ctx.tt.get(sym_key)
-            if tt_entry is not None:
-                tt_hit_was_symmetric = True
+        tt_entry = ctx.tt.probe(key)
         if tt_entry is None:
             ctx.tt_misses += 1
         else:
             ctx.tt_hits += 1
-    if tt_entry is not None and tt_entry.depth >= depth:
-        pv = []
-        # Suppress best_ply if the hit came from a symmetric key
-        if not tt_entry.score_only and tt_entry.best_ply is not None and not tt_hit_was_symmetric:
-            pv = [tt_entry.best_ply]
-        if tt_entry.flag == "exact":
-            return tt_entry.score, pv, False
-        if tt_entry.flag == "lower" and tt_entry.score >= beta:
-            return tt_entry.score, pv, False
-        if tt_entry.flag == "upper" and tt_entry.score <= alpha:
-            return tt_entry.score, pv, False
-
-    # Suppress best_ply for move ordering if the hit came from a symmetric key
-    tt_best = None
-    if tt_entry and not tt_hit_was_symmetric:
-        tt_best = tt_entry.best_ply
-    plies = _order_plies(state, legal_plies(state), root_hint or tt_best)
-    if not plies:
-        eval_score, _ = evaluate(state, ctx.for_player, ctx.eval_weights)
-        return color * eval_score, [], False
-    best_score = float("-inf")
+    tt_best = NO_PLY
+    if tt_entry is not None:
+        tt_depth, tt_score, tt_flag, tt_move = tt_entry
+        if tt_move != NO_PLY:
+            # Best Move aus dem kanonischen Frame zurueck in diese Stellung abbilden
+            tt_best = map_ply_code(tt_move, SYMMETRY_INVERSE_MAPS[sym])
+        if tt_depth >= depth:
+            pv = [unpack_ply(tt_best)] if tt_best != NO_PLY else []
+            if tt_flag == TT_EXACT:
+                return tt_score, pv, False
+            if tt_flag == TT_LOWER and tt_score >= beta:
+                return tt_score, pv, False
+            if tt_flag == TT_UPPER and tt_score <= alpha:
+                return tt_score, pv, False
+
+    moving = _in_moving_phase(board)
+    # prev == NO_PLY unterhalb der Root: Vorgaenger war selbst ein Null-Move
+    if (
+        ctx.null_move
+        and moving
+        and ply > 0
+        and prev != NO_PLY
+        and depth >= NULL_MOVE_MIN_DEPTH
+        and beta < MATE_SCORE / 2
+        and _null_move_safe(board)
+        and color * _evaluate_cached(board, key, ctx) >= beta
+    ):
+        undo = board.make_null()
+        null_beta = math.nextafter(beta, -_INF)
+        score, _, stopped = _negamax(
+            board, depth - 1 - NULL_MOVE_REDUCTION, -beta, -null_beta, -color, ctx, ply + 1, NO_PLY
+        )
+        board.unmake(undo)
+        if stopped:
+            return 0.0, [], True
+        if -score >= beta:
+            return beta, [], False
+
+    use_lmr = ctx.lmr and moving and depth >= LMR_MIN_DEPTH
+    blocks = 0
+    killers: Tuple[int, ...] | List[int] = ()
+    if use_lmr:
+        blocks = board.threat_mask[1 if board.to_move == Stone.WHITE else 0]
+        killers = ctx.ordering.killers[ply] if ctx.ordering is not None and ply < MAX_PLY else ()
+    best_score = -_INF
     best_pv: List[Ply] = []
+    best_code = NO_PLY
     alpha_orig = alpha
-    for ply in plies:
-        nxt = apply_ply(state, ply)
-        score, child_pv, stopped = _negamax(nxt, depth - 1, -beta, -alpha, -color, ctx)
+    i = -1
+    for i, code in enumerate(_staged_codes(board, tt_best, ctx.ordering, ply, prev)):
+        undo = board.make(code)
+        if (
+            use_lmr
+            and i >= LMR_MIN_MOVE_INDEX
+            and not code >> 12
+            and code != tt_best
+            and code not in killers
+            and not blocks >> ((code >> 7 & 0x1F) - 1) & 1
+        ):
+            # spaeter ruhiger Zug: reduziert per Null-Window, bei Fail-High volle Nachsuche
+            reduction = 1 if i < 2 * LMR_MIN_MOVE_INDEX or depth < 5 else 2
+            scout = math.nextafter(alpha, _INF)
+            score, child_pv, stopped = _negamax(
+                board, depth - 1 - reduction, -scout, -alpha, -color, ctx, ply + 1, code
+            )
+            if not stopped and -score > alpha:
+                score, child_pv, stopped = _pvs_child(board, depth - 1, alpha, beta, -color, ctx, False, ply + 1, code)
+        else:
+            score, child_pv, stopped = _pvs_child(board, depth - 1, alpha, beta, -color, ctx, i == 0, ply + 1, code)
+        board.unmake(undo)
         if stopped:
             return best_score, best_pv, True
         score = -score
         if score > best_score:
             best_score = score
-            best_pv = [ply] + child_pv
+            best_code = code
+            best_pv = [unpack_ply(code)] + child_pv
         if score > alpha:
             alpha = score
         if alpha >= beta:
+            ctx.beta_cutoffs += 1
+            if i == 0:
+                ctx.first_move_cutoffs += 1
+            if ctx.ordering is not None and not code >> 12 and code & 0x3 != 3:
+                side = 0 if board.to_move == Stone.WHITE else 1
+                ctx.ordering.record_cutoff(side, ply, code, prev, depth)
             break
+    if i < 0:
+        return color * _evaluate_cached(board, key, ctx), [], False
 
     if not ctx.stopped and ctx.tt is not None:
-        flag: Literal["exact", "lower", "upper"]
         if best_score <= alpha_orig:
-            flag = "upper"
+            flag = TT_UPPER
         elif best_score >= beta:
-            flag = "lower"
+            flag = TT_LOWER
         else:
-            flag = "exact"
-        entry = _TTEntry(
-            depth=depth,
-            score=best_score,
-            flag=flag,
-            best_ply=best_pv[0] if best_pv else None,
-        )
-        _store_tt_entry(ctx.tt, key, entry)
-        if sym_key != key:
-            _store_tt_entry(
-                ctx.tt,
-                sym_key,
-                _TTEntry(
-                    depth=depth,
-                    score=best_score,
-                    flag=flag,
-                    best_ply=None,
-                    score_only=True,
-                ),
-            )
+            flag = TT_EXACT
+        move_code = NO_PLY
+        if best_code != NO_PLY:
+            move_code = map_ply_code(best_code, SYMMETRY_MAPS[sym])
+        ctx.tt.store(key, depth, best_score, flag, move_code)
 
     return best_score, best_pv, False
 
 
-def _terminal_score(state: GameState, for_player: Stone) -> float | None:
-    if draw_reason(state) is not None:
-        return 0.0
-    w = winner(state)
-    if w is None:
-        return None
-    return MATE_SCORE if w == for_player else -MATE_SCORE
+def _staged_codes(
+    board: SearchBoard,
+    tt_best: int,
+    ordering: MoveOrdering | None,
+    ply: int,
+    prev: int,
+) -> Iterator[int]:
+    """
+    Gestufte Zuggenerierung: TT-Move, Muehlen schliessende Zuege, Blocks
+    gegnerischer Drohfelder, restliche ruhige Zuege (Killer/Countermove/History).
+    Jede Stufe wird erst erzeugt, wenn die vorherige keinen Cutoff gebracht hat.
+    """
+    if board.pending_remove:
+        yield from _order_codes(board, board.legal_codes(), tt_best)
+        return
+    if board.to_move == Stone.WHITE:
+        own, opp, in_hand, side = board.white, board.black, board.in_hand_white, 0
+    else:
+        own, opp, in_hand, side = board.black, board.white, board.in_hand_black, 1
+    gaps = board.threat_mask[side]
+    blocks = board.threat_mask[1 - side]
 
+    if tt_best != NO_PLY and board.is_legal_code(tt_best):
+        yield tt_best
+    else:
+        tt_best = NO_PLY
 
-def _store_tt_entry(tt: Dict[int, "_TTEntry"], key: int, entry: "_TTEntry") -> None:
-    existing = tt.get(key)
-    if existing is None or entry.depth >= existing.depth:
-        tt[key] = entry
+    mills = gen_mill_codes(own, opp, in_hand, gaps)
+    if mills:
+        if blocks:
+            # Muehle, die zugleich eine gegnerische Luecke besetzt, zuerst
+            mills.sort(key=lambda c: blocks >> ((c >> 7 & 0x1F) - 1) & 1, reverse=True)
+        for code in mills:
+            if code != tt_best:
+                yield code
 
+    for targets in (blocks, FULL_MASK & ~blocks) if blocks else (FULL_MASK,):
+        quiet = gen_quiet_codes(own, opp, in_hand, gaps, targets)
+        if ordering is not None and len(quiet) > 1:
+            quiet = _order_quiet(quiet, ordering, side, ply, prev)
+        for code in quiet:
+            if code != tt_best:
+                yield code
 
-def _order_plies(state: GameState, plies: List[Ply], tt_best: Ply | None) -> List[Ply]:
-    # Prefer TT-best, captures, mill-forming moves, then blocks to opponent threats.
-    player = state.to_move
-    opponent = Stone.BLACK if player == Stone.WHITE else Stone.WHITE
-    threats = _open_mill_squares(state.board, opponent)
 
-    def _score(ply: Ply) -> Tuple[int, int, int, int]:
-        tt = 1 if tt_best is not None and ply == tt_best else 0
-        capture = 1 if ply.remove is not None or ply.kind == "remove" else 0
-        formed = 1 if _forms_mill_after_ply(state, ply, player) else 0
-        block = 1 if ply.dst is not None and ply.dst in threats else 0
-        return (tt, capture, formed, block)
+def _order_quiet(codes: List[int], ordering: MoveOrdering, side: int, ply: int, prev: int) -> List[int]:
+    killer = ordering.killers[ply] if ply < MAX_PLY else (NO_PLY, NO_PLY)
+    counter = ordering.countermove(side, prev)
+    history = ordering.history[side]
 
-    return sorted(plies, key=_score, reverse=True)
+    def _score(code: int) -> Tuple[int, int, int]:
+        killer_rank = 2 if code == killer[0] else 1 if code == killer[1] else 0
+        return (killer_rank, 1 if code == counter else 0, history[code >> 2 & 0x3FF])
 
+    return sorted(codes, key=_score, reverse=True)
 
-def _forms_mill_after_ply(state: GameState, ply: Ply, player: Stone) -> bool:
-    if ply.kind not in ("place", "move", "fly"):
-        return False
-    if ply.dst is None:
+
+def _in_moving_phase(board: SearchBoard) -> bool:
+    """Beide Seiten ziehen (keine Handsteine, kein Flug) und kein Schlagen offen."""
+    return (
+        not board.pending_remove
+        and board.in_hand_white == 0
+        and board.in_hand_black == 0
+        and board.white.bit_count() > 3
+        and board.black.bit_count() > 3
+    )
+
+
+def _null_move_safe(board: SearchBoard) -> bool:
+    # Zugzwang-Gefahr: wenig Zuege oder mindestens die Haelfte der Steine blockiert
+    if board.to_move == Stone.WHITE:
+        idx, stones = 0, board.white.bit_count()
+    else:
+        idx, stones = 1, board.black.bit_count()
+    if board.mobility[idx] < NULL_MOVE_MIN_MOBILITY:
         return False
-    board = list(state.board)
-    if ply.kind in ("move", "fly"):
-        if ply.src is None:
-            return False
-        board[ply.src] = Stone.EMPTY
-    board[ply.dst] = player
-    return forms_mill_after_placement(board, player, ply.dst)
-
-
-def _open_mill_squares(board: Tuple[Stone, ...], player: Stone) -> List[int]:
-    squares: set[int] = set()
-    for a, b, c in MILLS:
-        vals = (board[a], board[b], board[c])
-        own = sum(1 for v in vals if v == player)
-        empty = [i for i, v in zip((a, b, c), vals) if v == Stone.EMPTY]
-        if own == 2 and len(empty) == 1:
-            squares.add(empty[0])
-    return list(squares)
+    return 2 * board.blocked[idx] < stones
+
+
+def _probe_tablebase(board: SearchBoard, ctx: _SearchContext) -> float | None:
+    """Tabellen-Score aus Sicht der Seite am Zug (kuerzere Gewinne bevorzugt)."""
+    if board.pending_remove or board.in_hand_white or board.in_hand_black:
+        return None
+    assert ctx.tablebases is not None
+    ctx.tb_probes += 1
+    hit = ctx.tablebases.probe_masks(board.white, board.black, board.to_move)
+    if hit is None:
+        return None
+    ctx.tb_hits += 1
+    wdl, dtm = hit
+    return wdl * (MATE_SCORE - dtm)
+
+
+def _quiesce(
+    board: SearchBoard,
+    alpha: float,
+    beta: float,
+    color: float,
+    ctx: _SearchContext,
+    qdepth: int,
+) -> Tuple[float, List[Ply], bool]:
+    """
+    Ruhesuche an den Blaettern: nur Muehlen schliessende Zuege (inkl. Schlagen)
+    und Blocks gegnerischer Muehle-in-1-Drohungen, mit Stand-Pat und
+    Delta-Pruning. Ein offenes ``pending_remove`` wird immer aufgeloest.
+    """
+    if _should_stop(ctx):
+        return 0.0, [], True
+
+    ctx.nodes += 1
+    if _should_stop(ctx):
+        return 0.0, [], True
+
+    w = board.winner()
+    if w is not None:
+        return color * (MATE_SCORE if w == ctx.for_player else -MATE_SCORE), [], False
+    if ctx.tablebases is not None:
+        tb_score = _probe_tablebase(board, ctx)
+        if tb_score is not None:
+            return tb_score, [], False
+
+    key, _ = board.canonical_key()
+    if board.pending_remove:
+        best_score = -_INF
+        codes = board.legal_codes()
+        if not codes:
+            return color * _evaluate_cached(board, key, ctx), [], False
+        allow_captures = True
+    else:
+        stand_pat = color * _evaluate_cached(board, key, ctx)
+        if stand_pat >= beta or qdepth >= QUIESCENCE_MAX_DEPTH:
+            return stand_pat, [], False
+        best_score = stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+        codes = _noisy_codes(board)
+        if not codes:
+            return stand_pat, [], False
+        weights = ctx.eval_weights
+        delta = QUIESCENCE_DELTA_FACTOR * (abs(weights.material) + abs(weights.mills))
+        # Delta-Pruning: selbst ein geschlagener Stein hebt den Score nicht ueber alpha
+        allow_captures = stand_pat + delta > alpha
+
+    best_pv: List[Ply] = []
+    for code in codes:
+        if code >> 12 and not allow_captures:
+            continue
+        undo = board.make(code)
+        score, child_pv, stopped = _quiesce(board, -beta, -alpha, -color, ctx, qdepth + 1)
+        board.unmake(undo)
+        if stopped:
+            return best_score, best_pv, True
+        score = -score
+        if score > best_score:
+            best_score = score
+            best_pv = [unpack_ply(code)] + child_pv
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
+    return best_score, best_pv, False
+
+
+def _noisy_codes(board: SearchBoard) -> List[int]:
+    """Muehlen schliessende Zuege (mit Schlagen) zuerst, dann Blocks gegnerischer Drohfelder."""
+    if board.to_move == Stone.WHITE:
+        own, opp, in_hand, side = board.white, board.black, board.in_hand_white, 0
+    else:
+        own, opp, in_hand, side = board.black, board.white, board.in_hand_black, 1
+    gaps = board.threat_mask[side]
+    blocks = board.threat_mask[1 - side]
+    codes = [c for c in gen_mill_codes(own, opp, in_hand, gaps) if c >> 12]
+    if blocks:
+        codes.extend(gen_quiet_codes(own, opp, in_hand, gaps, blocks))
+    return codes
+
+
+def _evaluate_cached(board: SearchBoard, key: int, ctx: _SearchContext) -> float:
+    """
+    Eval mit Cache unter dem kanonischen Key. Gespeichert wird der Score aus
+    WHITE-Sicht (die Eval ist symmetrisch und antisymmetrisch in den Spielern).
+    """
+    cache = ctx.eval_cache
+    if cache is None:
+        return evaluate_board(board, ctx.for_player, ctx.eval_weights)[0]
+    score = cache.get(key)
+    if score is None:
+        score, _ = evaluate_board(board, Stone.WHITE, ctx.eval_weights)
+        if len(cache) >= ctx.eval_cache_size:
+            cache.clear()
+        cache[key] = score
+    return score if ctx.for_player == Stone.WHITE else -score
+
+
+def _order_codes(
+    board: SearchBoard,
+    codes: List[int],
+    tt_best: int,
+    ordering: MoveOrdering | None = None,
+    ply: int = 0,
+    prev: int = NO_PLY,
+) -> List[int]:
+    # Prefer TT-best, captures, mill-forming moves, blocks to opponent threats,
+    # then quiet moves by killer, countermove and history.
+    if board.to_move == Stone.WHITE:
+        own, opp, side = board.white, board.black, 0
+    else:
+        own, opp, side = board.black, board.white, 1
+    threats = _open_mill_mask(opp, own)
+    if ordering is not None:
+        killer = ordering.killers[ply] if ply < len(ordering.killers) else (NO_PLY, NO_PLY)
+        counter = ordering.countermove(side, prev)
+        history = ordering.history[side]
+    else:
+        killer = (NO_PLY, NO_PLY)
+        counter = NO_PLY
+        history = None
+
+    def _score(code: int) -> Tuple[int, int, int, int, int, int, int]:
+        tt = 1 if tt_best != NO_PLY and code == tt_best else 0
+        kind = code & 0x3
+        capture = 1 if code >> 12 or kind == 3 else 0
+        dst = (code >> 7 & 0x1F) - 1
+        formed = 0
+        block = 0
+        if dst >= 0:
+            if kind != 3:
+                src = (code >> 2 & 0x1F) - 1
+                after = own & ~(1 << src) if kind != 0 and src >= 0 else own
+                formed = 1 if forms_mill_mask(after | 1 << dst, dst) else 0
+            block = threats >> dst & 1
+        if capture or history is None:
+            return (tt, capture, formed, block, 0, 0, 0)
+        killer_rank = 2 if code == killer[0] else 1 if code == killer[1] else 0
+        return (
+            tt,
+            capture,
+            formed,
+            block,
+            killer_rank,
+            1 if code == counter else 0,
+            history[code >> 2 & 0x3FF],
+        )
+
+    return sorted(codes, key=_score, reverse=True)
+
+
+def _order_plies(state: GameState, plies: List[Ply], tt_best: Ply | None) -> List[Ply]:
+    """Ply-Variante von :func:`_order_codes` (gleiche Kriterien)."""
+    board = SearchBoard.from_state(state)
+    hint = pack_ply(tt_best) if tt_best is not None else NO_PLY
+    return [unpack_ply(c) for c in _order_codes(board, [pack_ply(p) for p in plies], hint)]
+
+
+def _open_mill_mask(player: int, other: int) -> int:
+    """Felder, auf denen `player` (2 Steine + 1 leer) eine Muehle schliessen kann."""
+    squares = 0
+    for m in MILL_MASKS:
+        if (player & m).bit_count() == 2 and not other & m:
+            squares |= m & ~player
+    return squares
 
 
 def _should_stop(ctx: _SearchContext) -> bool:
@@ -398,14 +1044,6 @@ def _is_valid_state(state: object) -> bool:
     return hasattr(state, "to_move") and hasattr(state, "board")
 
 
-def _best_breakdown(scored_raw: List[Tuple[Ply, float, List[Ply], EvalBreakdown]]) -> EvalBreakdown:
-    if not scored_raw:
-        empty: EvalBreakdown = {}
-        return empty
-    best = max(scored_raw, key=lambda item: item[1])
-    return best[3]
-
-
 def _diff_breakdowns(best: EvalBreakdown, other: EvalBreakdown) -> EvalBreakdown:
     keys = set(best) | set(other)
     diff: EvalBreakdown = {}
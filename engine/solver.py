@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+from .tablebase import (
+    MIN_STONES,
+    TABLEBASE_SUFFIX,
+    RetrogradeRun,
+    Signature,
+    Tablebase,
+    TablebaseIndex,
+    Tablebases,
+    _MillGraph,
+    required_signatures,
+    signature_name,
+)
+
+__all__ = [
+    "CHECKPOINT_DIR",
+    "MANIFEST_NAME",
+    "MAX_STONES",
+    "Solver",
+    "material_classes",
+]
+
+MAX_STONES = 9
+MANIFEST_NAME = "manifest.json"
+CHECKPOINT_DIR = "checkpoints"
+
+# Schritte zwischen zwei Pruefungen des Checkpoint-Intervalls
+_STEP_CHUNK = 20_000
+
+
+def material_classes(max_stones: int = MAX_STONES) -> List[Signature]:
+    """Alle Material-Klassen (A, B) mit MIN_STONES <= B <= A <= max_stones, Abhaengigkeiten zuerst."""
+    classes = [
+        (a, b)
+        for a in range(MIN_STONES, max_stones + 1)
+        for b in range(MIN_STONES, a + 1)
+    ]
+    return sorted(classes, key=lambda sig: (sig[0] + sig[1], sig))
+
+
+class Solver:
+    """
+    Offline-Loeser fuer die Zug-/Flugphase: loest Material-Klasse fuer
+    Material-Klasse per retrograder Analyse (Symmetrie-Reduktion ueber
+    ``SYMMETRY_MAPS``, siehe :class:`~engine.tablebase.TablebaseIndex`) und
+    schreibt je Klasse eine Tabelle (``*.mtb``) nach `out_dir`.
+
+    Fertige Klassen stehen im Manifest und werden beim naechsten Lauf
+    uebersprungen; waehrend einer Klasse wird der Analyse-Zustand alle
+    `checkpoint_interval` Sekunden unter ``checkpoints/`` gesichert und nach
+    einem Abbruch dort fortgesetzt. Das Ergebnisverzeichnis ist direkt ueber
+    ``Tablebases.from_dir`` (bzw. ``EngineSession(tablebases=...)``) abfragbar.
+    """
+
+    def __init__(
+        self,
+        out_dir: str | Path,
+        *,
+        checkpoint_interval: float = 300.0,
+        progress: Callable[[str], None] | None = None,
+    ) -> None:
+        self.out_dir = Path(out_dir)
+        self.checkpoint_interval = checkpoint_interval
+        self.progress = progress
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.out_dir / MANIFEST_NAME
+
+    def solved(self) -> Dict[str, dict]:
+        if not self.manifest_path.exists():
+            return {}
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))["classes"]
+
+    def solve(self, signatures: Sequence[Signature], *, max_steps: int | None = None) -> bool:
+        """
+        Loest `signatures` inkl. aller Schlag-Abhaengigkeiten. Mit `max_steps`
+        endet der Lauf nach so vielen Analyse-Schritten mit Checkpoint (False);
+        True, wenn alle Klassen fertig sind.
+        """
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        todo: List[Signature] = []
+        for signature in signatures:
+            for sig in required_signatures(signature):
+                if sig not in todo:
+                    todo.append(sig)
+        todo.sort(key=lambda sig: (sig[0] + sig[1], sig))
+
+        solved = self.solved()
+        tables = Tablebases()
+        try:
+            for sig in todo:
+                name = signature_name(sig)
+                path = self.out_dir / (name + TABLEBASE_SUFFIX)
+                if name in solved and path.exists():
+                    tables.add(Tablebase.load(path))
+                    continue
+                table = self._solve_class(sig, tables, max_steps)
+                if table is None:
+                    return False
+                table.save(path)
+                solved[name] = {"entries": table.index.size, "file": path.name}
+                self._write_manifest(solved)
+                RetrogradeRun.discard(self._checkpoint_dir(sig))
+                tables.add(Tablebase.load(path))
+        finally:
+            tables.close()
+        return True
+
+    def _solve_class(
+        self,
+        sig: Signature,
+        tables: Tablebases,
+        max_steps: int | None,
+    ) -> Tablebase | None:
+        name = signature_name(sig)
+        index = TablebaseIndex(*sig)
+        graph = _MillGraph(index, tables)
+        checkpoint = self._checkpoint_dir(sig)
+        if RetrogradeRun.find(checkpoint) is not None:
+            run = RetrogradeRun.load(checkpoint)
+            self._report(f"{name}: resuming at init={run.next_init}/{run.size} dtm={run.dtm}")
+        else:
+            run = RetrogradeRun(index.size)
+            self._report(f"{name}: {index.size} entries")
+
+        last_save = time.monotonic()
+        budget = max_steps
+        while True:
+            chunk = _STEP_CHUNK if budget is None else min(_STEP_CHUNK, budget)
+            finished = run.run(graph.expand, graph.parents, chunk)
+            if finished:
+                return Tablebase(sig, run.values, index)
+            if budget is not None:
+                budget -= chunk
+                if budget <= 0:
+                    run.save(checkpoint)
+                    self._report(f"{name}: stopped, checkpoint at init={run.next_init}/{run.size} dtm={run.dtm}")
+                    return None
+            if time.monotonic() - last_save >= self.checkpoint_interval:
+                run.save(checkpoint)
+                last_save = time.monotonic()
+                self._report(f"{name}: checkpoint at init={run.next_init}/{run.size} dtm={run.dtm}")
+
+    def _checkpoint_dir(self, sig: Signature) -> Path:
+        return self.out_dir / CHECKPOINT_DIR / signature_name(sig)
+
+    def _write_manifest(self, solved: Dict[str, dict]) -> None:
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"classes": solved}, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.manifest_path)
+
+    def _report(self, message: str) -> None:
+        if self.progress is not None:
+            self.progress(message)
@@ -0,0 +1,530 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.bitboard import FULL_MASK, BitState, NEIGHBOR_MASKS, forms_mill_mask, iter_squares
+from core.ranking import MaterialClass, PositionRanker, canonical_masks
+from core.state import GameState, Stone
+
+from .movegen import gen_ply_codes
+
+__all__ = [
+    "MIN_STONES",
+    "RetrogradeRun",
+    "TABLEBASE_MAGIC",
+    "TABLEBASE_SUFFIX",
+    "Tablebase",
+    "TablebaseIndex",
+    "Tablebases",
+    "build_tablebase",
+    "decode_value",
+    "encode_loss",
+    "encode_win",
+    "required_signatures",
+    "retrograde_solve",
+    "signature_name",
+]
+
+# Unter MIN_STONES Steinen (ohne Handsteine) ist die Partie verloren
+MIN_STONES = 3
+
+# Dateiformat: Header (Magic, Steine Seite A, Steine Seite B, Eintraege),
+# danach je Index ein uint16 (little endian), siehe encode_win/encode_loss
+TABLEBASE_MAGIC = b"MTB1"
+TABLEBASE_SUFFIX = ".mtb"
+_HEADER = struct.Struct("<4sBBxxQ")
+
+Signature = Tuple[int, int]
+
+
+def encode_win(dtm: int) -> int:
+    """Gewinn fuer die Seite am Zug in `dtm` Halbzuegen (ungerade Werte)."""
+    return 1 + 2 * dtm
+
+
+def encode_loss(dtm: int) -> int:
+    """Verlust fuer die Seite am Zug in `dtm` Halbzuegen (gerade Werte > 0)."""
+    return 2 + 2 * dtm
+
+
+def decode_value(value: int) -> Tuple[int, int]:
+    """Tabellenwert -> (wdl, dtm) mit wdl = 1 (Gewinn), 0 (Remis), -1 (Verlust)."""
+    if value == 0:
+        return 0, 0
+    if value & 1:
+        return 1, (value - 1) >> 1
+    return -1, (value - 2) >> 1
+
+
+def signature_name(signature: Signature) -> str:
+    return f"{signature[0]}v{signature[1]}"
+
+
+def _normalize(signature: Signature) -> Signature:
+    a, b = signature
+    return (a, b) if a >= b else (b, a)
+
+
+def required_signatures(signature: Signature) -> List[Signature]:
+    """Alle Signaturen, die fuer `signature` benoetigt werden (Schlag-Ziele), kleinste zuerst."""
+    todo = [_normalize(signature)]
+    seen = set()
+    while todo:
+        a, b = todo.pop()
+        if (a, b) in seen or b < MIN_STONES:
+            continue
+        seen.add((a, b))
+        todo.append(_normalize((a - 1, b)))
+        todo.append(_normalize((a, b - 1)))
+    return sorted(seen, key=lambda sig: (sig[0] + sig[1], sig))
+
+
+class TablebaseIndex:
+    """
+    Index einer Tabelle mit `stones_a` Steinen der Seite A und `stones_b` der
+    Seite B (alle auf dem Brett, kein offenes Schlagen): der kanonische
+    :class:`~core.ranking.PositionRanker` der Klasse, Seite A auf dem
+    WHITE-Platz, beschraenkt auf ``quiet_size``:
+
+        (Klasse(A) * C(24 - a, b) + Rang(B unter den freien Feldern)) * 2 + Seite am Zug
+    """
+
+    __slots__ = ("stones_a", "stones_b", "ranker", "size")
+
+    def __init__(self, stones_a: int, stones_b: int) -> None:
+        self.stones_a = stones_a
+        self.stones_b = stones_b
+        self.ranker = PositionRanker(MaterialClass(stones_a, stones_b), canonical=True)
+        self.size = self.ranker.quiet_size
+
+    def index(self, a: int, b: int, side: int) -> int:
+        return self.ranker.rank(a, b, side)
+
+    def position(self, idx: int) -> Tuple[int, int, int]:
+        """Index -> (Maske A, Maske B, Seite am Zug: 0 = A, 1 = B)."""
+        a, b, side, _ = self.ranker.unrank(idx)
+        return a, b, side
+
+    def is_canonical(self, idx: int) -> bool:
+        return self.ranker.is_canonical(idx)
+
+
+class Tablebase:
+    """
+    Gewinn/Verlust/Remis mit Distanz (Halbzuege bis Partieende) fuer eine
+    Material-Signatur (A, B) mit A >= B. Werte sind aus Sicht der Seite am Zug
+    kodiert (:func:`encode_win`/:func:`encode_loss`, 0 = Remis).
+
+    :meth:`load` bildet die Datei per ``mmap`` ab (nur lesend): die Werte
+    bleiben im Page-Cache des Betriebssystems und werden von allen Prozessen
+    geteilt, die dieselbe Datei oeffnen; es entsteht keine Kopie pro Prozess.
+    """
+
+    __slots__ = ("signature", "index", "values", "path", "_mmap")
+
+    def __init__(
+        self,
+        signature: Signature,
+        values: Sequence[int],
+        index: TablebaseIndex | None = None,
+        path: Path | None = None,
+    ) -> None:
+        self.signature = signature
+        self.index = index or TablebaseIndex(*signature)
+        if len(values) != self.index.size:
+            raise ValueError(f"{signature_name(signature)}: expected {self.index.size} entries, got {len(values)}")
+        self.values = values
+        self.path = path
+        self._mmap: mmap.mmap | None = None
+
+    def value(self, a: int, b: int, side: int) -> int:
+        return self.values[self.index.index(a, b, side)]
+
+    def save(self, path: str | Path) -> None:
+        a, b = self.signature
+        data = array("H", self.values)
+        if sys.byteorder != "little":
+            data.byteswap()
+        with open(path, "wb") as fh:
+            fh.write(_HEADER.pack(TABLEBASE_MAGIC, a, b, len(data)))
+            data.tofile(fh)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Tablebase":
+        path = Path(path)
+        with open(path, "rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, a, b, count = _HEADER.unpack_from(mapped)
+        if magic != TABLEBASE_MAGIC or len(mapped) != _HEADER.size + 2 * count:
+            mapped.close()
+            raise ValueError(f"{path}: not a tablebase file")
+        values: Sequence[int]
+        if sys.byteorder == "little":
+            values = memoryview(mapped)[_HEADER.size :].cast("H")
+        else:
+            values = array("H", mapped[_HEADER.size :])
+            values.byteswap()
+        table = cls((a, b), values, path=path)
+        if isinstance(values, memoryview):
+            table._mmap = mapped
+        else:
+            mapped.close()
+        return table
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            assert isinstance(self.values, memoryview)
+            self.values.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+class Tablebases:
+    """Sammlung geladener Tabellen, abgefragt ueber rohe Masken (Farben beliebig)."""
+
+    def __init__(self, tables: Iterable[Tablebase] = ()) -> None:
+        self._tables: Dict[Signature, Tablebase] = {}
+        for table in tables:
+            self.add(table)
+
+    @classmethod
+    def from_dir(cls, path: str | Path) -> "Tablebases":
+        return cls.from_paths(sorted(Path(path).glob("*" + TABLEBASE_SUFFIX)))
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str | Path]) -> "Tablebases":
+        return cls(Tablebase.load(p) for p in paths)
+
+    def add(self, table: Tablebase) -> None:
+        self._tables[table.signature] = table
+
+    def close(self) -> None:
+        for table in self._tables.values():
+            table.close()
+
+    @property
+    def signatures(self) -> List[Signature]:
+        return sorted(self._tables)
+
+    @property
+    def paths(self) -> List[Path]:
+        """Dateien der gemappten Tabellen (fuer Worker-Prozesse, die sie selbst mappen)."""
+        return [t.path for _, t in sorted(self._tables.items()) if t.path is not None]
+
+    def value(self, own: int, opp: int) -> Optional[int]:
+        """Kodierter Wert aus Sicht von `own` (am Zug); ``None`` ohne passende Tabelle."""
+        n_own = own.bit_count()
+        n_opp = opp.bit_count()
+        if n_own >= n_opp:
+            table = self._tables.get((n_own, n_opp))
+            return None if table is None else table.value(own, opp, 0)
+        table = self._tables.get((n_opp, n_own))
+        return None if table is None else table.value(opp, own, 1)
+
+    def probe_masks(self, white: int, black: int, to_move: Stone) -> Optional[Tuple[int, int]]:
+        """(wdl, dtm) aus Sicht der Seite am Zug (ohne Handsteine, kein offenes Schlagen)."""
+        if to_move == Stone.WHITE:
+            value = self.value(white, black)
+        else:
+            value = self.value(black, white)
+        return None if value is None else decode_value(value)
+
+    def probe(self, state: GameState | BitState) -> Optional[Tuple[int, int]]:
+        """
+        (wdl, dtm) aus Sicht der Seite am Zug oder ``None``, wenn die Stellung
+        nicht in einer geladenen Tabelle liegt (Handsteine, offenes Schlagen,
+        fehlende Signatur).
+        """
+        if state.pending_remove or state.in_hand_white or state.in_hand_black:
+            return None
+        bs = state if isinstance(state, BitState) else BitState.from_state(state)
+        return self.probe_masks(bs.white, bs.black, bs.to_move)
+
+
+# --- Retrograde Analyse ---
+
+Expand = Callable[[int], Optional[Tuple[Sequence[int], Sequence[int]]]]
+Parents = Callable[[int], Iterable[int]]
+
+
+class RetrogradeRun:
+    """
+    Zustand einer unterbrechbaren retrograden Analyse (Bucket-Queue nach Distanz).
+
+    ``expand(i)`` liefert ``None`` fuer ungenutzte Indizes, sonst
+    ``(children, exits)``: Folgestellungen innerhalb der Tabelle und kodierte
+    Werte von Folgestellungen ausserhalb (beides aus Sicht des Gegners, der dort
+    am Zug ist). ``parents(i)`` muss genau die Indizes liefern, unter deren
+    ``children`` ``i`` vorkommt. Stellungen ohne Zuege sind verloren;
+    ungeloeste Stellungen (Zyklen) bleiben Remis.
+
+    :meth:`run` arbeitet in Schritten (ein Index der Initialisierung bzw. ein
+    Bucket-Eintrag); :meth:`save`/:meth:`load` sichern den kompletten Zustand,
+    sodass ein abgebrochener Lauf exakt fortgesetzt werden kann.
+    """
+
+    __slots__ = ("size", "values", "remaining", "floor", "escaped", "won", "next_init", "dtm", "buckets")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.values = array("H", bytes(2 * size))
+        self.remaining = array("H", bytes(2 * size))
+        self.floor = array("H", bytes(2 * size))
+        # Stellung kann nicht mehr verloren sein (Remis-/Gewinn-Ausgang gefunden);
+        # nur fuer das Herunterzaehlen der Verluste
+        self.escaped = bytearray(size)
+        # Gewinn ueber einen verlorenen Nachfolger in der Tabelle bereits eingereiht
+        self.won = bytearray(size)
+        self.next_init = 0
+        self.dtm = 0
+        self.buckets: Dict[int, List[Tuple[int, int]]] = {}
+
+    @property
+    def done(self) -> bool:
+        return self.next_init >= self.size and not self.buckets
+
+    def _push(self, dtm: int, idx: int, value: int) -> None:
+        self.buckets.setdefault(dtm, []).append((idx, value))
+
+    def run(self, expand: Expand, parents: Parents, max_steps: int | None = None) -> bool:
+        """Rechnet bis zum Ende (True) oder bis `max_steps` Schritte verbraucht sind (False)."""
+        values = self.values
+        remaining = self.remaining
+        floor = self.floor
+        escaped = self.escaped
+        won = self.won
+        steps = 0
+        while self.next_init < self.size:
+            if max_steps is not None and steps >= max_steps:
+                return False
+            steps += 1
+            idx = self.next_init
+            self.next_init += 1
+            info = expand(idx)
+            if info is None:
+                continue
+            children, exits = info
+            remaining[idx] = len(set(children))
+            win = -1
+            worst = 0
+            for value in exits:
+                if value == 0:
+                    escaped[idx] = 1
+                elif value & 1:
+                    worst = max(worst, (value - 1) >> 1)
+                else:
+                    dtm = ((value - 2) >> 1) + 1
+                    win = dtm if win < 0 else min(win, dtm)
+            if exits and not escaped[idx] and win < 0:
+                worst += 1
+            floor[idx] = worst
+            if win >= 0:
+                escaped[idx] = 1
+                self._push(win, idx, encode_win(win))
+            elif not remaining[idx] and not escaped[idx]:
+                self._push(worst, idx, encode_loss(worst))
+
+        while self.buckets:
+            bucket = self.buckets.get(self.dtm)
+            if not bucket:
+                self.buckets.pop(self.dtm, None)
+                self.dtm += 1
+                continue
+            if max_steps is not None and steps >= max_steps:
+                return False
+            steps += 1
+            dtm = self.dtm
+            idx, value = bucket.pop()
+            if values[idx]:
+                continue
+            values[idx] = value
+            if value & 1:
+                # Gewinn fuer den Gegner: bei den Vorgaengern ein Ausweg weniger
+                for parent in set(parents(idx)):
+                    if values[parent] or escaped[parent]:
+                        continue
+                    if floor[parent] <= dtm:
+                        floor[parent] = dtm + 1
+                    remaining[parent] -= 1
+                    if not remaining[parent]:
+                        self._push(floor[parent], parent, encode_loss(floor[parent]))
+            else:
+                # Verlust fuer den Gegner: Gewinn fuer alle Vorgaenger, auch wenn sie
+                # schon einen Remis- oder (laengeren) Gewinn-Ausgang haben; der
+                # Bucket mit der kleineren Distanz wird zuerst entnommen
+                for parent in set(parents(idx)):
+                    if not values[parent] and not won[parent]:
+                        won[parent] = 1
+                        escaped[parent] = 1
+                        self._push(dtm + 1, parent, encode_win(dtm + 1))
+        return True
+
+    def save(self, directory: str | Path) -> None:
+        """Schreibt den Zustand atomar nach `directory` (ersetzt einen aelteren Checkpoint)."""
+        directory = Path(directory)
+        tmp = directory.with_name(directory.name + ".tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+        for name in ("values", "remaining", "floor"):
+            with open(tmp / f"{name}.bin", "wb") as fh:
+                getattr(self, name).tofile(fh)
+        (tmp / "escaped.bin").write_bytes(self.escaped)
+        (tmp / "won.bin").write_bytes(self.won)
+        flat = array("q")
+        for dtm, bucket in self.buckets.items():
+            for idx, value in bucket:
+                flat.extend((dtm, idx, value))
+        with open(tmp / "buckets.bin", "wb") as fh:
+            flat.tofile(fh)
+        meta = {"size": self.size, "next_init": self.next_init, "dtm": self.dtm}
+        (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        # alten Checkpoint erst beiseite legen, dann ersetzen: zu jedem Zeitpunkt
+        # existiert ein vollstaendiger Stand (siehe :meth:`find`)
+        old = directory.with_name(directory.name + ".old")
+        if old.exists():
+            shutil.rmtree(old)
+        if directory.exists():
+            os.replace(directory, old)
+        os.replace(tmp, directory)
+        shutil.rmtree(old, ignore_errors=True)
+
+    @staticmethod
+    def find(directory: str | Path) -> Path | None:
+        """
+        Neuester vollstaendiger Checkpoint zu `directory` oder ``None``. Nach einem
+        Abbruch mitten in :meth:`save` liegt er ggf. noch unter ``.tmp``/``.old``;
+        ``meta.json`` wird zuletzt geschrieben und markiert einen fertigen Stand.
+        """
+        directory = Path(directory)
+        for suffix in ("", ".tmp", ".old"):
+            candidate = directory.with_name(directory.name + suffix)
+            if (candidate / "meta.json").exists():
+                return candidate
+        return None
+
+    @staticmethod
+    def discard(directory: str | Path) -> None:
+        """Entfernt den Checkpoint samt liegengebliebener ``.tmp``/``.old``-Reste."""
+        directory = Path(directory)
+        for suffix in ("", ".tmp", ".old"):
+            shutil.rmtree(directory.with_name(directory.name + suffix), ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "RetrogradeRun":
+        directory = cls.find(directory) or Path(directory)
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        run = cls(int(meta["size"]))
+        run.next_init = int(meta["next_init"])
+        run.dtm = int(meta["dtm"])
+        for name in ("values", "remaining", "floor"):
+            data = array("H")
+            with open(directory / f"{name}.bin", "rb") as fh:
+                data.fromfile(fh, run.size)
+            setattr(run, name, data)
+        run.escaped = bytearray((directory / "escaped.bin").read_bytes())
+        if (directory / "won.bin").exists():
+            run.won = bytearray((directory / "won.bin").read_bytes())
+        flat = array("q")
+        flat.frombytes((directory / "buckets.bin").read_bytes())
+        for i in range(0, len(flat), 3):
+            run._push(flat[i], flat[i + 1], flat[i + 2])
+        return run
+
+
+def retrograde_solve(size: int, expand: Expand, parents: Parents) -> array:
+    """Loest einen Spielgraphen in einem Durchlauf (siehe :class:`RetrogradeRun`)."""
+    run = RetrogradeRun(size)
+    run.run(expand, parents)
+    return run.values
+
+
+class _MillGraph:
+    """Zuggraph einer Signatur fuer :func:`retrograde_solve` (Vorwaerts- und Rueckwaertszuege)."""
+
+    __slots__ = ("index", "subtables")
+
+    def __init__(self, index: TablebaseIndex, subtables: Tablebases) -> None:
+        self.index = index
+        self.subtables = subtables
+
+    def expand(self, idx: int) -> Optional[Tuple[List[int], List[int]]]:
+        index = self.index
+        a, b, side = index.position(idx)
+        if canonical_masks(a, b) != (a, b):
+            return None
+        mover, other = (a, b) if side == 0 else (b, a)
+        children: List[int] = []
+        exits: List[int] = []
+        for code in gen_ply_codes(mover, other, 0, False):
+            src = (code >> 2 & 0x1F) - 1
+            dst = (code >> 7 & 0x1F) - 1
+            moved = mover ^ (1 << src | 1 << dst)
+            rem = (code >> 12) - 1
+            if rem < 0:
+                # nach dem Zug ist die andere Seite am Zug
+                if side == 0:
+                    children.append(index.index(moved, other, 1))
+                else:
+                    children.append(index.index(other, moved, 0))
+                continue
+            rest = other & ~(1 << rem)
+            if rest.bit_count() < MIN_STONES:
+                exits.append(encode_loss(0))
+                continue
+            value = self.subtables.value(rest, moved)
+            if value is None:
+                missing = _normalize((rest.bit_count(), moved.bit_count()))
+                raise KeyError(f"missing subtable {signature_name(missing)}")
+            exits.append(value)
+        return children, exits
+
+    def parents(self, idx: int) -> List[int]:
+        index = self.index
+        a, b, side = index.position(idx)
+        # `prev` hat zuletzt gezogen (ohne Muehle, sonst waere geschlagen worden)
+        stay, prev = (a, b) if side == 0 else (b, a)
+        empty = FULL_MASK & ~(a | b)
+        flying = prev.bit_count() <= 3
+        result = []
+        for dst in iter_squares(prev):
+            if forms_mill_mask(prev, dst):
+                continue
+            sources = empty if flying else NEIGHBOR_MASKS[dst] & empty
+            for src in iter_squares(sources):
+                before = prev ^ (1 << src | 1 << dst)
+                if side == 0:
+                    result.append(index.index(stay, before, 1))
+                else:
+                    result.append(index.index(before, stay, 0))
+        return result
+
+
+def build_tablebase(
+    signature: Signature,
+    subtables: Tablebases | None = None,
+    progress: Callable[[str], None] | None = None,
+) -> Tablebase:
+    """
+    Erzeugt die Tabelle fuer `signature` (Zug-/Flugphase, alle Steine gesetzt).
+    Schlagzuege fuehren in kleinere Signaturen; diese muessen in `subtables`
+    vorliegen (siehe :func:`required_signatures`), ausser der Gegner faellt
+    unter :data:`MIN_STONES`.
+    """
+    signature = _normalize(signature)
+    if signature[1] < MIN_STONES:
+        raise ValueError("both sides need at least MIN_STONES stones")
+    index = TablebaseIndex(*signature)
+    graph = _MillGraph(index, subtables or Tablebases())
+    if progress is not None:
+        progress(f"{signature_name(signature)}: {index.size} entries")
+    values = retrograde_solve(index.size, graph.expand, graph.parents)
+    return Tablebase(signature, values, index)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from array import array
+from typing import Optional, Tuple
+
+__all__ = [
+    "DEFAULT_TT_MB",
+    "TT_EXACT",
+    "TT_LOWER",
+    "TT_UPPER",
+    "TranspositionTable",
+]
+
+DEFAULT_TT_MB = 8.0
+
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+_EMPTY_DEPTH = -1
+_AGE_MASK = 0x3F
+# Typcodes der Slot-Arrays: key, score, move (17-Bit-Ply-Code), depth, flag/age
+_KEY_T, _SCORE_T, _MOVE_T, _DEPTH_T, _META_T = "Q", "d", "i", "b", "B"
+# Bytes je Slot (22 bei ueblichen Plattform-Groessen)
+_ENTRY_BYTES = sum(array(t).itemsize for t in (_KEY_T, _SCORE_T, _MOVE_T, _DEPTH_T, _META_T))
+
+TTProbe = Tuple[int, float, int, int]  # (depth, score, flag, move_code)
+
+
+class TranspositionTable:
+    """
+    Feste Groesse, array-basierte Buckets mit je zwei Slots:
+
+    - Slot 0: depth-preferred (ersetzt nur bei >= Tiefe oder veraltetem Alter)
+    - Slot 1: always-replace
+
+    Eintraege: 64-Bit-Key, Tiefe, Score, Flag (exact/lower/upper) und der
+    Best Move als gepackter Ply-Code (siehe ``engine.movegen.pack_ply``).
+    Das Alter wird pro Suche mit :meth:`new_search` weitergezaehlt; Eintraege
+    aelterer Suchen duerfen im Slot 0 unabhaengig von der Tiefe ersetzt werden.
+    """
+
+    __slots__ = ("_mask", "_keys", "_scores", "_moves", "_depths", "_meta", "_age", "size_mb")
+
+    def __init__(self, size_mb: float = DEFAULT_TT_MB) -> None:
+        if size_mb <= 0:
+            raise ValueError("size_mb must be > 0")
+        buckets = max(1, int(size_mb * 1024 * 1024) // (2 * _ENTRY_BYTES))
+        # auf Zweierpotenz abrunden -> Index per Maske
+        buckets = 1 << (buckets.bit_length() - 1)
+        slots = 2 * buckets
+        self.size_mb = size_mb
+        self._mask = buckets - 1
+        self._keys = array(_KEY_T, [0]) * slots
+        self._scores = array(_SCORE_T, [0.0]) * slots
+        self._moves = array(_MOVE_T, [0]) * slots
+        self._depths = array(_DEPTH_T, [_EMPTY_DEPTH]) * slots
+        self._meta = array(_META_T, [0]) * slots  # flag | age << 2
+        self._age = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._keys)
+
+    def __len__(self) -> int:
+        return self.capacity - self._depths.count(_EMPTY_DEPTH)
+
+    def new_search(self) -> None:
+        """Alter weiterzaehlen (zu Beginn jeder Suche)."""
+        self._age = (self._age + 1) & _AGE_MASK
+
+    def clear(self) -> None:
+        slots = self.capacity
+        self._moves = array(_MOVE_T, [0]) * slots
+        self._depths = array(_DEPTH_T, [_EMPTY_DEPTH]) * slots
+        self._age = 0
+
+    def probe(self, key: int) -> Optional[TTProbe]:
+        i = (key & self._mask) << 1
+        keys = self._keys
+        depths = self._depths
+        if keys[i] == key and depths[i] != _EMPTY_DEPTH:
+            return depths[i], self._scores[i], self._meta[i] & 0x3, self._moves[i]
+        i += 1
+        if keys[i] == key and depths[i] != _EMPTY_DEPTH:
+            return depths[i], self._scores[i], self._meta[i] & 0x3, self._moves[i]
+        return None
+
+    def store(self, key: int, depth: int, score: float, flag: int, move_code: int) -> None:
+        i0 = (key & self._mask) << 1
+        i1 = i0 + 1
+        depths = self._depths
+        keys = self._keys
+        d0 = depths[i0]
+
+        if d0 == _EMPTY_DEPTH or keys[i0] == key:
+            if d0 == _EMPTY_DEPTH or depth >= d0 or self._is_stale(i0):
+                if move_code == 0 and d0 != _EMPTY_DEPTH:
+                    move_code = self._moves[i0]
+                self._write(i0, key, depth, score, flag, move_code)
+                return
+            self._write(i1, key, depth, score, flag, move_code)
+            return
+
+        if depth >= d0 or self._is_stale(i0):
+            # bisheriger Slot-0-Eintrag wandert in den always-replace-Slot
+            self._copy(i0, i1)
+            self._write(i0, key, depth, score, flag, move_code)
+            return
+
+        if move_code == 0 and keys[i1] == key and depths[i1] != _EMPTY_DEPTH:
+            move_code = self._moves[i1]
+        self._write(i1, key, depth, score, flag, move_code)
+
+    def _is_stale(self, i: int) -> bool:
+        return (self._meta[i] >> 2) != self._age
+
+    def _write(self, i: int, key: int, depth: int, score: float, flag: int, move_code: int) -> None:
+        self._keys[i] = key
+        self._depths[i] = min(depth, 127)
+        self._scores[i] = score
+        self._moves[i] = move_code
+        self._meta[i] = flag | self._age << 2
+
+    def _copy(self, src: int, dst: int) -> None:
+        self._keys[dst] = self._keys[src]
+        self._depths[dst] = self._depths[src]
+        self._scores[dst] = self._scores[src]
+        self._moves[dst] = self._moves[src]
+        self._meta[dst] = self._meta[src]
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import json
+import math
+import multiprocessing
+from collections import Counter
+from dataclasses import asdict, fields, replace
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from core.rules import draw_reason, is_terminal, winner
+from core.state import GameState, Stone
+
+from .batch import FEATURE_NAMES, feature_matrix, stack_states
+from .movegen import apply_ply
+from .search import EngineSession
+from .types import EvalWeights, Limits
+
+__all__ = [
+    "ALL_PHASES",
+    "LABEL_MODES",
+    "PHASES",
+    "TexelFit",
+    "label_position",
+    "label_rows",
+    "load_weights",
+    "phase_features",
+    "save_weights",
+    "split_by_phase",
+    "state_from_row",
+    "texel_loss",
+    "weights_from_dict",
+    "weights_to_dict",
+    "win_probability",
+]
+
+# Zeilen von data/tuning_positions.jsonl werden je "phase_to_move" gefittet
+PHASES: Tuple[str, ...] = ("placing", "moving", "flying")
+# Globale Gewichte ueber alle Phasen
+ALL_PHASES = "all"
+
+# "outcome": Ergebnis einer Selfplay-Fortsetzung, "search": Score einer tiefen Suche
+LABEL_MODES: Tuple[str, ...] = ("outcome", "search")
+
+WEIGHTS_VERSION = 1
+
+
+# --- Gewichte als JSON ---
+
+def weights_to_dict(weights: EvalWeights) -> Dict[str, float]:
+    return {name: float(value) for name, value in asdict(weights).items()}
+
+
+def weights_from_dict(raw: Mapping[str, object]) -> EvalWeights:
+    """EvalWeights aus einem Dict; fehlende Felder behalten ihren Default, unbekannte werden ignoriert."""
+    known = {f.name for f in fields(EvalWeights)}
+    return EvalWeights(**{k: float(v) for k, v in raw.items() if k in known})  # type: ignore[arg-type]
+
+
+def save_weights(path: str | Path, phases: Mapping[str, EvalWeights], **meta: object) -> None:
+    """Schreibt ``{"version", "phases": {phase: weights}, ...meta}`` atomar nach `path`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload: Dict[str, object] = {"version": WEIGHTS_VERSION, **meta}
+    payload["phases"] = {phase: weights_to_dict(w) for phase, w in phases.items()}
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_weights(path: str | Path, phase: str = ALL_PHASES) -> EvalWeights:
+    """
+    Gewichte fuer ``Limits(eval_weights=...)`` aus einer Datei von
+    :func:`save_weights` (Phase `phase`, sonst ``"all"``) oder einem flachen
+    Dict mit EvalWeights-Feldern.
+    """
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    phases = raw.get("phases")
+    if phases is None:
+        return weights_from_dict(raw)
+    if phase in phases:
+        return weights_from_dict(phases[phase])
+    if ALL_PHASES in phases:
+        return weights_from_dict(phases[ALL_PHASES])
+    raise KeyError(f"no weights for phase {phase!r} in {path}")
+
+
+# --- Labels ---
+
+def state_from_row(row: Mapping[str, object]) -> GameState:
+    """GameState aus einer Zeile von ``scripts/gen_positions.py``."""
+    return GameState(
+        board=tuple(Stone(int(v)) for v in row["board"]),  # type: ignore[union-attr]
+        to_move=Stone(int(row["to_move"])),  # type: ignore[arg-type]
+        in_hand_white=int(row["in_hand_white"]),  # type: ignore[arg-type]
+        in_hand_black=int(row["in_hand_black"]),  # type: ignore[arg-type]
+        pending_remove=bool(row.get("pending_remove", False)),
+        turn_no=int(row.get("turn_no", 1)),  # type: ignore[arg-type]
+    )
+
+
+def _playout_result(
+    session: EngineSession,
+    state: GameState,
+    limits: Limits,
+    max_plies: int,
+) -> float:
+    """Selfplay ab `state`: 1.0 / 0.5 / 0.0 aus Sicht der Seite am Zug in `state`."""
+    player = state.to_move
+    seen: Counter = Counter()
+    for _ in range(max_plies):
+        w = winner(state)
+        if w is not None:
+            return 1.0 if w == player else 0.0
+        if draw_reason(state) is not None or is_terminal(state):
+            return 0.5
+        seen[(state.board, state.to_move, state.in_hand_white, state.in_hand_black, state.pending_remove)] += 1
+        if max(seen.values()) >= 3:
+            return 0.5
+        ply = session.analyze(state, limits=limits, for_player=state.to_move).best_move
+        if ply is None:
+            return 0.5
+        state = apply_ply(state, ply, trusted=True)
+    return 0.5
+
+
+def label_position(
+    session: EngineSession,
+    state: GameState,
+    *,
+    mode: str = "outcome",
+    depth: int = 4,
+    max_plies: int = 200,
+) -> float:
+    """
+    Label aus Sicht der Seite am Zug: bei ``"outcome"`` Ergebnis (1/0.5/0) einer
+    Selfplay-Fortsetzung mit Suchtiefe `depth`, bei ``"search"`` der Score
+    einer Suche der Tiefe `depth`.
+    """
+    limits = Limits(max_depth=depth, top_n=1)
+    if mode == "search":
+        return session.analyze(state, limits=limits, for_player=state.to_move).score
+    if mode == "outcome":
+        return _playout_result(session, state, limits, max_plies)
+    raise ValueError(f"unknown label mode {mode!r}, expected one of {LABEL_MODES}")
+
+
+# --- Texel-Fit ---
+
+def phase_features(states: Sequence[GameState]) -> np.ndarray:
+    """Feature-Matrix (Spalten :data:`~engine.batch.FEATURE_NAMES`) aus Sicht der Seite am Zug."""
+    boards, hand_w, hand_b = stack_states(states)
+    players = np.array([int(s.to_move) for s in states], dtype=np.int64)
+    return feature_matrix(boards, players, hand_w, hand_b)
+
+
+def win_probability(scores: np.ndarray, k: float) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-k * np.clip(scores, -1e6, 1e6)))
+
+
+def texel_loss(features: np.ndarray, targets: np.ndarray, vector: np.ndarray, k: float) -> float:
+    """Mittlerer quadratischer Fehler zwischen ``sigmoid(k * features @ vector)`` und `targets`."""
+    if features.shape[0] == 0:
+        return 0.0
+    diff = win_probability(features @ vector, k) - targets
+    return float(np.mean(diff * diff))
+
+
+def _as_vector(weights: EvalWeights) -> np.ndarray:
+    return np.array([getattr(weights, name) for name in FEATURE_NAMES], dtype=np.float64)
+
+
+class TexelFit:
+    """
+    Texel-Tuning der direkten Eval-Gewichte (:data:`~engine.batch.FEATURE_NAMES`)
+    fuer eine Phase. Die Eval ist linear in den Gewichten, daher ist jede
+    Iteration nur ``features @ vector`` auf der einmal berechneten
+    Feature-Matrix (Adam auf dem mittleren quadratischen Fehler).
+
+    Der Zustand (Gewichte, Adam-Momente, Iteration) ist per
+    :meth:`to_dict`/:meth:`from_dict` checkpointbar. Initiative-Gewichte
+    bleiben 0 (sie wuerden die Einzelterme ueberdecken).
+    """
+
+    def __init__(self, start: EvalWeights | None = None, *, k: float = 0.1, learning_rate: float = 0.05) -> None:
+        start = start or EvalWeights()
+        self.base = replace(start, initiative_strategic=0.0, initiative_tactical=0.0)
+        self.k = k
+        self.learning_rate = learning_rate
+        self.vector = _as_vector(self.base)
+        self.m = np.zeros_like(self.vector)
+        self.v = np.zeros_like(self.vector)
+        self.iteration = 0
+        self.loss: float | None = None
+
+    @property
+    def weights(self) -> EvalWeights:
+        return replace(self.base, **{name: float(x) for name, x in zip(FEATURE_NAMES, self.vector)})
+
+    def fit_scale(self, features: np.ndarray, targets: np.ndarray, lo: float = 1e-4, hi: float = 10.0) -> float:
+        """Skalierung `k` fuer die Startgewichte per Goldener-Schnitt-Suche (log-Skala)."""
+        a, b = math.log(lo), math.log(hi)
+        ratio = (math.sqrt(5.0) - 1.0) / 2.0
+
+        def loss(log_k: float) -> float:
+            return texel_loss(features, targets, self.vector, math.exp(log_k))
+
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        fc, fd = loss(c), loss(d)
+        for _ in range(60):
+            if fc <= fd:
+                b, d, fd = d, c, fc
+                c = b - ratio * (b - a)
+                fc = loss(c)
+            else:
+                a, c, fc = c, d, fd
+                d = a + ratio * (b - a)
+                fd = loss(d)
+        self.k = math.exp((a + b) / 2.0)
+        return self.k
+
+    def step(self, features: np.ndarray, targets: np.ndarray, iterations: int = 1) -> float:
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        n = max(features.shape[0], 1)
+        for _ in range(iterations):
+            p = win_probability(features @ self.vector, self.k)
+            # d/dw mean((p - t)^2) = 2/n * F^T ((p - t) * p * (1 - p) * k)
+            grad = features.T @ ((p - targets) * p * (1.0 - p)) * (2.0 * self.k / n)
+            self.iteration += 1
+            self.m = beta1 * self.m + (1.0 - beta1) * grad
+            self.v = beta2 * self.v + (1.0 - beta2) * grad * grad
+            m_hat = self.m / (1.0 - beta1 ** self.iteration)
+            v_hat = self.v / (1.0 - beta2 ** self.iteration)
+            self.vector = self.vector - self.learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+        self.loss = texel_loss(features, targets, self.vector, self.k)
+        return self.loss
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "weights": weights_to_dict(self.weights),
+            "k": self.k,
+            "learning_rate": self.learning_rate,
+            "m": self.m.tolist(),
+            "v": self.v.tolist(),
+            "iteration": self.iteration,
+            "loss": self.loss,
+        }
+
+    @staticmethod
+    def from_dict(raw: Mapping[str, object]) -> "TexelFit":
+        fit = TexelFit(
+            weights_from_dict(raw["weights"]),  # type: ignore[arg-type]
+            k=float(raw["k"]),  # type: ignore[arg-type]
+            learning_rate=float(raw["learning_rate"]),  # type: ignore[arg-type]
+        )
+        fit.m = np.array(raw["m"], dtype=np.float64)
+        fit.v = np.array(raw["v"], dtype=np.float64)
+        fit.iteration = int(raw["iteration"])  # type: ignore[arg-type]
+        loss = raw.get("loss")
+        fit.loss = None if loss is None else float(loss)  # type: ignore[arg-type]
+        return fit
+
+
+def split_by_phase(rows: Sequence[Mapping[str, object]]) -> Dict[str, List[int]]:
+    """Zeilenindizes je Phase (``phase_to_move``) plus ``"all"``."""
+    groups: Dict[str, List[int]] = {ALL_PHASES: list(range(len(rows)))}
+    for i, row in enumerate(rows):
+        phase = str(row.get("phase_to_move", ""))
+        if phase in PHASES:
+            groups.setdefault(phase, []).append(i)
+    return groups
+
+
+# --- Labeln im Prozess-Pool ---
+
+_WORKER_SESSION: EngineSession | None = None
+
+
+def _init_label_worker() -> None:
+    global _WORKER_SESSION
+    _WORKER_SESSION = EngineSession()
+
+
+def _label_job(job: Tuple[int, Mapping[str, object], str, int, int]) -> Tuple[int, float]:
+    index, row, mode, depth, max_plies = job
+    session = _WORKER_SESSION or EngineSession()
+    return index, label_position(session, state_from_row(row), mode=mode, depth=depth, max_plies=max_plies)
+
+
+def label_rows(
+    rows: Sequence[Mapping[str, object]],
+    *,
+    mode: str = "outcome",
+    depth: int = 4,
+    max_plies: int = 200,
+    workers: int = 1,
+) -> Iterator[Tuple[int, float]]:
+    """
+    Labelt `rows` (mit `workers` > 1 in einem Prozess-Pool, je Worker eine
+    EngineSession) und liefert ``(Zeilenindex, Label)`` in Fertigstellungs-
+    reihenfolge, damit Aufrufer jedes Label sofort sichern koennen.
+    """
+    jobs = [(i, row, mode, depth, max_plies) for i, row in enumerate(rows)]
+    if workers <= 1:
+        _init_label_worker()
+        for job in jobs:
+            yield _label_job(job)
+        return
+    with multiprocessing.Pool(processes=workers, initializer=_init_label_worker) as pool:
+        yield from pool.imap_unordered(_label_job, jobs)
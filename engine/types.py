@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal, Optional, TypedDict, List
 
 MoveKind = Literal["place", "move", "fly", "remove"]
@@ -17,7 +17,14 @@ class Limits:
     max_depth: Optional[int] = None
     max_nodes: Optional[int] = None
     use_tt: Optional[bool] = None
+    tt_mb: Optional[float] = None  # Speicherbudget der TT in MB
     top_n: Optional[int] = None
+    multi_pv: Optional[int] = None  # Anzahl exakt gesuchter Root-Linien (Default: top_n)
+    quiescence: Optional[bool] = None  # Ruhesuche ueber Muehlen/Blocks an den Blaettern (Default: an)
+    null_move: Optional[bool] = None  # Null-Move-Pruning in der Zugphase (Default: an)
+    lmr: Optional[bool] = None  # Late Move Reductions fuer spaete ruhige Zuege (Default: an)
+    workers: Optional[int] = None  # >1: Root-Split ueber so viele Prozesse (siehe engine.parallel)
+    book_max_ply: Optional[int] = None  # Buchzuege der Session bis turn_no <= book_max_ply (Default: ganzes Buch, 0 = aus)
     eval_weights: Optional["EvalWeights"] = None
 
 class EvalBreakdown(TypedDict, total=False):
@@ -38,6 +45,21 @@ class ThreatReport:
     for_player: set[int]
     opponent: set[int]
 
+@dataclass(frozen=True)
+class SearchStats:
+    """Instrumentierung der Zugsortierung (Beta-Cutoffs im Baum) und der Endspiel-Tabellen."""
+    beta_cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    tb_probes: int = 0
+    tb_hits: int = 0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Anteil der Cutoffs, die schon beim ersten Zug fallen (1.0 = perfekte Sortierung)."""
+        if self.beta_cutoffs == 0:
+            return 0.0
+        return self.first_move_cutoffs / self.beta_cutoffs
+
 @dataclass(frozen=True)
 class AnalysisResult:
     best_move: Optional[Ply]
@@ -50,6 +72,7 @@ class AnalysisResult:
     top_moves: List["ScoredMove"]
     breakdown: EvalBreakdown
     threat_report: ThreatReport
+    stats: SearchStats = field(default_factory=SearchStats)
 
 
 @dataclass(frozen=True)
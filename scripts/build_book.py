@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Build an opening book from deep offline searches.
+
+Starting at the initial position, every book position is searched to --depth
+and its top moves are stored; the best --branch moves are expanded until
+turn --max-ply. Symmetric positions share one entry.
+
+Usage:
+  python scripts/build_book.py --max-ply 6 --depth 6 --branch 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.hash import position_key_with_symmetry
+from core.rules import is_terminal
+from core.state import GameState
+from engine.book import OpeningBook
+from engine.movegen import apply_ply
+from engine.search import EngineSession
+from engine.types import Limits
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-ply", type=int, default=6, help="expand positions up to this turn_no")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--time-ms", type=int, default=None)
+    parser.add_argument("--branch", type=int, default=3, help="book moves expanded per position")
+    parser.add_argument("--top-n", type=int, default=5, help="moves stored per position")
+    parser.add_argument("--output", type=str, default="data/opening_book.jsonl")
+    parser.add_argument("--append", action="store_true", help="extend an existing book")
+    args = parser.parse_args()
+
+    out_path = Path(args.output)
+    book = OpeningBook.load(out_path) if args.append and out_path.exists() else OpeningBook()
+    limits = Limits(max_depth=args.depth, time_ms=args.time_ms, top_n=args.top_n)
+    session = EngineSession()
+
+    queue: Deque[GameState] = deque([GameState.initial()])
+    expanded = set()
+    searched = 0
+    start = time.perf_counter()
+    while queue:
+        state = queue.popleft()
+        if is_terminal(state):
+            continue
+        seen_key = (position_key_with_symmetry(state), state.in_hand_white, state.in_hand_black)
+        if seen_key in expanded:
+            continue
+        expanded.add(seen_key)
+        hit = book.lookup(state)
+        if hit is not None and hit[0] >= args.depth:
+            moves = [m.ply for m in hit[1]]
+        else:
+            result = session.analyze(state, limits=limits, for_player=state.to_move)
+            if not result.top_moves:
+                continue
+            book.add(state, [(m.ply, m.score) for m in result.top_moves], result.depth)
+            moves = [m.ply for m in result.top_moves]
+            searched += 1
+            if searched % 25 == 0:
+                print(f"{searched} positions searched, {len(book)} entries, {time.perf_counter() - start:.1f}s")
+        if state.turn_no >= args.max_ply:
+            continue
+        for ply in moves[: args.branch]:
+            queue.append(apply_ply(state, ply, trusted=True))
+
+    book.save(out_path)
+    print(f"Saved {len(book)} entries to {out_path} ({searched} searched)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
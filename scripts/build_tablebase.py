@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Build endgame tablebases (win/loss/draw with distance) by retrograde analysis.
+
+Missing smaller signatures needed for captures are built first; existing
+files in the output directory are reused.
+
+Usage:
+  python scripts/build_tablebase.py --signature 3v3 --signature 4v3 --out tablebases
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from engine.tablebase import (
+    MIN_STONES,
+    TABLEBASE_SUFFIX,
+    Tablebase,
+    Tablebases,
+    build_tablebase,
+    decode_value,
+    required_signatures,
+    signature_name,
+)
+
+
+def _parse_signature(raw: str) -> Tuple[int, int]:
+    try:
+        a, b = (int(part) for part in raw.lower().split("v"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"signature must look like 4v3, got {raw!r}")
+    if min(a, b) < MIN_STONES or max(a, b) > 9:
+        raise argparse.ArgumentTypeError(f"stones per side must be in {MIN_STONES}..9")
+    return (a, b) if a >= b else (b, a)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signature", type=_parse_signature, action="append", required=True)
+    parser.add_argument("--out", type=str, default="tablebases")
+    parser.add_argument("--force", action="store_true", help="rebuild existing files")
+    args = parser.parse_args()
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    todo: List[Tuple[int, int]] = []
+    for signature in args.signature:
+        for sig in required_signatures(signature):
+            if sig not in todo:
+                todo.append(sig)
+    todo.sort(key=lambda sig: (sig[0] + sig[1], sig))
+
+    tables = Tablebases()
+    for sig in todo:
+        path = out_dir / (signature_name(sig) + TABLEBASE_SUFFIX)
+        if path.exists() and not (args.force and sig in args.signature):
+            tables.add(Tablebase.load(path))
+            print(f"Loaded {path}")
+            continue
+        start = time.perf_counter()
+        table = build_tablebase(sig, tables, progress=print)
+        table.save(path)
+        tables.add(table)
+        counts = {1: 0, 0: 0, -1: 0}
+        longest = 0
+        for value in table.values:
+            wdl, dtm = decode_value(value)
+            counts[wdl] += 1
+            longest = max(longest, dtm)
+        print(
+            f"Saved {path} in {time.perf_counter() - start:.1f}s "
+            f"(win={counts[1]} loss={counts[-1]} draw/unused={counts[0]} max_dtm={longest})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -20,7 +20,8 @@ sys.path.insert(0, str(ROOT))
 from core.hash import position_key_with_symmetry
 from core.rules import draw_reason, is_terminal, winner
 from core.state import GameState, Stone
-from engine.search import analyze
+from engine.book import OpeningBook
+from engine.search import EngineSession
 from engine.movegen import apply_ply, legal_plies
 from engine.types import Limits
 
@@ -87,7 +88,7 @@ def _record_sample(state: GameState, reason: List[str], game_id: int, ply_index:
 def _find_pending_state(state: GameState) -> tuple[GameState | None, dict | None]:
     for ply in legal_plies(state):
         try:
-            nxt = apply_ply(state, ply)
+            nxt = apply_ply(state, ply, trusted=True)
         except ValueError:
             continue
         if nxt.pending_remove:
@@ -115,6 +116,8 @@ def main() -> int:
     parser.add_argument("--phase-targets", type=str, default="")
     parser.add_argument("--append", action="store_true")
     parser.add_argument("--pending-only", action="store_true")
+    parser.add_argument("--book", type=str, default="", help="opening book (scripts/build_book.py)")
+    parser.add_argument("--book-max-ply", type=int, default=None)
     args = parser.parse_args()
 
     if args.target <= 0:
@@ -147,7 +150,8 @@ def main() -> int:
         phase_targets = _default_phase_targets(target_total)
 
     use_tt = not args.no_tt
-    limits = Limits(max_depth=args.depth, top_n=args.top_n, use_tt=use_tt)
+    limits = Limits(max_depth=args.depth, top_n=args.top_n, use_tt=use_tt, book_max_ply=args.book_max_ply)
+    session = EngineSession(book=OpeningBook.load(args.book) if args.book else None)
 
     for game_id in range(args.games):
         rng = random.Random(args.seed + game_id)
@@ -189,11 +193,11 @@ def main() -> int:
                         samples.append(_record_sample(state, reasons, game_id, ply_index))
                         counts[phase] += 1
 
-            result = analyze(state, limits=limits, for_player=state.to_move)
+            result = session.analyze(state, limits=limits, for_player=state.to_move)
             ply = _select_ply(result, rng, args.epsilon, args.top_n)
             if ply is None:
                 break
-            state = apply_ply(state, ply)
+            state = apply_ply(state, ply, trusted=True)
 
         if len(samples) >= target_total:
             break
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Solve the moving/flying phase class by class (retrograde analysis).
+
+Every material class with 3..--max-stones stones per side is solved in
+dependency order and written as a tablebase next to a manifest. Interrupted
+runs resume from the last checkpoint.
+
+Usage:
+  python scripts/solve.py --max-stones 4 --out solved --checkpoint-interval 300
+  python scripts/solve.py --signature 5v4 --out solved
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from engine.solver import MAX_STONES, Solver, material_classes
+from engine.tablebase import MIN_STONES
+
+
+def _parse_signature(raw: str) -> tuple[int, int]:
+    try:
+        a, b = (int(part) for part in raw.lower().split("v"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"signature must look like 4v3, got {raw!r}")
+    if min(a, b) < MIN_STONES or max(a, b) > MAX_STONES:
+        raise argparse.ArgumentTypeError(f"stones per side must be in {MIN_STONES}..{MAX_STONES}")
+    return (a, b) if a >= b else (b, a)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-stones", type=int, default=4, help="solve all classes up to this many stones per side")
+    parser.add_argument("--signature", type=_parse_signature, action="append", default=[])
+    parser.add_argument("--out", type=str, default="tablebases")
+    parser.add_argument("--checkpoint-interval", type=float, default=300.0, help="seconds between checkpoints")
+    args = parser.parse_args()
+
+    signatures = args.signature or material_classes(min(args.max_stones, MAX_STONES))
+    start = time.perf_counter()
+    solver = Solver(
+        args.out,
+        checkpoint_interval=args.checkpoint_interval,
+        progress=lambda msg: print(f"[{time.perf_counter() - start:8.1f}s] {msg}", flush=True),
+    )
+    solver.solve(signatures)
+    print(f"Solved classes: {', '.join(sorted(solver.solved()))}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
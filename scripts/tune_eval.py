@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Texel-style tuning of EvalWeights per phase over labelled tuning positions.
+
+Positions from scripts/gen_positions.py are labelled once (game outcome of a
+selfplay continuation or a deep-search score, in parallel with --workers) and
+cached in --labels; reruns only label new positions. The weights are then fitted
+on the cached feature matrix and written as JSON (engine.tuning.load_weights
+-> Limits.eval_weights). Fitting state is checkpointed and resumed.
+
+Usage:
+  python scripts/tune_eval.py --mode outcome --depth 3 --workers 4
+  python scripts/tune_eval.py --mode search --depth 6 --k 0.1 --iterations 5000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from engine.batch import FEATURE_NAMES
+from engine.tuning import (
+    LABEL_MODES,
+    TexelFit,
+    label_rows,
+    load_weights,
+    phase_features,
+    save_weights,
+    split_by_phase,
+    state_from_row,
+    texel_loss,
+    win_probability,
+)
+from engine.types import EvalWeights
+
+
+def _row_id(index: int, row: dict) -> str:
+    key = row.get("key")
+    return f"{key}:{row.get('pending_remove', False)}" if key is not None else f"#{index}"
+
+
+def _load_jsonl(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _label(rows: List[dict], args: argparse.Namespace, labels_path: Path) -> Dict[str, float]:
+    labels = {
+        entry["id"]: float(entry["label"])
+        for entry in _load_jsonl(labels_path)
+        if entry.get("mode") == args.mode and entry.get("depth") == args.depth
+    }
+    todo = [(i, row) for i, row in enumerate(rows) if _row_id(i, row) not in labels]
+    print(f"Labels cached: {len(labels)}, to label: {len(todo)} (mode={args.mode}, depth={args.depth})")
+    if not todo:
+        return labels
+
+    start = time.perf_counter()
+    labels_path.parent.mkdir(parents=True, exist_ok=True)
+    with labels_path.open("a", encoding="utf-8") as fh:
+        jobs = [row for _, row in todo]
+        results = label_rows(jobs, mode=args.mode, depth=args.depth, max_plies=args.max_plies, workers=args.workers)
+        for done, (j, label) in enumerate(results, start=1):
+            i, row = todo[j]
+            row_id = _row_id(i, row)
+            labels[row_id] = label
+            fh.write(json.dumps({"id": row_id, "mode": args.mode, "depth": args.depth, "label": label}) + "\n")
+            fh.flush()
+            if done % 10 == 0 or done == len(todo):
+                print(f"  labelled {done}/{len(todo)} ({time.perf_counter() - start:.1f}s)", flush=True)
+    return labels
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=str, default="data/tuning_positions.jsonl")
+    parser.add_argument("--labels", type=str, default="data/tuning_labels.jsonl", help="label cache (appended)")
+    parser.add_argument("--mode", choices=LABEL_MODES, default="outcome")
+    parser.add_argument("--depth", type=int, default=3, help="search depth for labelling / playouts")
+    parser.add_argument("--max-plies", type=int, default=200, help="playout length before scoring a draw")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--start", type=str, default="", help="start weights (JSON, default: EvalWeights())")
+    parser.add_argument("--k", type=float, default=None, help="sigmoid scale (default: fitted for outcome, 0.1 for search)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--learning-rate", type=float, default=0.05)
+    parser.add_argument("--min-rows", type=int, default=10, help="phases with fewer rows keep the start weights")
+    parser.add_argument("--checkpoint", type=str, default="data/tuning_checkpoint.json")
+    parser.add_argument("--checkpoint-every", type=int, default=250)
+    parser.add_argument("--out", type=str, default="data/eval_weights.json")
+    args = parser.parse_args()
+
+    rows = _load_jsonl(ROOT / args.positions)
+    if not rows:
+        raise SystemExit(f"no positions in {args.positions}")
+    labels = _label(rows, args, ROOT / args.labels)
+
+    # Feature-Matrix einmal berechnen; jede Iteration ist danach nur noch ein Skalarprodukt
+    features = phase_features([state_from_row(row) for row in rows])
+    raw = np.array([labels[_row_id(i, row)] for i, row in enumerate(rows)], dtype=np.float64)
+
+    start_weights = load_weights(ROOT / args.start) if args.start else EvalWeights()
+    checkpoint_path = ROOT / args.checkpoint
+    fits: Dict[str, TexelFit] = {}
+    if checkpoint_path.exists():
+        state = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        if state.get("mode") == args.mode and state.get("rows") == len(rows):
+            fits = {phase: TexelFit.from_dict(fit) for phase, fit in state["fits"].items()}
+            print(f"Resuming from {checkpoint_path} ({', '.join(f'{p}@{f.iteration}' for p, f in fits.items())})")
+
+    def _save_checkpoint() -> None:
+        payload = {"mode": args.mode, "rows": len(rows), "fits": {p: f.to_dict() for p, f in fits.items()}}
+        tmp = checkpoint_path.with_suffix(".tmp")
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(checkpoint_path)
+
+    result: Dict[str, EvalWeights] = {}
+    for phase, idx in split_by_phase(rows).items():
+        f = features[idx]
+        if len(idx) < args.min_rows:
+            print(f"{phase}: {len(idx)} rows < --min-rows, keeping start weights")
+            result[phase] = start_weights
+            continue
+        fit = fits.get(phase)
+        if fit is None:
+            fit = TexelFit(start_weights, k=args.k if args.k is not None else 0.1, learning_rate=args.learning_rate)
+            if args.mode == "outcome" and args.k is None:
+                fit.fit_scale(f, raw[idx])
+            fits[phase] = fit
+        # Suchscores als Wahrscheinlichkeiten mit derselben Skalierung wie die Eval
+        targets = raw[idx] if args.mode == "outcome" else win_probability(raw[idx], fit.k)
+        before = texel_loss(f, targets, np.array([getattr(start_weights, n) for n in FEATURE_NAMES]), fit.k)
+        while fit.iteration < args.iterations:
+            fit.step(f, targets, min(args.checkpoint_every, args.iterations - fit.iteration))
+            _save_checkpoint()
+        loss = texel_loss(f, targets, fit.vector, fit.k)
+        print(f"{phase}: rows={len(idx)} k={fit.k:.4f} loss {before:.5f} -> {loss:.5f}")
+        result[phase] = fit.weights
+
+    save_weights(ROOT / args.out, result, mode=args.mode, depth=args.depth, positions=len(rows))
+    print(f"Saved weights to {ROOT / args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
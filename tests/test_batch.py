@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.analysis import scored_actions_for_to_move
+from core.rules import apply_action_trusted, legal_actions
+from core.state import GameState, Stone
+from engine import EvalWeights, apply_ply, evaluate, legal_plies
+from engine.batch import (
+    BREAKDOWN_KEYS,
+    child_boards,
+    evaluate_batch,
+    feature_matrix,
+    scored_actions_batch,
+    stack_states,
+)
+
+
+def _game_states(seeds: range) -> list[GameState]:
+    states = []
+    for seed in seeds:
+        rng = random.Random(seed)
+        state = GameState.initial()
+        for _ in range(rng.randrange(5, 150)):
+            plies = legal_plies(state)
+            if not plies:
+                break
+            state = apply_ply(state, rng.choice(plies))
+            states.append(state)
+    return states
+
+
+def test_evaluate_batch_matches_scalar_evaluate_exactly() -> None:
+    states = _game_states(range(25))
+    assert {s.phase(s.to_move) for s in states} == {"placing", "moving", "flying"}
+    boards, hand_w, hand_b = stack_states(states)
+    initiative = EvalWeights(initiative_strategic=0.3, initiative_tactical=0.7)
+    for weights in (EvalWeights(), initiative):
+        for player in (Stone.WHITE, Stone.BLACK):
+            scores, breakdown = evaluate_batch(boards, player, hand_w, hand_b, weights)
+            for i, state in enumerate(states):
+                ref_score, ref_breakdown = evaluate(state, player, weights)
+                assert scores[i] == ref_score
+                assert list(breakdown[i]) == [ref_breakdown[k] for k in BREAKDOWN_KEYS]
+
+
+def test_player_per_row_and_empty_batch() -> None:
+    states = _game_states(range(3))
+    boards, hand_w, hand_b = stack_states(states)
+    players = np.array([int(s.to_move) for s in states])
+    scores, _ = evaluate_batch(boards, players, hand_w, hand_b)
+    assert list(scores) == [evaluate(s, s.to_move)[0] for s in states]
+
+    empty = np.zeros((0, 24), dtype=np.int8)
+    assert feature_matrix(empty, Stone.WHITE, 0, 0).shape == (0, 9)
+    assert evaluate_batch(empty, Stone.WHITE, 0, 0)[1].shape == (0, len(BREAKDOWN_KEYS))
+
+
+def test_scored_actions_batch_matches_scalar_ranking() -> None:
+    states = _game_states(range(4))
+    states.append(GameState.initial())
+    for state in states:
+        actions = legal_actions(state)
+        boards, hand_w, hand_b = child_boards(state, actions)
+        children = [apply_action_trusted(state, a) for a in actions]
+        expected = stack_states(children) if children else (boards, hand_w, hand_b)
+        assert (boards == expected[0]).all()
+        assert list(hand_w) == list(expected[1]) and list(hand_b) == list(expected[2])
+
+        for k in (1, 5, len(actions) + 1):
+            assert scored_actions_batch(state, max_candidates=k) == scored_actions_for_to_move(state, max_candidates=k)
+
+    state = states[-2]
+    full = scored_actions_batch(state, max_candidates=100, weights=EvalWeights())
+    assert full == sorted(
+        ((a, evaluate(apply_action_trusted(state, a), state.to_move)[0]) for a in legal_actions(state)),
+        key=lambda t: t[1],
+        reverse=True,
+    )[:100]
+    assert all(isinstance(score, float) for _, score in full)
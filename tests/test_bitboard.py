@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import random
+
+from core.bitboard import BitState, NEIGHBOR_MASKS, removable_mask
+from core.graph import NEIGHBORS
+from core.rules import Action, apply_action, legal_actions, removable_positions, winner
+from core.state import GameState, Stone, opponent
+from engine.eval import evaluate
+
+
+def _apply_bits(bs: BitState, action: Action) -> BitState:
+    if action.kind == "place":
+        assert action.dst is not None
+        return bs.apply_place(action.dst)
+    if action.kind == "move":
+        assert action.src is not None and action.dst is not None
+        return bs.apply_move(action.src, action.dst)
+    assert action.dst is not None
+    return bs.apply_remove(action.dst)
+
+
+def _random_states(seed: int, plies: int) -> list[GameState]:
+    rng = random.Random(seed)
+    state = GameState.initial()
+    states = [state]
+    for _ in range(plies):
+        actions = legal_actions(state)
+        if not actions or winner(state) is not None:
+            break
+        state = apply_action(state, rng.choice(actions))
+        states.append(state)
+    return states
+
+
+def test_neighbor_masks_match_graph() -> None:
+    for sq, nbs in NEIGHBORS.items():
+        assert NEIGHBOR_MASKS[sq] == sum(1 << nb for nb in nbs)
+
+
+def test_roundtrip_is_lossless() -> None:
+    for seed in range(5):
+        for state in _random_states(seed, 80):
+            bs = BitState.from_state(state)
+            assert bs.to_state() == state
+            assert bs.board == state.board
+
+
+def test_transitions_match_apply_action() -> None:
+    for seed in range(10):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        bs = BitState.from_state(state)
+        for _ in range(120):
+            if winner(state) is not None:
+                break
+            actions = legal_actions(state)
+            action = rng.choice(actions)
+            state = apply_action(state, action)
+            bs = _apply_bits(bs, action)
+            assert bs.to_state() == state
+            assert bs.winner() == winner(state)
+
+
+def test_removable_mask_matches_rules() -> None:
+    for seed in range(5):
+        for state in _random_states(seed, 80):
+            bs = BitState.from_state(state)
+            victim = opponent(state.to_move)
+            expected = sum(1 << i for i in removable_positions(state, victim))
+            assert removable_mask(bs.own(victim)) == expected
+
+
+def test_phase_and_eval_work_on_bitstate() -> None:
+    for state in _random_states(3, 60)[::7]:
+        bs = BitState.from_state(state)
+        for player in (Stone.WHITE, Stone.BLACK):
+            assert bs.phase(player) == state.phase(player)
+            assert evaluate(bs, player) == evaluate(state, player)  # type: ignore[arg-type]
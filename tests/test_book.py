@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from core.graph import SYMMETRY_MAPS
+from core.state import GameState, Stone
+from engine import BookMove, EngineSession, Limits, OpeningBook, apply_ply, legal_plies
+from engine.movegen import map_ply_code, pack_ply, unpack_ply
+from engine.types import Ply
+
+
+def _opening(plies: list[Ply]) -> GameState:
+    state = GameState.initial()
+    for ply in plies:
+        state = apply_ply(state, ply)
+    return state
+
+
+def _mapped_state(state: GameState, mapping: tuple[int, ...]) -> GameState:
+    board = [Stone.EMPTY] * 24
+    for sq, stone in enumerate(state.board):
+        board[mapping[sq]] = stone
+    return replace(state, board=tuple(board))
+
+
+def test_lookup_maps_moves_through_symmetry(tmp_path) -> None:
+    state = _opening([Ply(kind="place", dst=0), Ply(kind="place", dst=4)])
+    best = Ply(kind="place", dst=1)
+    second = Ply(kind="place", dst=9)
+    book = OpeningBook()
+    book.add(state, [(best, 1.5), (second, 0.5)], depth=6)
+
+    book.save(tmp_path / "book.jsonl")
+    loaded = OpeningBook.load(tmp_path / "book.jsonl")
+    assert len(loaded) == 1
+
+    for mapping in SYMMETRY_MAPS:
+        image = _mapped_state(state, mapping)
+        hit = loaded.lookup(image)
+        assert hit is not None
+        depth, moves = hit
+        assert depth == 6
+        assert [m.score for m in moves] == [1.5, 0.5]
+        assert [m.ply for m in moves] == [
+            unpack_ply(map_ply_code(pack_ply(best), mapping)),
+            unpack_ply(map_ply_code(pack_ply(second), mapping)),
+        ]
+        assert all(m.ply in legal_plies(image) for m in moves)
+
+    # gleiche Belegung, andere Handsteine -> anderer Eintrag
+    assert loaded.lookup(replace(state, in_hand_white=state.in_hand_white - 1)) is None
+
+
+def test_analyze_returns_book_moves_without_search() -> None:
+    state = GameState.initial()
+    book = OpeningBook()
+    book.add(state, [(Ply(kind="place", dst=4), 0.75), (Ply(kind="place", dst=10), 0.25)], depth=8)
+    session = EngineSession(book=book)
+
+    result = session.analyze(state, Limits(max_depth=3, top_n=5))
+    assert result.nodes == 0
+    assert result.depth == 8
+    assert result.best_move == Ply(kind="place", dst=4)
+    assert result.score == 0.75
+    assert [m.ply for m in result.top_moves] == [Ply(kind="place", dst=4), Ply(kind="place", dst=10)]
+    assert result.top_moves[0].breakdown_diff is not None
+
+    # Score aus Sicht des Gegners
+    assert session.analyze(state, Limits(max_depth=3), for_player=Stone.BLACK).score == -0.75
+
+    searched = session.analyze(state, Limits(max_depth=2, book_max_ply=0))
+    assert searched.nodes > 0
+
+
+def test_same_board_with_different_hands_keeps_both_entries(tmp_path) -> None:
+    board = [Stone.EMPTY] * 24
+    for sq in (0, 1, 9):
+        board[sq] = Stone.WHITE
+    for sq in (4, 12):
+        board[sq] = Stone.BLACK
+    # gleiche Belegung/Seite, aber nach einem Schlag ein Handstein weniger
+    first = replace(GameState.initial(), board=tuple(board), to_move=Stone.BLACK, in_hand_white=6, in_hand_black=7)
+    second = replace(first, in_hand_black=6)
+
+    book = OpeningBook()
+    book.add(first, [(Ply(kind="place", dst=2), 1.0)], depth=4)
+    book.add(second, [(Ply(kind="place", dst=21), -2.0)], depth=4)
+    assert len(book) == 2
+
+    book.save(tmp_path / "book.jsonl")
+    for loaded in (book, OpeningBook.load(tmp_path / "book.jsonl")):
+        assert loaded.lookup(first) == (4, [BookMove(ply=Ply(kind="place", dst=2), score=1.0)])
+        assert loaded.lookup(second) == (4, [BookMove(ply=Ply(kind="place", dst=21), score=-2.0)])
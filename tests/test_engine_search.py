@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import random
+
+from core.rules import winner
 from engine import Ply, Limits, analyze, best_move, classify_move_loss
 from engine.eval import evaluate
-from engine.movegen import legal_plies
-from engine.search import _order_plies
+from engine.movegen import apply_ply, legal_plies
+from engine.search import MATE_SCORE, _order_plies
 from core.graph import MILLS
 from core.state import GameState, Stone
 
@@ -152,3 +155,68 @@ def test_top_moves_breakdown_diff_matches_best_move() -> None:
         for key in all_keys:
             expected = best.breakdown.get(key, 0.0) - sm.breakdown.get(key, 0.0)
             assert sm.breakdown_diff.get(key, 0.0) == expected
+
+
+def _minimax(state: GameState, depth: int, for_player: Stone) -> float:
+    # Referenz ohne Pruning/TT: reines Minimax aus Sicht von for_player
+    w = winner(state)
+    if w is not None:
+        return MATE_SCORE if w == for_player else -MATE_SCORE
+    plies = legal_plies(state)
+    if depth == 0 or not plies:
+        return evaluate(state, for_player)[0]
+    scores = [_minimax(apply_ply(state, p, trusted=True), depth - 1, for_player) for p in plies]
+    return max(scores) if state.to_move == for_player else min(scores)
+
+
+def test_pvs_with_aspiration_matches_plain_minimax() -> None:
+    for seed in range(4):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        for _ in range(14 + 5 * seed):
+            state = apply_ply(state, rng.choice(legal_plies(state)))
+        for depth in (1, 2, 3):
+            result = analyze(state, Limits(max_depth=depth, top_n=1, quiescence=False))
+            assert result.score == _minimax(state, depth, state.to_move)
+
+
+def test_multi_pv_lines_are_exact() -> None:
+    for seed in range(3):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        for _ in range(18 + 4 * seed):
+            state = apply_ply(state, rng.choice(legal_plies(state)))
+        me = state.to_move
+        exact = sorted(
+            (_minimax(apply_ply(state, p), 1, me) for p in legal_plies(state)),
+            reverse=True,
+        )
+        result = analyze(state, Limits(max_depth=2, top_n=3, multi_pv=3, quiescence=False))
+        assert [m.score for m in result.top_moves] == exact[:3]
+        for m in result.top_moves:
+            assert _minimax(apply_ply(state, m.ply), 1, me) == m.score
+
+
+def test_quiescence_sees_mill_in_one_beyond_horizon() -> None:
+    a, b, c = MILLS[0]
+    board = [Stone.EMPTY] * 24
+    board[a] = Stone.BLACK
+    board[b] = Stone.BLACK
+    board[12] = Stone.WHITE
+    board[20] = Stone.WHITE
+    state = GameState(
+        board=tuple(board),
+        to_move=Stone.WHITE,
+        in_hand_white=7,
+        in_hand_black=7,
+        pending_remove=False,
+        turn_no=5,
+    )
+
+    flat = analyze(state, Limits(max_depth=1, quiescence=False))
+    quiet = analyze(state, Limits(max_depth=1))
+
+    # Ohne Ruhesuche bleibt BLACKs Muehle hinter dem Horizont
+    assert flat.best_move is not None and flat.best_move.dst != c
+    assert quiet.best_move == Ply(kind="place", dst=c)
+    assert quiet.top_moves[1].score < quiet.score - 10.0
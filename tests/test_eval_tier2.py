@@ -1,10 +1,20 @@
 # tests/test_eval_tier2.py
 from __future__ import annotations
 
+import random
+
 import pytest
 
-from core.graph import MILLS, RING_WEIGHT_BY_INDEX
-from core.state import GameState, Stone
+from core.analysis import (
+    blocked_stones,
+    compute_threat_squares,
+    double_threat_squares,
+    fork_threat_score,
+    mobility_score,
+)
+from core.graph import MILLS, NEIGHBORS, RING_WEIGHT_BY_INDEX
+from core.rules import apply_action, legal_actions, winner
+from core.state import GameState, Stone, opponent
 from engine.eval import evaluate
 from engine.types import EvalWeights
 
@@ -115,3 +125,60 @@ def test_evaluate_rewards_connectivity() -> None:
     score0, _ = evaluate(state0, Stone.WHITE, weights)
     score1, _ = evaluate(state1, Stone.WHITE, weights)
     assert score1 > score0
+
+
+def _reference_terms(state: GameState, player: Stone) -> tuple:
+    opp = opponent(player)
+
+    def mills(p: Stone) -> int:
+        return sum(1 for a, b, c in MILLS if state.board[a] == state.board[b] == state.board[c] == p)
+
+    def open_mills(p: Stone) -> int:
+        count = 0
+        for m in MILLS:
+            vals = [state.board[i] for i in m]
+            if vals.count(p) == 2 and vals.count(Stone.EMPTY) == 1:
+                count += 1
+        return count
+
+    def conn(p: Stone) -> int:
+        return sum(len(NEIGHBORS[i]) for i, v in enumerate(state.board) if v == p)
+
+    return (
+        state.stones_on_board(player) - state.stones_on_board(opp),
+        mills(player) - mills(opp),
+        open_mills(player) - open_mills(opp),
+        mobility_score(state, player) - mobility_score(state, opp),
+        len(compute_threat_squares(state, opp, use_fallback=False))
+        - len(compute_threat_squares(state, player, use_fallback=False)),
+        len(blocked_stones(state, opp)) - len(blocked_stones(state, player)),
+        len(double_threat_squares(state, player)) - len(double_threat_squares(state, opp)),
+        fork_threat_score(state, player) - fork_threat_score(state, opp),
+        conn(player) - conn(opp),
+    )
+
+
+def test_fused_evaluate_matches_analysis_terms() -> None:
+    keys = (
+        "material",
+        "mills",
+        "open_mills",
+        "mobility",
+        "threats_mill_in_1",
+        "blocked_opponent",
+        "double_threats",
+        "fork_threats",
+        "connectivity",
+    )
+    unit = EvalWeights(**{k: 1.0 for k in keys})
+    for seed in range(12):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        for _ in range(120):
+            for player in (Stone.WHITE, Stone.BLACK):
+                _, breakdown = evaluate(state, player, unit)
+                assert tuple(breakdown[k] for k in keys) == _reference_terms(state, player)
+            actions = legal_actions(state)
+            if not actions or winner(state) is not None:
+                break
+            state = apply_action(state, rng.choice(actions))
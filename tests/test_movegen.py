@@ -1,9 +1,30 @@
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from engine import Ply, apply_ply, legal_plies
-from core.state import GameState, Stone
+from engine.board import SearchBoard
+from engine.movegen import gen_mill_codes, gen_quiet_codes, legal_ply_codes, unpack_ply
+from core.bitboard import BitState
+from core.rules import apply_action, legal_actions, removable_positions, winner
+from core.state import GameState, Stone, opponent
+
+
+def _reference_plies(state: GameState) -> list[Ply]:
+    """Referenz ueber legal_actions + apply_action (ohne Tabellen)."""
+    if state.pending_remove:
+        return [Ply(kind="remove", remove=a.dst) for a in legal_actions(state)]
+    kind = "fly" if state.phase(state.to_move) == "flying" else None
+    plies: list[Ply] = []
+    for act in legal_actions(state):
+        mid = apply_action(state, act)
+        removes = removable_positions(mid, opponent(state.to_move)) if mid.pending_remove else []
+        ply_kind = act.kind if kind is None else kind
+        for rem in removes or [None]:
+            plies.append(Ply(kind=ply_kind, src=act.src, dst=act.dst, remove=rem))  # type: ignore[arg-type]
+    return plies
 
 
 def test_legal_plies_place_includes_removes_on_mill() -> None:
@@ -174,3 +195,49 @@ def test_apply_ply_rejects_fly_outside_flying() -> None:
 
     with pytest.raises(ValueError):
         apply_ply(state, ply)
+
+
+def test_table_driven_generator_matches_reference() -> None:
+    for seed in range(12):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        for _ in range(150):
+            if winner(state) is not None:
+                break
+            plies = legal_plies(state)
+            assert plies == _reference_plies(state)
+            codes = legal_ply_codes(BitState.from_state(state))
+            assert [unpack_ply(c) for c in codes] == plies
+            if not plies:
+                break
+            state = apply_ply(state, rng.choice(plies))
+
+
+def test_staged_generators_partition_legal_codes() -> None:
+    for seed in range(12):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        board = SearchBoard.from_state(state)
+        for _ in range(120):
+            codes = board.legal_codes()
+            if not codes or board.winner() is not None:
+                break
+            if not board.pending_remove:
+                side = 0 if board.to_move == Stone.WHITE else 1
+                own, opp = (board.white, board.black) if side == 0 else (board.black, board.white)
+                in_hand = board.in_hand_white if side == 0 else board.in_hand_black
+                gaps = board.threat_mask[side]
+                mills = gen_mill_codes(own, opp, in_hand, gaps)
+                quiet = gen_quiet_codes(own, opp, in_hand, gaps)
+                assert sorted(mills + quiet) == sorted(codes)
+                blocks = board.threat_mask[1 - side]
+                assert set(gen_quiet_codes(own, opp, in_hand, gaps, blocks)) == {
+                    c for c in quiet if blocks >> ((c >> 7 & 0x1F) - 1) & 1
+                }
+            legal = set(codes)
+            for code in legal:
+                assert board.is_legal_code(code)
+            # fremde Codes (Kinder-Codes der Elternstellung, Nachbar-Varianten) werden abgelehnt
+            for other in {c ^ (1 << 12) for c in legal} | {c ^ (1 << 7) for c in legal}:
+                assert board.is_legal_code(other) == (other in legal)
+            board.make(rng.choice(codes))
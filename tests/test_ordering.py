@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import random
+
+from core.state import GameState, Stone
+from engine import EngineSession, Limits, apply_ply, legal_plies
+from engine.board import SearchBoard
+from engine.movegen import NO_PLY, pack_ply
+from engine.ordering import MoveOrdering
+from engine.search import _order_codes
+from engine.types import Ply
+
+
+def _midgame_state(seed: int, plies: int = 20) -> GameState:
+    rng = random.Random(seed)
+    state = GameState.initial()
+    for _ in range(plies):
+        state = apply_ply(state, rng.choice(legal_plies(state)))
+    return state
+
+
+def test_record_cutoff_updates_killers_history_and_countermove() -> None:
+    ordering = MoveOrdering()
+    # eine Zelle je Butterfly-Index, unabhaengig von der Breite von C-long
+    assert all(len(t) == 1 << 10 for t in (*ordering.history, *ordering.countermoves))
+    prev = pack_ply(Ply(kind="move", src=0, dst=1))
+    a = pack_ply(Ply(kind="move", src=4, dst=5))
+    b = pack_ply(Ply(kind="move", src=7, dst=6))
+
+    ordering.record_cutoff(0, 3, a, prev, depth=2)
+    ordering.record_cutoff(0, 3, b, prev, depth=3)
+
+    assert ordering.killers[3] == [b, a]
+    assert ordering.countermove(0, prev) == b
+    assert ordering.countermove(1, prev) == NO_PLY
+    assert ordering.history[0][a >> 2 & 0x3FF] == 4
+    assert ordering.history[0][b >> 2 & 0x3FF] == 9
+
+    ordering.new_search()
+    assert ordering.killers[3] == [NO_PLY, NO_PLY]
+    assert ordering.history[0][b >> 2 & 0x3FF] == 4
+
+
+def test_quiet_moves_follow_killer_then_history() -> None:
+    state = _midgame_state(1)
+    board = SearchBoard.from_state(state)
+    codes = board.legal_codes()
+    baseline = _order_codes(board, codes, NO_PLY)
+    quiet = [c for c in baseline if not c >> 12][-2:]
+    assert len(quiet) == 2
+
+    ordering = MoveOrdering()
+    side = 0 if state.to_move == Stone.WHITE else 1
+    ordering.record_cutoff(side, 2, quiet[0], NO_PLY, depth=1)
+    ordering.record_cutoff(side, 5, quiet[1], NO_PLY, depth=4)
+
+    at_killer_ply = _order_codes(board, codes, NO_PLY, ordering, ply=2)
+    other_ply = _order_codes(board, codes, NO_PLY, ordering, ply=7)
+    assert at_killer_ply.index(quiet[0]) < at_killer_ply.index(quiet[1])
+    assert other_ply.index(quiet[1]) < other_ply.index(quiet[0])
+    assert sorted(at_killer_ply) == sorted(codes)
+
+
+def test_analysis_reports_first_move_cutoff_rate() -> None:
+    session = EngineSession()
+    result = session.analyze(_midgame_state(2), Limits(max_depth=4, top_n=1))
+    stats = result.stats
+    assert stats.beta_cutoffs > 0
+    assert 0 < stats.first_move_cutoffs <= stats.beta_cutoffs
+    assert 0.0 < stats.first_move_cutoff_rate <= 1.0
+    assert any(slot[0] != NO_PLY for slot in session.ordering.killers)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import random
+
+from core.state import GameState, Stone
+from engine import EngineSession, Limits, legal_plies
+
+
+def _flying_state(seed: int) -> GameState:
+    rng = random.Random(seed)
+    board = [Stone.EMPTY] * 24
+    squares = rng.sample(range(24), 11)
+    for sq in squares[:3]:
+        board[sq] = Stone.WHITE
+    for sq in squares[3:]:
+        board[sq] = Stone.BLACK
+    return GameState(
+        board=tuple(board),
+        to_move=Stone.WHITE,
+        in_hand_white=0,
+        in_hand_black=0,
+        pending_remove=False,
+        turn_no=40,
+    )
+
+
+def test_root_split_matches_single_process_lines() -> None:
+    # ohne TT/Selektivitaet ist die Suche pfadunabhaengig -> exakt vergleichbar
+    kwargs = dict(max_depth=3, top_n=4, use_tt=False, null_move=False, lmr=False)
+    session = EngineSession()
+    try:
+        for seed in (3, 5):
+            state = _flying_state(seed)
+            single = EngineSession().analyze(state, Limits(**kwargs))
+            split = session.analyze(state, Limits(workers=2, **kwargs))
+            assert split.depth == single.depth
+            assert split.score == single.score
+            assert sorted(m.score for m in split.top_moves) == sorted(m.score for m in single.top_moves)
+            assert [m.score for m in split.top_moves] == sorted((m.score for m in split.top_moves), reverse=True)
+            assert split.best_move in legal_plies(state)
+            assert split.pv[0] == split.best_move
+            assert split.top_moves[0].breakdown_diff is not None
+            assert all(v == 0.0 for v in split.top_moves[0].breakdown_diff.values())
+            assert split.nodes > 0
+    finally:
+        session.close()
+
+
+def test_root_split_merge_is_deterministic() -> None:
+    state = _flying_state(7)
+    limits = Limits(max_depth=3, top_n=3, use_tt=False, null_move=False, lmr=False, workers=3)
+    session = EngineSession()
+    try:
+        first = session.analyze(state, limits)
+        second = session.analyze(state, limits)
+    finally:
+        session.close()
+    assert [(m.ply, m.score) for m in first.top_moves] == [(m.ply, m.score) for m in second.top_moves]
+
+
+def test_root_split_without_finished_depth_falls_back_to_a_legal_move() -> None:
+    state = _flying_state(3)
+    session = EngineSession()
+    try:
+        # kein Worker und auch die Suche im Prozess schafft Tiefe 1 -> statisch bewerteter Zug
+        result = session.analyze(state, Limits(max_depth=4, max_nodes=1, workers=2))
+    finally:
+        session.close()
+    assert result.depth == 0
+    assert result.best_move in legal_plies(state)
+    assert result.top_moves and result.top_moves[0].ply == result.best_move
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import random
+from math import comb
+
+import pytest
+
+from core.bitboard import BitState
+from core.graph import SYMMETRY_MAPS
+from core.ranking import MaterialClass, PositionRanker, map_mask, rank_subset, unrank_subset
+from core.rules import apply_action, legal_actions
+from core.state import GameState
+
+
+def test_subset_rank_is_a_bijection() -> None:
+    within = 0b1011_0110_1101_0111_0011_1110
+    n = within.bit_count()
+    ranks = set()
+    for rank in range(comb(n, 3)):
+        mask = unrank_subset(rank, 3, within)
+        assert mask & ~within == 0 and mask.bit_count() == 3
+        assert rank_subset(mask, within) == rank
+        ranks.add(mask)
+    assert len(ranks) == comb(n, 3)
+
+
+def test_plain_ranker_is_dense_over_the_class() -> None:
+    ranker = PositionRanker(MaterialClass(2, 1, in_hand_white=4, in_hand_black=5))
+    assert ranker.size == comb(24, 2) * comb(22, 1) * 2 * 2
+    seen = set()
+    for idx in range(ranker.size):
+        white, black, side, pending = ranker.unrank(idx)
+        assert white.bit_count() == 2 and black.bit_count() == 1 and white & black == 0
+        assert ranker.rank(white, black, side, pending) == idx
+        assert pending == (idx >= ranker.quiet_size)
+        seen.add((white, black, side, pending))
+    assert len(seen) == ranker.size
+
+
+def test_canonical_ranker_merges_symmetric_positions() -> None:
+    rng = random.Random(2)
+    ranker = PositionRanker(MaterialClass(4, 3), canonical=True)
+    assert ranker.size * 6 < PositionRanker(MaterialClass(4, 3)).size
+    for _ in range(100):
+        squares = rng.sample(range(24), 7)
+        white = sum(1 << sq for sq in squares[:4])
+        black = sum(1 << sq for sq in squares[4:])
+        side = rng.randrange(2)
+        pending = rng.random() < 0.5
+        idx = ranker.rank(white, black, side, pending)
+        assert ranker.is_canonical(idx)
+        for sym in range(len(SYMMETRY_MAPS)):
+            assert ranker.rank(map_mask(white, sym), map_mask(black, sym), side, pending) == idx
+
+
+def test_rank_state_roundtrip_in_placing_phase() -> None:
+    rng = random.Random(4)
+    state = GameState.initial()
+    for _ in range(7):
+        state = apply_action(state, rng.choice(legal_actions(state)))
+    material = MaterialClass.of(state)
+    ranker = PositionRanker(material)
+    idx = ranker.rank_state(state)
+    bs = BitState.from_state(state)
+    restored = ranker.unrank_state(idx)
+    assert (restored.white, restored.black, restored.to_move) == (bs.white, bs.black, bs.to_move)
+    assert (restored.in_hand_white, restored.in_hand_black, restored.pending_remove) == (
+        bs.in_hand_white,
+        bs.in_hand_black,
+        bs.pending_remove,
+    )
+
+    with pytest.raises(ValueError):
+        PositionRanker(MaterialClass(3, 3)).rank_state(state)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+
+from core.bitboard import BitState
+from core.hash import zobrist_sym_keys_from_state
+from core.rules import winner
+from core.state import DrawTracker, GameState, Stone
+from engine.board import SearchBoard
+from engine.eval import evaluate, evaluate_board
+from engine.movegen import apply_ply, legal_ply_codes, unpack_ply
+
+
+def test_make_matches_apply_ply_and_keys() -> None:
+    for seed in range(8):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        board = SearchBoard.from_state(state)
+        for _ in range(120):
+            if winner(state) is not None:
+                break
+            codes = board.legal_codes()
+            assert codes == legal_ply_codes(BitState.from_state(state))
+            if not codes:
+                break
+            code = rng.choice(codes)
+            state = apply_ply(state, unpack_ply(code))
+            board.make(code)
+            # Draw-Zaehler fuehrt das Such-Board bewusst nicht mit
+            assert board.bitstate() == BitState.from_state(state)._replace(draw=DrawTracker())
+            assert board.keys == zobrist_sym_keys_from_state(state)
+            assert board.winner() == winner(state)
+
+
+def test_unmake_restores_previous_board() -> None:
+    for seed in range(5):
+        rng = random.Random(seed)
+        board = SearchBoard.from_state(GameState.initial())
+        for _ in range(80):
+            codes = board.legal_codes()
+            if not codes or board.winner() is not None:
+                break
+            before = (board.bitstate(), board.keys)
+            for code in codes:
+                undo = board.make(code)
+                board.unmake(undo)
+                assert (board.bitstate(), board.keys) == before
+            board.make(rng.choice(codes))
+
+
+def test_incremental_eval_matches_full_evaluate() -> None:
+    for seed in range(10):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        board = SearchBoard.from_state(state)
+        for _ in range(150):
+            for player in (Stone.WHITE, Stone.BLACK):
+                assert evaluate_board(board, player) == evaluate(state, player)
+            codes = board.legal_codes()
+            if not codes or board.winner() is not None:
+                break
+            # Zaehler muessen nach make/unmake aller Kinder unveraendert sein
+            for code in codes:
+                board.unmake(board.make(code))
+            code = rng.choice(codes)
+            board.make(code)
+            state = apply_ply(state, unpack_ply(code))
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import random
+
+from core.rules import winner
+from core.state import GameState, Stone
+from engine import EngineSession, Limits, apply_ply, legal_plies
+from engine.board import SearchBoard
+
+
+def _moving_positions(count: int) -> list[GameState]:
+    positions: list[GameState] = []
+    seed = 0
+    while len(positions) < count:
+        rng = random.Random(seed)
+        seed += 1
+        state = GameState.initial()
+        for _ in range(80):
+            if winner(state) is not None or not legal_plies(state):
+                break
+            if (
+                state.in_hand_white == 0
+                and state.in_hand_black == 0
+                and state.stones_on_board(Stone.WHITE) > 4
+                and state.stones_on_board(Stone.BLACK) > 4
+                and not state.pending_remove
+            ):
+                positions.append(state)
+                break
+            state = apply_ply(state, rng.choice(legal_plies(state)))
+    return positions
+
+
+def test_null_move_restores_board() -> None:
+    board = SearchBoard.from_state(_moving_positions(1)[0])
+    before = (board.bitstate(), board.keys, list(board.mobility))
+    undo = board.make_null()
+    assert board.to_move != before[0].to_move
+    assert board.keys != before[1]
+    board.unmake(undo)
+    assert (board.bitstate(), board.keys, list(board.mobility)) == before
+
+
+def test_null_move_and_lmr_node_count_regression() -> None:
+    # Benchmark: feste Zugphasen-Stellungen, Tiefe 6 - Selektivitaet muss klar Knoten sparen
+    plain_nodes = 0
+    selective_nodes = 0
+    for state in _moving_positions(6):
+        plain = EngineSession().analyze(state, Limits(max_depth=6, top_n=1, null_move=False, lmr=False))
+        selective = EngineSession().analyze(state, Limits(max_depth=6, top_n=1))
+        assert selective.best_move in legal_plies(state)
+        plain_nodes += plain.nodes
+        selective_nodes += selective.nodes
+    assert selective_nodes < 0.8 * plain_nodes
+
+
+def test_selectivity_is_off_outside_moving_phase() -> None:
+    state = GameState.initial()
+    for ply in legal_plies(state)[:1]:
+        state = apply_ply(state, ply)
+    plain = EngineSession().analyze(state, Limits(max_depth=3, top_n=1, null_move=False, lmr=False))
+    selective = EngineSession().analyze(state, Limits(max_depth=3, top_n=1))
+    assert (selective.score, selective.nodes) == (plain.score, plain.nodes)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from engine import EngineSession, EvalWeights, Limits, analyze, score_ply
+from engine.movegen import apply_ply, legal_plies
+from core.state import GameState, Stone
+
+
+def _sample_state() -> GameState:
+    board = [Stone.EMPTY] * 24
+    board[0] = Stone.WHITE
+    board[4] = Stone.WHITE
+    board[9] = Stone.BLACK
+    board[13] = Stone.BLACK
+    return GameState(
+        board=tuple(board),
+        to_move=Stone.WHITE,
+        in_hand_white=7,
+        in_hand_black=7,
+        pending_remove=False,
+        turn_no=5,
+    )
+
+
+def test_session_matches_one_shot_analyze() -> None:
+    state = _sample_state()
+    limits = Limits(max_depth=2)
+    session = EngineSession()
+
+    fresh = analyze(state, limits=limits, for_player=Stone.WHITE)
+    reused = session.analyze(state, limits=limits, for_player=Stone.WHITE)
+
+    assert reused.score == fresh.score
+    assert reused.best_move == fresh.best_move
+
+
+def test_session_reuses_tt_between_calls() -> None:
+    state = _sample_state()
+    limits = Limits(max_depth=3)
+    session = EngineSession(tt_mb=1.0)
+
+    first = session.analyze(state, limits=limits, for_player=Stone.WHITE)
+    second = session.analyze(state, limits=limits, for_player=Stone.WHITE)
+
+    assert second.score == first.score
+    assert second.nodes < first.nodes
+    assert second.tt_hits / second.nodes > first.tt_hits / first.nodes
+
+
+def test_session_follow_up_position_and_other_player() -> None:
+    state = _sample_state()
+    limits = Limits(max_depth=2)
+    session = EngineSession()
+    first = session.analyze(state, limits=limits, for_player=Stone.WHITE)
+    assert first.best_move is not None
+
+    nxt = apply_ply(state, first.best_move)
+    reused = session.analyze(nxt, limits=limits, for_player=nxt.to_move)
+    fresh = analyze(nxt, limits=limits, for_player=nxt.to_move)
+    assert reused.score == fresh.score
+    assert reused.best_move in legal_plies(nxt)
+
+
+def test_session_score_ply_matches_module_function() -> None:
+    state = _sample_state()
+    limits = Limits(max_depth=2)
+    ply = legal_plies(state)[0]
+    session = EngineSession()
+    session.analyze(state, limits=limits, for_player=Stone.WHITE)
+
+    assert session.score_ply(state, ply, limits=limits, for_player=Stone.WHITE)[0] == (
+        score_ply(state, ply, limits=limits, for_player=Stone.WHITE)[0]
+    )
+
+
+def test_session_resets_caches_when_weights_change() -> None:
+    state = _sample_state()
+    session = EngineSession()
+    session.analyze(state, limits=Limits(max_depth=2), for_player=Stone.WHITE)
+    assert session.eval_cache
+
+    weights = EvalWeights(material=1.0)
+    result = session.analyze(state, limits=Limits(max_depth=2, eval_weights=weights), for_player=Stone.WHITE)
+    fresh = analyze(state, limits=Limits(max_depth=2, eval_weights=weights), for_player=Stone.WHITE)
+    assert result.score == fresh.score
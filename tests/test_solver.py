@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import os
+import random
+from array import array
+
+import pytest
+
+from core.bitboard import BitState
+from core.state import Stone
+from engine import EngineSession, Limits
+from engine.search import MATE_SCORE
+
+from engine.solver import Solver, material_classes
+from engine.tablebase import (
+    RetrogradeRun,
+    Tablebase,
+    TablebaseIndex,
+    Tablebases,
+    _MillGraph,
+    decode_value,
+    encode_loss,
+    encode_win,
+    retrograde_solve,
+)
+
+
+def _random_graph(seed: int, size: int) -> tuple[dict, dict]:
+    rng = random.Random(seed)
+    graph = {}
+    for idx in range(size):
+        children = rng.sample(range(size), rng.randrange(0, 4))
+        exits = [rng.choice((0, encode_loss(rng.randrange(3)), encode_win(rng.randrange(3))))
+                 for _ in range(rng.randrange(0, 2))]
+        graph[idx] = (children, exits)
+    parents: dict[int, list[int]] = {i: [] for i in range(size)}
+    for idx, (children, _) in graph.items():
+        for child in children:
+            parents[child].append(idx)
+    return graph, parents
+
+
+def _brute_force(graph: dict, size: int) -> list[tuple[int, int]]:
+    """(wdl, dtm) je Knoten per Horizont-Iteration: gewonnen/verloren innerhalb h Zuegen."""
+    win_at: dict[int, int] = {}
+    loss_at: dict[int, int] = {}
+    for h in range(3 * size + 3):
+        new_win = {}
+        new_loss = {}
+        for idx, (children, exits) in graph.items():
+            if idx in win_at or idx in loss_at:
+                continue
+            # Gewinn: Zug in eine (in h - 1) verlorene Stellung
+            if any(loss_at.get(c, h) < h for c in children) or any(
+                v and not v & 1 and decode_value(v)[1] + 1 <= h for v in exits
+            ):
+                new_win[idx] = h
+            # Verlust: jeder Zug fuehrt in eine (in h - 1) gewonnene Stellung
+            elif all(win_at.get(c, h) < h for c in children) and all(
+                v & 1 and decode_value(v)[1] + 1 <= h for v in exits
+            ):
+                new_loss[idx] = h
+        win_at.update(new_win)
+        loss_at.update(new_loss)
+    return [
+        (1, win_at[i]) if i in win_at else (-1, loss_at[i]) if i in loss_at else (0, 0)
+        for i in range(size)
+    ]
+
+
+def test_retrograde_run_matches_brute_force(tmp_path) -> None:
+    for seed in range(6):
+        graph, parents = _random_graph(seed, 120)
+        expected = _brute_force(graph, 120)
+
+        run = RetrogradeRun(120)
+        while not run.run(graph.get, parents.__getitem__, max_steps=29):
+            run.save(tmp_path / "ckpt")
+            run = RetrogradeRun.load(tmp_path / "ckpt")
+        assert [decode_value(v) for v in run.values] == expected
+
+
+def test_material_classes_are_ordered_by_dependencies() -> None:
+    classes = material_classes(5)
+    assert classes[:3] == [(3, 3), (4, 3), (4, 4)]
+    assert len(classes) == 6
+    for i, (a, b) in enumerate(classes):
+        for dep in ((a - 1, b), (a, b - 1)):
+            dep = (max(dep), min(dep))
+            if dep[1] >= 3:
+                assert classes.index(dep) < i
+
+
+def test_interrupted_run_resumes_to_the_same_solution(tmp_path) -> None:
+    graph, parents = _random_graph(3, 300)
+    expected = retrograde_solve(300, graph.get, parents.__getitem__)
+
+    run = RetrogradeRun(300)
+    steps = 0
+    while not run.run(graph.get, parents.__getitem__, max_steps=37):
+        run.save(tmp_path / "ckpt")
+        run = RetrogradeRun.load(tmp_path / "ckpt")
+        steps += 1
+    assert steps > 8
+    assert run.done
+    assert run.values == expected
+
+
+def test_checkpoint_survives_an_interrupted_save(tmp_path) -> None:
+    graph, parents = _random_graph(5, 200)
+    run = RetrogradeRun(200)
+    run.run(graph.get, parents.__getitem__, max_steps=50)
+    run.save(tmp_path / "ckpt")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ckpt"]
+
+    # Abbruch nach dem Beiseitelegen des alten Stands: der fertige .tmp-Stand gilt
+    run.run(graph.get, parents.__getitem__, max_steps=50)
+    run.save(tmp_path / "next")
+    (tmp_path / "ckpt").rename(tmp_path / "ckpt.old")
+    (tmp_path / "next").rename(tmp_path / "ckpt.tmp")
+    assert RetrogradeRun.find(tmp_path / "ckpt") == tmp_path / "ckpt.tmp"
+    assert RetrogradeRun.load(tmp_path / "ckpt").next_init == 100
+
+    # unvollstaendiger .tmp-Stand (ohne meta.json): der alte Stand gilt
+    (tmp_path / "ckpt.tmp" / "meta.json").unlink()
+    assert RetrogradeRun.load(tmp_path / "ckpt").next_init == 50
+
+    RetrogradeRun.discard(tmp_path / "ckpt")
+    assert RetrogradeRun.find(tmp_path / "ckpt") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_solver_checkpoints_and_skips_solved_classes(tmp_path) -> None:
+    solver = Solver(tmp_path)
+    assert not solver.solve([(3, 3)], max_steps=500)
+    checkpoint = tmp_path / "checkpoints" / "3v3"
+    assert RetrogradeRun.load(checkpoint).next_init == 500
+
+    assert not Solver(tmp_path).solve([(3, 3)], max_steps=500)
+    assert RetrogradeRun.load(checkpoint).next_init == 1000
+
+    # als geloest eingetragene Klasse wird nur geladen
+    index = TablebaseIndex(3, 3)
+    Tablebase((3, 3), array("H", bytes(2 * index.size)), index).save(tmp_path / "3v3.mtb")
+    solver._write_manifest({"3v3": {"entries": index.size, "file": "3v3.mtb"}})
+    assert solver.solve([(3, 3)], max_steps=1)
+    assert list(solver.solved()) == ["3v3"]
+
+
+@pytest.mark.skipif(not os.environ.get("MILL_SLOW_TESTS"), reason="loest 3v3 komplett (mehrere Minuten)")
+def test_solved_class_matches_plain_search(tmp_path) -> None:
+    assert Solver(tmp_path).solve([(3, 3)])
+    table = Tablebase.load(tmp_path / "3v3.mtb")
+
+    # Bellman-Konsistenz: jeder Wert folgt aus den Werten der Folgestellungen
+    graph = _MillGraph(table.index, Tablebases())
+    rng = random.Random(3)
+    for _ in range(2000):
+        idx = rng.randrange(table.index.size)
+        info = graph.expand(idx)
+        if info is None:
+            continue
+        children, exits = info
+        replies = [decode_value(table.values[c]) for c in children] + [decode_value(v) for v in exits]
+        if not replies:
+            expected = (-1, 0)
+        elif any(w == -1 for w, _ in replies):
+            expected = (1, min(d for w, d in replies if w == -1) + 1)
+        elif all(w == 1 for w, _ in replies):
+            expected = (-1, max(d for _, d in replies) + 1)
+        else:
+            expected = (0, 0)
+        assert decode_value(table.values[idx]) == expected
+
+    plain = dict(quiescence=False, null_move=False, lmr=False, use_tt=False)
+    session = EngineSession()
+    checked = {-1: 0, 0: 0, 1: 0}
+    while min(checked.values()) < 10:
+        idx = rng.randrange(table.index.size)
+        if not table.index.is_canonical(idx):
+            continue
+        wdl, dtm = decode_value(table.values[idx])
+        if dtm > 4 or checked[wdl] >= 10:
+            continue
+        a, b, side = table.index.position(idx)
+        # Seite am Zug spielt WHITE
+        mover, other = (a, b) if side == 0 else (b, a)
+        state = BitState(mover, other, Stone.WHITE, 0, 0, False).to_state()
+        if wdl == 0:
+            # Remis: innerhalb des Horizonts findet die Suche kein Matt
+            assert abs(session.analyze(state, Limits(max_depth=4, **plain)).score) < MATE_SCORE / 2
+        else:
+            # exakte Distanz: Matt bei Tiefe dtm, noch nicht bei dtm - 1
+            score = session.analyze(state, Limits(max_depth=dtm, **plain)).score
+            assert score * wdl >= MATE_SCORE / 2
+            if dtm > 1:
+                assert abs(session.analyze(state, Limits(max_depth=dtm - 1, **plain)).score) < MATE_SCORE / 2
+        checked[wdl] += 1
+    table.close()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import random
+from array import array
+from dataclasses import replace
+from math import comb
+
+from core.graph import SYMMETRY_MAPS
+from core.state import GameState, Stone
+from engine import EngineSession, Limits, legal_plies
+from engine.search import MATE_SCORE
+from engine.tablebase import (
+    Tablebase,
+    TablebaseIndex,
+    Tablebases,
+    _MillGraph,
+    decode_value,
+    encode_loss,
+    encode_win,
+    required_signatures,
+    retrograde_solve,
+)
+
+
+def _map_mask(mask: int, mapping: tuple[int, ...]) -> int:
+    return sum(1 << mapping[sq] for sq in range(24) if mask >> sq & 1)
+
+
+def _random_masks(rng: random.Random, a: int, b: int) -> tuple[int, int]:
+    squares = rng.sample(range(24), a + b)
+    return sum(1 << sq for sq in squares[:a]), sum(1 << sq for sq in squares[a:])
+
+
+def test_index_roundtrip_and_symmetry_invariance() -> None:
+    rng = random.Random(5)
+    for a, b in ((3, 3), (4, 3)):
+        index = TablebaseIndex(a, b)
+        # Klassen ueber 8 Symmetrien (selbstsymmetrische A-Masken zaehlen einzeln)
+        assert index.size * 6 < comb(24, a) * comb(24 - a, b) * 2
+        for _ in range(200):
+            wa, wb = _random_masks(rng, a, b)
+            side = rng.randrange(2)
+            idx = index.index(wa, wb, side)
+            assert 0 <= idx < index.size
+            assert index.is_canonical(idx)
+            ca, cb, cside = index.position(idx)
+            assert cside == side
+            assert index.index(ca, cb, side) == idx
+            for mapping in SYMMETRY_MAPS:
+                assert index.index(_map_mask(wa, mapping), _map_mask(wb, mapping), side) == idx
+
+
+def test_retrograde_solve_on_toy_graph() -> None:
+    graph = {
+        0: ([], []),  # keine Zuege -> verloren
+        1: ([0], []),
+        2: ([1], []),
+        3: ([4], []),
+        4: ([3, 2], []),
+        5: ([6], []),  # reiner Zyklus -> Remis
+        6: ([5], []),
+        7: ([1], [0]),  # Remis-Ausgang
+        8: ([], [encode_loss(0)]),  # Schlag unter drei Steine
+        9: ([1], [encode_win(4)]),
+        10: ([0], [0]),  # Remis-Ausgang, aber Zug in eine verlorene Stellung
+        11: ([0], [encode_loss(4)]),  # Gewinn-Ausgang in 5, direkter Gewinn in 1
+    }
+    parents: dict[int, list[int]] = {i: [] for i in range(13)}
+    for idx, (children, _) in graph.items():
+        for child in children:
+            parents[child].append(idx)
+
+    values = retrograde_solve(13, graph.get, parents.__getitem__)
+
+    assert [decode_value(v) for v in values] == [
+        (-1, 0),
+        (1, 1),
+        (-1, 2),
+        (-1, 4),
+        (1, 3),
+        (0, 0),
+        (0, 0),
+        (0, 0),
+        (1, 1),
+        (-1, 5),
+        (1, 1),
+        (1, 1),
+        (0, 0),  # ungenutzter Index
+    ]
+
+
+def test_mill_graph_parents_invert_children() -> None:
+    rng = random.Random(11)
+    sub = Tablebases([Tablebase((3, 3), array("H", bytes(2 * TablebaseIndex(3, 3).size)))])
+    for a, b in ((3, 3), (4, 3)):
+        graph = _MillGraph(TablebaseIndex(a, b), sub)
+        checked = 0
+        while checked < 25:
+            idx = rng.randrange(graph.index.size)
+            info = graph.expand(idx)
+            if info is None:
+                continue
+            checked += 1
+            children, _ = info
+            for child in set(children):
+                assert idx in graph.parents(child)
+            for parent in set(graph.parents(idx)):
+                parent_info = graph.expand(parent)
+                assert parent_info is not None and idx in parent_info[0]
+
+
+def test_required_signatures_are_built_smallest_first() -> None:
+    assert required_signatures((3, 4)) == [(3, 3), (4, 3)]
+    assert required_signatures((4, 4)) == [(3, 3), (4, 3), (4, 4)]
+
+
+def _synthetic_tables(tmp_path) -> Tablebases:
+    index = TablebaseIndex(3, 3)
+    # synthetische Tabelle: jede Seite am Zug verliert in 7 Halbzuegen
+    table = Tablebase((3, 3), array("H", [encode_loss(7)]) * index.size, index)
+    table.save(tmp_path / "3v3.mtb")
+    return Tablebases.from_dir(tmp_path)
+
+
+def _three_vs_three() -> GameState:
+    board = [Stone.EMPTY] * 24
+    for sq in (0, 4, 19):
+        board[sq] = Stone.WHITE
+    for sq in (2, 12, 22):
+        board[sq] = Stone.BLACK
+    return GameState(
+        board=tuple(board),
+        to_move=Stone.WHITE,
+        in_hand_white=0,
+        in_hand_black=0,
+        pending_remove=False,
+        turn_no=40,
+    )
+
+
+def _with_black(state: GameState, sq: int) -> tuple[Stone, ...]:
+    board = list(state.board)
+    board[sq] = Stone.BLACK
+    return tuple(board)
+
+
+def test_loaded_table_is_memory_mapped_and_probed(tmp_path) -> None:
+    tables = _synthetic_tables(tmp_path)
+    assert tables.signatures == [(3, 3)]
+    assert tables.paths == [tmp_path / "3v3.mtb"]
+
+    state = _three_vs_three()
+    assert tables.probe(state) == (-1, 7)
+    assert tables.probe(replace(state, in_hand_white=1)) is None
+    assert tables.probe(replace(state, pending_remove=True)) is None
+    tables.close()
+
+
+def test_saved_table_is_probed_from_search(tmp_path) -> None:
+    tables = _synthetic_tables(tmp_path)
+    # offenes Schlagen an der Root: gesucht wird, die Kinder (3v3) kommen aus der Tabelle
+    state = replace(_three_vs_three(), board=_with_black(_three_vs_three(), 7), pending_remove=True)
+    for quiescence in (True, False):
+        result = EngineSession(tablebases=tables).analyze(
+            state, Limits(max_depth=1, quiescence=quiescence), Stone.WHITE
+        )
+        assert result.score == MATE_SCORE - 7
+        assert result.stats.tb_hits > 0
+        assert result.stats.tb_probes >= result.stats.tb_hits
+
+    assert EngineSession().analyze(state, Limits(max_depth=1)).stats.tb_probes == 0
+
+
+def test_root_in_table_is_answered_without_search(tmp_path) -> None:
+    tables = _synthetic_tables(tmp_path)
+    state = _three_vs_three()
+    result = EngineSession(tablebases=tables).analyze(state, Limits(max_depth=6, top_n=3), Stone.BLACK)
+    assert result.depth == 1
+    assert result.nodes == len(legal_plies(state))
+    assert result.score == -(MATE_SCORE - 7)
+    assert len(result.top_moves) == 3
+    assert result.stats.tb_hits == result.stats.tb_probes == result.nodes + 1
+
+
+def test_root_split_workers_map_the_same_tables(tmp_path) -> None:
+    session = EngineSession(tablebases=_synthetic_tables(tmp_path))
+    state = replace(_three_vs_three(), board=_with_black(_three_vs_three(), 7), pending_remove=True)
+    try:
+        result = session.analyze(state, Limits(max_depth=2, workers=2), Stone.WHITE)
+    finally:
+        session.close()
+    assert result.score == MATE_SCORE - 7
+    assert result.stats.tb_hits > 0
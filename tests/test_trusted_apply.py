@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import core.rules as rules
+from core.rules import Action, apply_action, apply_action_trusted, legal_actions, winner
+from core.state import GameState
+from engine import apply_ply, legal_plies
+
+
+def test_trusted_apply_matches_checked_apply() -> None:
+    for seed in range(6):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        for _ in range(120):
+            if winner(state) is not None:
+                break
+            action = rng.choice(legal_actions(state))
+            assert apply_action_trusted(state, action) == apply_action(state, action)
+            state = apply_action(state, action)
+
+
+def test_trusted_apply_ply_matches_checked_apply_ply() -> None:
+    rng = random.Random(11)
+    state = GameState.initial()
+    for _ in range(120):
+        plies = legal_plies(state)
+        if not plies or winner(state) is not None:
+            break
+        ply = rng.choice(plies)
+        nxt = apply_ply(state, ply, trusted=True)
+        assert nxt == apply_ply(state, ply)
+        state = nxt
+
+
+def test_debug_mode_keeps_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    state = GameState.initial()
+    illegal = Action(kind="move", src=0, dst=1)
+
+    monkeypatch.setattr(rules, "TRUSTED_APPLY_CHECKS", True)
+    with pytest.raises(ValueError):
+        apply_action_trusted(state, illegal)
+    with pytest.raises(ValueError):
+        apply_action(state, illegal)
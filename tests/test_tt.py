@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from engine import Limits, Ply, analyze
+from engine.movegen import NO_PLY, pack_ply, unpack_ply
+from engine.tt import TT_EXACT, TT_LOWER, TT_UPPER, TranspositionTable
+from core.state import GameState, Stone
+
+
+def _colliding_keys(tt: TranspositionTable, count: int) -> list[int]:
+    # gleicher Bucket: identische untere Bits, unterschiedliche obere Bits
+    buckets = tt.capacity // 2
+    return [5 + i * buckets for i in range(1, count + 1)]
+
+
+def test_pack_ply_roundtrip() -> None:
+    plies = [
+        Ply(kind="place", dst=0),
+        Ply(kind="place", dst=23, remove=0),
+        Ply(kind="move", src=4, dst=7),
+        Ply(kind="fly", src=23, dst=0, remove=12),
+        Ply(kind="remove", remove=9),
+    ]
+    for ply in plies:
+        code = pack_ply(ply)
+        assert code != NO_PLY
+        assert unpack_ply(code) == ply
+
+
+def test_store_and_probe() -> None:
+    tt = TranspositionTable(0.01)
+    move = pack_ply(Ply(kind="place", dst=3))
+    tt.store(123456789, 3, 1.5, TT_EXACT, move)
+
+    assert tt.probe(123456789) == (3, 1.5, TT_EXACT, move)
+    assert tt.probe(987654321) is None
+    assert len(tt) == 1
+
+
+def test_capacity_respects_memory_budget() -> None:
+    small = TranspositionTable(0.5)
+    large = TranspositionTable(2.0)
+    for tt, budget in ((small, 0.5), (large, 2.0)):
+        # tatsaechlich belegter Speicher der Slot-Arrays
+        used = sum(a.itemsize * len(a) for a in (tt._keys, tt._scores, tt._moves, tt._depths, tt._meta))
+        assert used <= budget * 1024 * 1024
+        assert used > budget * 1024 * 1024 / 2
+    assert large.capacity == 4 * small.capacity
+
+
+def test_depth_preferred_slot_survives_shallow_stores() -> None:
+    tt = TranspositionTable(0.01)
+    deep, shallow1, shallow2 = _colliding_keys(tt, 3)
+    tt.store(deep, 6, 1.0, TT_LOWER, NO_PLY)
+    tt.store(shallow1, 1, 2.0, TT_UPPER, NO_PLY)
+    tt.store(shallow2, 1, 3.0, TT_UPPER, NO_PLY)
+
+    assert tt.probe(deep) == (6, 1.0, TT_LOWER, NO_PLY)
+    assert tt.probe(shallow1) is None  # always-replace-Slot ueberschrieben
+    assert tt.probe(shallow2) == (1, 3.0, TT_UPPER, NO_PLY)
+
+
+def test_deeper_store_demotes_previous_entry() -> None:
+    tt = TranspositionTable(0.01)
+    first, second = _colliding_keys(tt, 2)
+    tt.store(first, 2, 1.0, TT_EXACT, NO_PLY)
+    tt.store(second, 4, 2.0, TT_EXACT, NO_PLY)
+
+    assert tt.probe(second) == (4, 2.0, TT_EXACT, NO_PLY)
+    assert tt.probe(first) == (2, 1.0, TT_EXACT, NO_PLY)
+
+
+def test_stale_entries_are_replaced_after_new_search() -> None:
+    tt = TranspositionTable(0.01)
+    old, new = _colliding_keys(tt, 2)
+    tt.store(old, 8, 1.0, TT_EXACT, NO_PLY)
+    tt.new_search()
+    tt.store(new, 1, 2.0, TT_EXACT, NO_PLY)
+
+    assert tt.probe(new) == (1, 2.0, TT_EXACT, NO_PLY)
+
+
+def test_same_key_keeps_best_move_when_none_given() -> None:
+    tt = TranspositionTable(0.01)
+    move = pack_ply(Ply(kind="move", src=1, dst=2))
+    tt.store(42, 2, 0.0, TT_LOWER, move)
+    tt.store(42, 3, 1.0, TT_EXACT, NO_PLY)
+
+    assert tt.probe(42) == (3, 1.0, TT_EXACT, move)
+
+
+def test_analyze_with_tiny_tt_budget() -> None:
+    state = GameState.initial()
+    result = analyze(state, limits=Limits(max_depth=2, tt_mb=0.01), for_player=Stone.WHITE)
+    reference = analyze(state, limits=Limits(max_depth=2), for_player=Stone.WHITE)
+
+    assert result.best_move is not None
+    assert result.score == reference.score
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.state import GameState, Stone
+from engine import EngineSession, Limits, analyze
+from engine.batch import FEATURE_NAMES
+from engine.tuning import (
+    TexelFit,
+    label_position,
+    load_weights,
+    save_weights,
+    state_from_row,
+    texel_loss,
+    weights_to_dict,
+    win_probability,
+)
+from engine.types import EvalWeights
+
+
+def test_weights_json_roundtrip_into_limits(tmp_path) -> None:
+    moving = EvalWeights(material=12.0, mobility=2.5)
+    path = tmp_path / "weights.json"
+    save_weights(path, {"all": EvalWeights(), "moving": moving}, mode="outcome")
+
+    assert load_weights(path, "moving") == moving
+    # unbekannte Phase -> globale Gewichte
+    assert load_weights(path, "flying") == EvalWeights()
+
+    flat = tmp_path / "flat.json"
+    flat.write_text('{"mills": 7.0, "comment": 1}', encoding="utf-8")
+    limits = Limits(eval_weights=load_weights(flat))
+    assert limits.eval_weights == EvalWeights(mills=7.0)
+
+
+def test_texel_fit_recovers_weights_and_resumes() -> None:
+    rng = np.random.default_rng(3)
+    features = rng.integers(-4, 5, size=(400, len(FEATURE_NAMES))).astype(np.float64)
+    true = np.array([weights_to_dict(EvalWeights(material=14.0, mobility=3.0))[n] for n in FEATURE_NAMES])
+    targets = win_probability(features @ true, 0.05)
+
+    fit = TexelFit(k=0.05, learning_rate=0.1)
+    start_loss = texel_loss(features, targets, fit.vector, fit.k)
+    fit.step(features, targets, 300)
+
+    # Checkpoint mitten im Fit: Fortsetzung ist identisch zum Durchlauf
+    resumed = TexelFit.from_dict(fit.to_dict())
+    fit.step(features, targets, 700)
+    resumed.step(features, targets, 700)
+    assert np.array_equal(fit.vector, resumed.vector)
+    assert fit.iteration == resumed.iteration == 1000
+
+    assert fit.loss is not None and fit.loss < start_loss / 50
+    assert abs(fit.weights.material - 14.0) < 1.0
+    assert abs(fit.weights.mobility - 3.0) < 1.0
+
+
+def test_fit_scale_and_labels() -> None:
+    rng = np.random.default_rng(5)
+    features = rng.integers(-4, 5, size=(300, len(FEATURE_NAMES))).astype(np.float64)
+    fit = TexelFit()
+    targets = win_probability(features @ fit.vector, 0.02)
+    assert fit.fit_scale(features, targets) == pytest.approx(0.02, rel=1e-3)
+
+    row = {
+        "board": [1, 1, 0, 0, 0, 0, 0, 0, 0, 2, 2, 2] + [0] * 12,
+        "to_move": 1,
+        "in_hand_white": 0,
+        "in_hand_black": 0,
+        "pending_remove": False,
+        "turn_no": 30,
+    }
+    state = state_from_row(row)
+    assert state.to_move == Stone.WHITE and state.board[9] == Stone.BLACK
+    session = EngineSession()
+    assert label_position(session, state, mode="search", depth=2) == analyze(
+        state, Limits(max_depth=2, top_n=1), for_player=Stone.WHITE
+    ).score
+    # WHITE hat nur zwei Steine: verloren
+    assert label_position(session, state, mode="outcome", depth=1) == 0.0
+    with pytest.raises(ValueError):
+        label_position(session, GameState.initial(), mode="bogus")
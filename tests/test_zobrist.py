@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+from core.graph import SYMMETRY_INVERSE_MAPS, SYMMETRY_MAPS
+from core.hash import (
+    canonical_zobrist_key,
+    zobrist_key_from_state,
+    zobrist_key_with_symmetry,
+    zobrist_status_from_state,
+    zobrist_stone,
+    zobrist_sym_keys_from_state,
+)
+from core.rules import winner
+from core.state import GameState, Stone, opponent
+from engine.board import SearchBoard
+from engine.movegen import apply_ply, legal_plies, map_ply_code, pack_ply, unpack_ply
+
+
+def test_incremental_key_matches_full_recompute() -> None:
+    for seed in range(8):
+        rng = random.Random(seed)
+        state = GameState.initial()
+        board = SearchBoard.from_state(state)
+        for _ in range(100):
+            if winner(state) is not None:
+                break
+            plies = legal_plies(state)
+            if not plies:
+                break
+            ply = rng.choice(plies)
+            nxt = apply_ply(state, ply)
+            board.make(pack_ply(ply))
+            keys = board.keys
+            assert keys == zobrist_sym_keys_from_state(nxt)
+            assert keys[0] == zobrist_key_from_state(nxt)
+            state = nxt
+
+
+def test_key_covers_side_pending_and_hand() -> None:
+    board = [Stone.EMPTY] * 24
+    board[0] = Stone.WHITE
+    board[9] = Stone.BLACK
+    state = GameState(
+        board=tuple(board),
+        to_move=Stone.WHITE,
+        in_hand_white=8,
+        in_hand_black=8,
+        pending_remove=False,
+        turn_no=3,
+    )
+    base = zobrist_key_from_state(state)
+
+    assert zobrist_key_from_state(replace(state, to_move=Stone.BLACK)) != base
+    assert zobrist_key_from_state(replace(state, pending_remove=True)) != base
+    assert zobrist_key_from_state(replace(state, in_hand_white=7)) != base
+    # turn_no gehoert nicht zur Stellung
+    assert zobrist_key_from_state(replace(state, turn_no=9)) == base
+
+
+def test_stone_toggle_is_involution() -> None:
+    state = GameState.initial()
+    key = zobrist_key_from_state(state)
+    status = zobrist_status_from_state(state)
+    toggled = key ^ zobrist_stone(Stone.WHITE, 4) ^ zobrist_stone(opponent(Stone.WHITE), 4)
+    assert toggled ^ zobrist_stone(Stone.BLACK, 4) ^ zobrist_stone(Stone.WHITE, 4) == key
+    assert key == status
+
+
+def test_symmetric_key_is_canonical() -> None:
+    board = [Stone.EMPTY] * 24
+    board[0] = Stone.WHITE
+    board[1] = Stone.WHITE
+    board[9] = Stone.BLACK
+    state = GameState(
+        board=tuple(board),
+        to_move=Stone.BLACK,
+        in_hand_white=7,
+        in_hand_black=8,
+        pending_remove=False,
+        turn_no=3,
+    )
+    for mapping in SYMMETRY_MAPS:
+        sym_board = [Stone.EMPTY] * 24
+        for idx, mapped in enumerate(mapping):
+            sym_board[mapped] = board[idx]
+        sym_state = replace(state, board=tuple(sym_board))
+        assert zobrist_key_with_symmetry(sym_state) == zobrist_key_with_symmetry(state)
+
+
+def test_canonical_transform_maps_best_move_between_symmetric_positions() -> None:
+    board = [Stone.EMPTY] * 24
+    board[0] = Stone.WHITE
+    board[1] = Stone.WHITE
+    board[9] = Stone.BLACK
+    board[13] = Stone.BLACK
+    state = GameState(
+        board=tuple(board),
+        to_move=Stone.WHITE,
+        in_hand_white=7,
+        in_hand_black=7,
+        pending_remove=False,
+        turn_no=5,
+    )
+    key, sym = canonical_zobrist_key(zobrist_sym_keys_from_state(state))
+    best = [p for p in legal_plies(state) if p.dst == 2][0]
+    stored = map_ply_code(pack_ply(best), SYMMETRY_MAPS[sym])
+
+    for mapping in SYMMETRY_MAPS:
+        sym_board = [Stone.EMPTY] * 24
+        for idx, mapped in enumerate(mapping):
+            sym_board[mapped] = board[idx]
+        sym_state = replace(state, board=tuple(sym_board))
+        sym_key, sym_idx = canonical_zobrist_key(zobrist_sym_keys_from_state(sym_state))
+        assert sym_key == key
+        restored = unpack_ply(map_ply_code(stored, SYMMETRY_INVERSE_MAPS[sym_idx]))
+        assert restored in legal_plies(sym_state)
+        assert restored.dst == mapping[2]
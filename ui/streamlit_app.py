@@ -3,16 +3,18 @@ from __future__ import annotations
 
 import streamlit as st
 import time
+from pathlib import Path
 from typing import Mapping
 
 from engine import (
     Action,
-    analyze,
     AnalysisResult,
+    EngineSession,
     EvalBreakdown,
     EvalWeights,
     GameState,
     Limits,
+    OpeningBook,
     Stone,
     advance_draw_tracker,
     apply_action,
@@ -153,6 +155,15 @@ def render_svg_board_interactive(state: GameState) -> None:
     st.rerun()
 
 
+# optionales Eroeffnungsbuch (scripts/build_book.py); ohne Datei wird immer gesucht
+OPENING_BOOK_PATH = Path(__file__).resolve().parents[1] / "data" / "opening_book.jsonl"
+
+
+def _new_engine_session() -> EngineSession:
+    book = OpeningBook.load(OPENING_BOOK_PATH) if OPENING_BOOK_PATH.exists() else None
+    return EngineSession(book=book)
+
+
 def player_label(p: Stone) -> str:
     return "WHITE" if p == Stone.WHITE else "BLACK"
 
@@ -663,7 +674,7 @@ def _render_tactic_hints(state: GameState, ply) -> None:
 def _find_transition_ply(prev_state: GameState, next_state: GameState):
     for ply in legal_plies(prev_state):
         try:
-            if apply_ply(prev_state, ply) == next_state:
+            if apply_ply(prev_state, ply, trusted=True) == next_state:
                 return ply
         except ValueError:
             continue
@@ -780,8 +791,11 @@ def render_analysis_panel(state: GameState) -> None:
                         if cache_key in order:
                             order.remove(cache_key)
                         order.append(cache_key)
+            if "engine_session" not in st.session_state:
+                st.session_state.engine_session = _new_engine_session()
+            engine_session: EngineSession = st.session_state.engine_session
             if result is None:
-                result = analyze(
+                result = engine_session.analyze(
                     state,
                     limits=Limits(
                         max_depth=depth,
@@ -869,6 +883,7 @@ def render_analysis_panel(state: GameState) -> None:
                         last_ply,
                         limits=last_limits,
                         thresholds=thresholds,
+                        session=engine_session,
                     )
                     suffix = " (not in Top-N)" if not summary.in_top_n else ""
                     st.markdown("**Last Move**")